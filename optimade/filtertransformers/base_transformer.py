@@ -1,11 +1,14 @@
 """This submodule implements the
-[`BaseTransformer`][optimade.filtertransformers.base_transformer.BaseTransformer]
+[`BaseTransformer`][optimade.filtertransformers.base_transformer.BaseTransformer],
+[`QueryObjectTransformer`][optimade.filtertransformers.base_transformer.QueryObjectTransformer]
 and [`Quantity`][optimade.filtertransformers.base_transformer.Quantity] classes
 for turning filters parsed by lark into backend-specific queries.
 
 """
 
 import abc
+import contextvars
+import sys
 import warnings
 from typing import TYPE_CHECKING, Any, Optional
 
@@ -20,9 +23,19 @@ if TYPE_CHECKING:  # pragma: no cover
 
 __all__ = (
     "BaseTransformer",
+    "QueryObjectTransformer",
     "Quantity",
+    "TRANSFORM_WARNINGS",
 )
 
+TRANSFORM_WARNINGS: contextvars.ContextVar[
+    list[tuple[Warning | str, type[Warning], str, int]] | None
+] = contextvars.ContextVar("optimade_transform_warnings", default=None)
+"""The warnings emitted by a transformer (as `(message, category, filename, lineno)`)
+while transforming a filter in the current context, if they are being recorded,
+e.g., to re-emit them when a cached query is reused, see
+[`transform_filter`][optimade.server.entry_collections.entry_collections.EntryCollection.transform_filter]."""
+
 
 class Quantity:
     """Class to provide information about available quantities to the transformer.
@@ -170,6 +183,32 @@ class BaseTransformer(Transformer, abc.ABC):
 
         return quantities
 
+    def _warn(
+        self, message: Warning | str, category: type[Warning] | None = None
+    ) -> None:
+        """Emit a warning about the filter being transformed, attributed to the
+        caller, and record it in
+        [`TRANSFORM_WARNINGS`][optimade.filtertransformers.base_transformer.TRANSFORM_WARNINGS]
+        if the warnings of the current context are being recorded.
+
+        Unlike `warnings.catch_warnings`, this does not touch the process-wide
+        warnings state, so filters can be transformed concurrently.
+
+        Parameters:
+            message: The warning, or its message.
+            category: The category of the warning, by default the type of `message`
+                if it is a `Warning`, otherwise `UserWarning`.
+
+        """
+        if category is None:
+            category = type(message) if isinstance(message, Warning) else UserWarning
+        frame = sys._getframe(1)
+        filename, lineno = frame.f_code.co_filename, frame.f_lineno
+        recorded = TRANSFORM_WARNINGS.get()
+        if recorded is not None:
+            recorded.append((message, category, filename, lineno))
+        warnings.warn_explicit(message, category, filename, lineno)
+
     def postprocess(self, query) -> Any:
         """Post-process the query according to the rules defined for
         the backend, returning the backend-specific query.
@@ -256,7 +295,7 @@ class BaseTransformer(Transformer, abc.ABC):
                 prefix = quantity_name.split("_")[1]
                 if prefix not in self.mapper.SUPPORTED_PREFIXES:
                     if prefix not in self.mapper.KNOWN_PROVIDER_PREFIXES:
-                        warnings.warn(
+                        self._warn(
                             UnknownProviderProperty(
                                 f"Field {quantity_name!r} has an unrecognised prefix: this property has been treated as UNKNOWN."
                             )
@@ -361,3 +400,107 @@ class BaseTransformer(Transformer, abc.ABC):
 
     def property_zip_addon(self, arg):
         """property_zip_addon: ":" property (":" property)*"""
+
+
+class QueryObjectTransformer(BaseTransformer):
+    """Base class for transformers that compile the filter into query objects
+    combined with the `&`, `|` and `~` operators, e.g., the
+    [`ColumnarQuery`][optimade.filtertransformers.columnar.ColumnarQuery] and
+    [`SQLQuery`][optimade.filtertransformers.sql.SQLQuery].
+
+    Properties are turned into dotted backend fields, and the right-hand sides of
+    the comparisons into functions of such a field returning a query object.
+    Subclasses implement `_compare` and the remaining comparison rules.
+    Correlated list queries are not supported.
+
+    """
+
+    def _field(self, quantity: str | Quantity, path: list[str]) -> str:
+        """Return the backend field of a property, including any nested path."""
+        if isinstance(quantity, Quantity):
+            quantity = quantity.backend_field  # type: ignore[assignment]
+        return ".".join([quantity, *path])  # type: ignore[list-item]
+
+    @abc.abstractmethod
+    def _compare(self, field: Any, operator: str, value: Any) -> Any:
+        """Return the query object comparing the field to the value."""
+
+    def expression(self, arg):
+        # expression: expression_clause ( OR expression_clause )
+        result = arg[0]
+        for query in arg[1:]:
+            result |= query
+        return result
+
+    def expression_clause(self, arg):
+        # expression_clause: expression_phrase ( AND expression_phrase )*
+        result = arg[0]
+        for query in arg[1:]:
+            result &= query
+        return result
+
+    def expression_phrase(self, arg):
+        # expression_phrase: [ NOT ] ( comparison | "(" expression ")" )
+        if len(arg) == 2:
+            return ~arg[1]
+        return arg[0]
+
+    def property(self, args):
+        # property: IDENTIFIER ( "." IDENTIFIER )*
+        quantity = super().property(args)
+        path = [str(identifier) for identifier in args[1:]]
+
+        if (
+            self.mapper is not None
+            and isinstance(quantity, str)
+            and quantity in self.mapper.RELATIONSHIP_ENTRY_TYPES
+        ):
+            if path != ["id"]:
+                raise NotImplementedError(
+                    f'Cannot filter relationships by field "{".".join(path)}", only "id" is supported.'
+                )
+            return f"relationships.{quantity}.data.id"
+
+        return self._field(quantity, path)
+
+    @v_args(inline=True)
+    def property_first_comparison(self, field, query):
+        # property_first_comparison: property ( value_op_rhs | known_op_rhs | fuzzy_string_op_rhs | set_op_rhs |
+        # set_zip_op_rhs | length_op_rhs )
+        return query(field)
+
+    @v_args(inline=True)
+    def constant_first_comparison(self, value, operator, field):
+        # constant_first_comparison: constant OPERATOR ( non_string_value | not_implemented_string )
+        return self._compare(field, self._reversed_operator_map[operator], value)
+
+    @v_args(inline=True)
+    def value_op_rhs(self, operator, value):
+        # value_op_rhs: OPERATOR value
+        return lambda field: self._compare(field, str(operator), value)
+
+    def value_list(self, arg):
+        # value_list: [ OPERATOR ] value ( "," [ OPERATOR ] value )*
+        for value in arg:
+            if str(value) in self.operator_map.keys():
+                raise NotImplementedError(
+                    f"OPERATOR {value} inside value_list {arg} not implemented."
+                )
+        return arg
+
+    def value_zip(self, arg):
+        # value_zip: [ OPERATOR ] value ":" [ OPERATOR ] value (":" [ OPERATOR ] value)*
+        raise NotImplementedError("Correlated list queries are not supported.")
+
+    def value_zip_list(self, arg):
+        # value_zip_list: value_zip ( "," value_zip )*
+        raise NotImplementedError("Correlated list queries are not supported.")
+
+    def set_zip_op_rhs(self, arg):
+        # set_zip_op_rhs: property_zip_addon HAS ( value_zip | ONLY value_zip_list | ALL value_zip_list |
+        # ANY value_zip_list )
+        raise NotImplementedError("Correlated list queries are not supported.")
+
+    def property_zip_addon(self, arg):
+        # property_zip_addon: ":" property (":" property)*
+        raise NotImplementedError("Correlated list queries are not supported.")
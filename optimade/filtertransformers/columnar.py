@@ -0,0 +1,182 @@
+"""This submodule implements the
+[`ColumnarTransformer`][optimade.filtertransformers.columnar.ColumnarTransformer],
+which compiles the parsed filter into vectorized NumPy mask operations over the
+columns of the
+[`ColumnarCollection`][optimade.server.entry_collections.columnar.ColumnarCollection].
+"""
+
+from collections.abc import Callable
+from typing import Any, Protocol
+
+import numpy as np
+from lark import v_args
+
+from optimade.filtertransformers.base_transformer import QueryObjectTransformer
+
+__all__ = ("ColumnarQuery", "ColumnarTransformer")
+
+
+class ColumnarTable(Protocol):
+    """The table of columns that a
+    [`ColumnarQuery`][optimade.filtertransformers.columnar.ColumnarQuery] is evaluated on."""
+
+    def __len__(self) -> int: ...
+
+    def column(self, field: str) -> Any:
+        """Return the column of the given backend field, see
+        [`Column`][optimade.server.entry_collections.columnar.Column]."""
+
+
+class ColumnarQuery:
+    """A filter compiled into vectorized operations on the columns of a table.
+
+    Following the OPTIMADE semantics for `null` values, a query evaluates to two
+    masks: the rows for which it is true and the rows for which it is false.
+    Rows for which the compared properties are unknown are in neither, e.g.,
+    `NOT nelements = 2` does not match entries with an unknown `nelements`.
+
+    Attributes:
+        description: A human-readable form of the compiled query.
+
+    """
+
+    def __init__(
+        self,
+        evaluate: Callable[[ColumnarTable], tuple[np.ndarray, np.ndarray]],
+        description: str,
+    ):
+        self._evaluate = evaluate
+        self.description = description
+
+    def evaluate(self, table: ColumnarTable) -> tuple[np.ndarray, np.ndarray]:
+        """Return the masks of the rows of the table for which the query is true and false."""
+        return self._evaluate(table)
+
+    def __call__(self, table: ColumnarTable) -> np.ndarray:
+        """Return the mask of the rows of the table matching the query."""
+        return self._evaluate(table)[0]
+
+    def __and__(self, other: "ColumnarQuery") -> "ColumnarQuery":
+        def evaluate(table: ColumnarTable) -> tuple[np.ndarray, np.ndarray]:
+            true, false = self.evaluate(table)
+            other_true, other_false = other.evaluate(table)
+            return true & other_true, false | other_false
+
+        return ColumnarQuery(evaluate, f"({self.description} AND {other.description})")
+
+    def __or__(self, other: "ColumnarQuery") -> "ColumnarQuery":
+        def evaluate(table: ColumnarTable) -> tuple[np.ndarray, np.ndarray]:
+            true, false = self.evaluate(table)
+            other_true, other_false = other.evaluate(table)
+            return true | other_true, false & other_false
+
+        return ColumnarQuery(evaluate, f"({self.description} OR {other.description})")
+
+    def __invert__(self) -> "ColumnarQuery":
+        def evaluate(table: ColumnarTable) -> tuple[np.ndarray, np.ndarray]:
+            true, false = self.evaluate(table)
+            return false, true
+
+        return ColumnarQuery(evaluate, f"NOT {self.description}")
+
+    def __deepcopy__(self, memo: dict) -> "ColumnarQuery":
+        # Compiled queries are immutable
+        return self
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.description!r})"
+
+    @classmethod
+    def on_column(
+        cls,
+        field: str,
+        operation: Callable[[Any], np.ndarray],
+        description: str,
+    ) -> "ColumnarQuery":
+        """Create the query for an operation on a single column, which is true for
+        the rows selected by `operation(column)` and false for the other rows with a
+        known value."""
+
+        def evaluate(table: ColumnarTable) -> tuple[np.ndarray, np.ndarray]:
+            column = table.column(field)
+            true = operation(column)
+            return true, column.known & ~true
+
+        return cls(evaluate, description)
+
+
+class ColumnarTransformer(QueryObjectTransformer):
+    """Transformer that compiles the filter into a
+    [`ColumnarQuery`][optimade.filtertransformers.columnar.ColumnarQuery], to be
+    evaluated against the columns of a
+    [`ColumnarCollection`][optimade.server.entry_collections.columnar.ColumnarCollection].
+
+    The comparisons are delegated to the column of the compared field, such that,
+    e.g., string columns can compare dictionary codes and lists of strings can
+    be tested with bitsets.
+
+    """
+
+    @v_args(inline=True)
+    def known_op_rhs(self, _, value):
+        # known_op_rhs: IS ( KNOWN | UNKNOWN )
+        def query(field: str) -> ColumnarQuery:
+            def evaluate(table: ColumnarTable) -> tuple[np.ndarray, np.ndarray]:
+                known = table.column(field).known
+                return known, ~known
+
+            result = ColumnarQuery(evaluate, f"{field} IS KNOWN")
+            return result if value == "KNOWN" else ~result
+
+        return query
+
+    def fuzzy_string_op_rhs(self, arg):
+        # fuzzy_string_op_rhs: CONTAINS value | STARTS [ WITH ] value | ENDS [ WITH ] value
+        operator, value = str(arg[0]), arg[-1]
+        if not isinstance(value, str):
+            raise NotImplementedError(
+                f"{operator} is only supported for string values, not {value!r}."
+            )
+        return lambda field: ColumnarQuery.on_column(
+            field,
+            lambda column: column.fuzzy(operator, value),
+            f"{field} {operator} {value!r}",
+        )
+
+    def set_op_rhs(self, arg):
+        # set_op_rhs: HAS ( [ OPERATOR ] value | ALL value_list | ANY value_list | ONLY value_list )
+        if len(arg) == 2 or (len(arg) == 3 and arg[1] in self.operator_map):
+            operator = "=" if len(arg) == 2 else str(arg[1])
+            value = arg[-1]
+            return lambda field: ColumnarQuery.on_column(
+                field,
+                lambda column: column.has(operator, value),
+                f"{field} HAS {operator} {value!r}",
+            )
+
+        mode, values = str(arg[1]), arg[2]
+        method = {"ALL": "has_all", "ANY": "has_any", "ONLY": "has_only"}[mode]
+        return lambda field: ColumnarQuery.on_column(
+            field,
+            lambda column: getattr(column, method)(values),
+            f"{field} HAS {mode} {values!r}",
+        )
+
+    def length_op_rhs(self, arg):
+        # length_op_rhs: LENGTH [ OPERATOR ] value
+        operator = str(arg[1]) if len(arg) == 3 else "="
+        value = arg[-1]
+        return lambda field: ColumnarQuery.on_column(
+            field,
+            lambda column: column.length(operator, value),
+            f"{field} LENGTH {operator} {value!r}",
+        )
+
+    def _compare(self, field: Any, operator: str, value: Any) -> ColumnarQuery:
+        if not isinstance(field, str):
+            raise NotImplementedError("Comparing two constants is not supported.")
+        return ColumnarQuery.on_column(
+            field,
+            lambda column: column.compare(operator, value),
+            f"{field} {operator} {value!r}",
+        )
@@ -0,0 +1,69 @@
+"""This submodule implements the
+[`JSONLTransformer`][optimade.filtertransformers.jsonl.JSONLTransformer],
+which takes the parsed filter and converts it to a MongoDB-style query that is
+evaluated in-process by the
+[`JSONLCollection`][optimade.server.entry_collections.jsonl.JSONLCollection].
+"""
+
+from datetime import datetime, timezone
+from typing import Any
+
+from optimade.exceptions import BadRequest
+from optimade.filtertransformers.mongo import MongoTransformer
+from optimade.warnings import TimestampNotRFCCompliant
+
+__all__ = ("JSONLTransformer",)
+
+
+class JSONLTransformer(MongoTransformer):
+    """A filter transformer for the JSONL file backend.
+
+    The query is the same as produced by the
+    [`MongoTransformer`][optimade.filtertransformers.mongo.MongoTransformer],
+    except that no BSON types are used, such that it can be evaluated without
+    `pymongo`: timestamps are parsed into timezone-aware `datetime` objects and
+    there is no special handling of MongoDB `ObjectId`s.
+
+    """
+
+    def _rewrite_mongo_id_filter(self, prop: str, expr: Any) -> dict | None:
+        """Entries in a JSONL file have no MongoDB `ObjectId`s, so `_id` is
+        queried as any other field."""
+        return None
+
+    def _rewrite_mongo_date_filter(self, prop: str, expr: Any) -> dict | None:
+        """Replace any operations on suspected timestamp properties with the
+        corresponding operation on a timezone-aware `datetime`.
+
+        Timestamps without a timezone are taken to be in UTC.
+
+        """
+        optimade_prop = prop
+        if self.mapper is not None:
+            optimade_prop = self.mapper.get_optimade_field(prop)
+        if optimade_prop != "last_modified" or not isinstance(expr, dict):
+            return None
+
+        new_expr = {}
+        for operator, value in expr.items():
+            if not isinstance(value, str):
+                new_expr[operator] = value
+                continue
+            try:
+                query_datetime = datetime.fromisoformat(value)
+            except ValueError:
+                raise BadRequest(
+                    detail=f"Unable to parse timestamp {value!r} for field {prop!r}."
+                )
+            if query_datetime.tzinfo is None:
+                query_datetime = query_datetime.replace(tzinfo=timezone.utc)
+            if query_datetime.microsecond != 0:
+                self._warn(
+                    f"Query for timestamp {value!r} for field {prop!r} contained microseconds, which is not RFC3339 compliant. "
+                    "This may cause undefined behaviour for the underlying database.",
+                    TimestampNotRFCCompliant,
+                )
+
+            new_expr[operator] = query_datetime
+
+        return {prop: new_expr}
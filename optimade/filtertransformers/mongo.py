@@ -5,16 +5,63 @@ which takes the parsed filter and converts it to a valid pymongo/BSON query.
 
 import copy
 import itertools
-import warnings
+from collections.abc import Callable, Sequence
 from typing import Any
 
 from lark import Token, v_args
 
 from optimade.exceptions import BadRequest
 from optimade.filtertransformers.base_transformer import BaseTransformer, Quantity
+from optimade.models.utils import CHEMICAL_SYMBOLS, EXTRA_SYMBOLS
 from optimade.warnings import TimestampNotRFCCompliant
 
-__all__ = ("MongoTransformer",)
+__all__ = ("MongoTransformer", "elements_bitmask_fields")
+
+ELEMENTS_BITMASK_FIELD = "_elements_bitmask"
+"""The field holding the bitmask of the elements of an entry, see
+[`elements_bitmask_fields`][optimade.filtertransformers.mongo.elements_bitmask_fields]."""
+
+ELEMENTS_KEY_FIELD = "_elements_key"
+"""The field holding the sorted elements of an entry, joined by `-`, see
+[`elements_bitmask_fields`][optimade.filtertransformers.mongo.elements_bitmask_fields]."""
+
+ELEMENT_BITS = {
+    symbol: bit for bit, symbol in enumerate(CHEMICAL_SYMBOLS + EXTRA_SYMBOLS)
+}
+"""The position of every chemical symbol in the elements bitmask."""
+
+MAX_HAS_ONLY_KEYS = 255
+"""The maximum number of `_elements_key` values to look up for a `HAS ONLY` filter."""
+
+
+def elements_bitmask_fields(elements: Any) -> dict[str, Any]:
+    """Derive the fields used to query `elements` with bitwise operators from the
+    list of elements of an entry:
+
+    - `_elements_bitmask`: a 128-bit mask, stored as 16 bytes (BSON binary data)
+        in little-endian order, with the bit of every element set, the bit of
+        an element being its position in `CHEMICAL_SYMBOLS + EXTRA_SYMBOLS`;
+    - `_elements_key`: the sorted elements, joined by `-`, e.g., `"O-Si"`.
+
+    Parameters:
+        elements: The elements of the entry.
+
+    Returns:
+        The derived fields, or an empty dictionary if the elements are not a list
+        of known chemical symbols.
+
+    """
+    if not isinstance(elements, list) or not all(
+        element in ELEMENT_BITS for element in elements
+    ):
+        return {}
+    bitmask = 0
+    for element in elements:
+        bitmask |= 1 << ELEMENT_BITS[element]
+    return {
+        ELEMENTS_BITMASK_FIELD: bitmask.to_bytes(16, "little"),
+        ELEMENTS_KEY_FIELD: "-".join(sorted(set(elements))),
+    }
 
 
 class MongoTransformer(BaseTransformer):
@@ -32,6 +79,9 @@ class MongoTransformer(BaseTransformer):
         mapper: A resource mapper object that defines the
             expected fields and acts as a container for
             various field-related configuration.
+        elements_bitmask: Whether the entries hold the fields derived by
+            [`elements_bitmask_fields`][optimade.filtertransformers.mongo.elements_bitmask_fields],
+            which are then used for `HAS ALL`, `HAS ANY` and `HAS ONLY` filters on `elements`.
 
     """
 
@@ -55,15 +105,43 @@ class MongoTransformer(BaseTransformer):
         "$nin": "$in",
     }
 
+    def __init__(self, mapper=None, elements_bitmask: bool = False):
+        """Initialise the transformer object, optionally loading in a
+        resource mapper for use when parsing filters.
+
+        Parameters:
+            mapper: A resource mapper object that defines the
+                expected fields and acts as a container for
+                various field-related configuration.
+            elements_bitmask: Whether to query `elements` with the derived bitmask
+                fields, see `elements_bitmask_fields`.
+
+        """
+        super().__init__(mapper=mapper)
+        self.elements_bitmask = elements_bitmask
+
     def postprocess(self, query: dict[str, Any]):
-        """Used to post-process the nested dictionary of the parsed query."""
-        query = self._apply_relationship_filtering(query)
-        query = self._apply_length_operators(query)
-        query = self._apply_unknown_or_null_filter(query)
-        query = self._apply_has_only_filter(query)
-        query = self._apply_mongo_id_filter(query)
-        query = self._apply_mongo_date_filter(query)
-        return query
+        """Used to post-process the nested dictionary of the parsed query.
+
+        All rewrite rules are applied in a single traversal of the query
+        (see [`rewrite_query`][optimade.filtertransformers.mongo.rewrite_query]),
+        in the following order: relationship filtering, length operators,
+        KNOWN/UNKNOWN filters, elements bitmask filters, HAS ONLY filters,
+        MongoDB `ObjectId`s and dates.
+
+        """
+        return rewrite_query(
+            query,
+            (
+                self._rewrite_relationship_filter,
+                self._rewrite_length_operator,
+                self._rewrite_unknown_or_null_filter,
+                self._rewrite_elements_bitmask_filter,
+                self._rewrite_has_only_filter,
+                self._rewrite_mongo_id_filter,
+                self._rewrite_mongo_date_filter,
+            ),
+        )
 
     def value_list(self, arg):
         # value_list: [ OPERATOR ] value ( "," [ OPERATOR ] value )*
@@ -320,251 +398,342 @@ class MongoTransformer(BaseTransformer):
             return filter_
         return {"$and": [filter_, {prop: {"$ne": None}}]}
 
-    def _apply_length_operators(self, filter_: dict) -> dict:
+    def _rewrite_length_operator(self, prop: str, expr: Any) -> dict | None:
         """Check for any invalid pymongo queries that involve applying a
         comparison operator to the length of a field, and transform
         them into a test for existence of the relevant entry, e.g.
         "list LENGTH > 3" becomes "does the 4th list entry exist?".
 
         """
-
-        def check_for_length_op_filter(_, expr):
-            return (
-                isinstance(expr, dict)
-                and "$size" in expr
-                and isinstance(expr["$size"], dict)
-            )
-
-        def apply_length_op(subdict, prop, expr):
-            # assumes that the dictionary only has one element by design
-            # (we just made it above in the transformer)
-            operator, value = list(expr["$size"].items())[0]
-            if operator in self.operator_map.values() and operator != "$ne":
-                # worth being explicit here, I think
-                _prop = None
-                existence = None
-                if operator == "$gt":
-                    _prop = f"{prop}.{value + 1}"
-                    existence = True
-                elif operator == "$gte":
-                    _prop = f"{prop}.{value}"
-                    existence = True
-                elif operator == "$lt":
-                    _prop = f"{prop}.{value}"
-                    existence = False
-                elif operator == "$lte":
-                    _prop = f"{prop}.{value + 1}"
-                    existence = False
-                if _prop is not None:
-                    subdict.pop(prop)
-                    subdict[_prop] = {"$exists": existence}
-
-            return subdict
-
-        return recursive_postprocessing(
-            filter_,
-            check_for_length_op_filter,
-            apply_length_op,
-        )
-
-    def _apply_relationship_filtering(self, filter_: dict) -> dict:
+        if not (
+            isinstance(expr, dict)
+            and "$size" in expr
+            and isinstance(expr["$size"], dict)
+        ):
+            return None
+
+        # assumes that the dictionary only has one element by design
+        # (we just made it above in the transformer)
+        operator, value = next(iter(expr["$size"].items()))
+        if operator not in self.operator_map.values() or operator == "$ne":
+            return None
+
+        # worth being explicit here, I think
+        if operator == "$gt":
+            return {f"{prop}.{value + 1}": {"$exists": True}}
+        if operator == "$gte":
+            return {f"{prop}.{value}": {"$exists": True}}
+        if operator == "$lt":
+            return {f"{prop}.{value}": {"$exists": False}}
+        if operator == "$lte":
+            return {f"{prop}.{value + 1}": {"$exists": False}}
+
+        return None
+
+    def _rewrite_relationship_filter(self, prop: str, expr: Any) -> dict | None:
         """Check query for property names that match the entry
         types, and transform them as relationship filters rather than
         property filters.
 
         """
-
-        def check_for_entry_type(prop, _):
-            return str(prop).count(".") == 1 and str(prop).split(".")[0] in (
-                "structures",
-                "references",
+        if not (
+            str(prop).count(".") == 1
+            and str(prop).split(".")[0] in ("structures", "references")
+        ):
+            return None
+
+        _prop, _field = str(prop).split(".")
+        if _field != "id":
+            raise NotImplementedError(
+                f'Cannot filter relationships by field "{_field}", only "id" is supported.'
             )
 
-        def replace_with_relationship(subdict, prop, expr):
-            _prop, _field = str(prop).split(".")
-            if _field != "id":
-                raise NotImplementedError(
-                    f'Cannot filter relationships by field "{_field}", only "id" is supported.'
-                )
+        return {f"relationships.{_prop}.data.{_field}": expr}
 
-            subdict[f"relationships.{_prop}.data.{_field}"] = expr
-            subdict.pop(prop)
-            return subdict
+    def _rewrite_elements_bitmask_filter(self, prop: str, expr: Any) -> dict | None:
+        """Replace `HAS ALL`, `HAS ANY` and `HAS ONLY` filters on `elements` with
+        queries on the derived fields of
+        [`elements_bitmask_fields`][optimade.filtertransformers.mongo.elements_bitmask_fields],
+        if enabled:
 
-        return recursive_postprocessing(
-            filter_, check_for_entry_type, replace_with_relationship
-        )
+        - `HAS ALL` and `HAS ANY` test the bits of the elements with `$bitsAllSet`
+            and `$bitsAnySet`;
+        - `HAS ONLY` looks up every (non-empty) combination of the given elements in
+            `_elements_key`, or, for many elements, tests that all other bits are
+            clear with `$bitsAllClear`.
+
+        Entries without the derived fields, e.g., with unknown chemical symbols,
+        are still matched by the original filter.
 
-    def _apply_has_only_filter(self, filter_: dict) -> dict:
-        """This method loops through the query and replaces the magic key `"#only"`
-        with the proper 'HAS ONLY' query.
         """
+        if not (
+            self.elements_bitmask
+            and self.mapper is not None
+            and "elements" in self.mapper.ENTRY_RESOURCE_ATTRIBUTES
+            and prop == self.mapper.get_backend_field("elements")
+            and isinstance(expr, dict)
+            and len(expr) == 1
+        ):
+            return None
+
+        operator, values = next(iter(expr.items()))
+        if operator not in ("$all", "$in", "#only") or not all(
+            value in ELEMENT_BITS for value in values
+        ):
+            return None
+
+        bits = sorted({ELEMENT_BITS[value] for value in values})
+        if operator == "$all":
+            query: dict[str, Any] = {ELEMENTS_BITMASK_FIELD: {"$bitsAllSet": bits}}
+        elif operator == "$in":
+            query = {ELEMENTS_BITMASK_FIELD: {"$bitsAnySet": bits}}
+        elif 2 ** len(bits) - 1 <= MAX_HAS_ONLY_KEYS:
+            symbols = sorted(set(values))
+            query = {
+                ELEMENTS_KEY_FIELD: {
+                    "$in": [
+                        "-".join(combination)
+                        for size in range(1, len(symbols) + 1)
+                        for combination in itertools.combinations(symbols, size)
+                    ]
+                }
+            }
+        else:
+            allowed = set(bits)
+            query = {
+                "$and": [
+                    {
+                        ELEMENTS_BITMASK_FIELD: {
+                            "$bitsAllClear": [
+                                bit for bit in range(128) if bit not in allowed
+                            ]
+                        }
+                    },
+                    {ELEMENTS_KEY_FIELD: {"$ne": ""}},
+                ]
+            }
 
-        def check_for_only_filter(_, expr):
-            """Find cases where the magic key `"#only"` is in the query."""
-            return isinstance(expr, dict) and ("#only" in expr)
+        return {
+            "$or": [
+                query,
+                {"$and": [{ELEMENTS_KEY_FIELD: {"$exists": False}}, {prop: expr}]},
+            ]
+        }
 
-        def replace_only_filter(subdict: dict, prop: str, expr: dict):
-            """Replace the magic key `"#only"` (added by this transformer) with an `$elemMatch`-based query.
+    def _rewrite_has_only_filter(self, prop: str, expr: Any) -> dict | None:
+        """Replace the magic key `"#only"` (added by this transformer) with an `$elemMatch`-based query.
 
-            The first part of the query selects all the documents that contain any value that does not
-            match any target values for the property `prop`.
-            Subsequently, this selection is inverted, to get the documents that only have
-            the allowed values.
-            This inversion also selects documents with edge-case values such as null or empty lists;
-            these are removed in the second part of the query that makes sure that only documents
-            with lists that have at least one value are selected.
+        The first part of the query selects all the documents that contain any value that does not
+        match any target values for the property `prop`.
+        Subsequently, this selection is inverted, to get the documents that only have
+        the allowed values.
+        This inversion also selects documents with edge-case values such as null or empty lists;
+        these are removed in the second part of the query that makes sure that only documents
+        with lists that have at least one value are selected.
 
-            """
+        """
+        if not (isinstance(expr, dict) and "#only" in expr):
+            return None
 
-            if "$and" not in subdict:
-                subdict["$and"] = []
-
-            if prop.startswith("relationships."):
-                if prop not in (
-                    "relationships.references.data.id",
-                    "relationships.structures.data.id",
-                ):
-                    raise BadRequest(f"Unable to query on unrecognised field {prop}.")
-                first_part_prop = ".".join(prop.split(".")[:-1])
-                subdict["$and"].append(
+        if prop.startswith("relationships."):
+            if prop not in (
+                "relationships.references.data.id",
+                "relationships.structures.data.id",
+            ):
+                raise BadRequest(f"Unable to query on unrecognised field {prop}.")
+            first_part_prop = ".".join(prop.split(".")[:-1])
+            return {
+                "$and": [
                     {
                         first_part_prop: {
                             "$not": {"$elemMatch": {"id": {"$nin": expr["#only"]}}}
                         }
-                    }
-                )
-                subdict["$and"].append({first_part_prop + ".0": {"$exists": True}})
+                    },
+                    {first_part_prop + ".0": {"$exists": True}},
+                ]
+            }
 
-            else:
-                subdict["$and"].append(
-                    {prop: {"$not": {"$elemMatch": {"$nin": expr["#only"]}}}}
-                )
-                subdict["$and"].append({prop + ".0": {"$exists": True}})
+        return {
+            "$and": [
+                {prop: {"$not": {"$elemMatch": {"$nin": expr["#only"]}}}},
+                {prop + ".0": {"$exists": True}},
+            ]
+        }
 
-            subdict.pop(prop)
-            return subdict
+    def _rewrite_unknown_or_null_filter(self, prop: str, expr: Any) -> dict | None:
+        """Replace the magic key `"#known"` (added by this transformer) with the
+        appropriate combination of `$exists` and/or test for nullity, i.e., a check
+        for existence and a check for not null for KNOWN, and the inverse for UNKNOWN.
 
-        return recursive_postprocessing(
-            filter_, check_for_only_filter, replace_only_filter
-        )
+        The query dict will look like `{"field": {"#known": T/F}}` or
+        `{"field": "$not": {"#known": T/F}}`.
 
-    def _apply_unknown_or_null_filter(self, filter_: dict) -> dict:
-        """This method loops through the query and replaces the check for
-        KNOWN with a check for existence and a check for not null, and the
-        inverse for UNKNOWN.
+        """
+        if not (
+            isinstance(expr, dict)
+            and ("#known" in expr or "#known" in expr.get("$not", {}))
+        ):
+            return None
+
+        not_ = set(expr.keys()) == {"$not"}
+        if not_:
+            expr = expr["$not"]
+
+        exists = expr["#known"] ^ not_
+
+        top_level_key = "$or"
+        comparison_operator = "$eq"
+        if exists:
+            top_level_key = "$and"
+            comparison_operator = "$ne"
+
+        return {
+            top_level_key: [
+                {prop: {"$exists": exists}},
+                {prop: {comparison_operator: None}},
+            ]
+        }
+
+    def _rewrite_mongo_id_filter(self, prop: str, expr: Any) -> dict | None:
+        """Replace any operations on the special Mongodb `_id` key with the
+        corresponding operation on a BSON `ObjectId` type.
 
         """
+        if prop != "_id":
+            return None
 
-        def check_for_known_filter(_, expr):
-            """Find cases where the query dict looks like
-            `{"field": {"#known": T/F}}` or
-            `{"field": "$not": {"#known": T/F}}`, which is a magic word
-            for KNOWN/UNKNOWN filters in this transformer.
+        from bson import ObjectId
 
-            """
-            return isinstance(expr, dict) and (
-                "#known" in expr or "#known" in expr.get("$not", {})
+        new_expr = {}
+        for operator, val in expr.items():
+            if operator not in ("$eq", "$ne"):
+                if self.mapper is not None:
+                    prop = self.mapper.get_optimade_field(prop)
+                raise NotImplementedError(
+                    f"Operator {operator} not supported for query on field {prop!r}, can only test for equality"
+                )
+            new_expr[operator] = ObjectId(val) if isinstance(val, str) else val
+
+        return {prop: new_expr}
+
+    def _rewrite_mongo_date_filter(self, prop: str, expr: Any) -> dict | None:
+        """Replace any operations on suspected timestamp properties with the
+        corresponding operation on a BSON `DateTime` type.
+
+        """
+        optimade_prop = prop
+        if self.mapper is not None:
+            optimade_prop = self.mapper.get_optimade_field(prop)
+        if optimade_prop != "last_modified":
+            return None
+
+        import bson.json_util
+
+        new_expr = {}
+        for operator, value in expr.items():
+            query_datetime = bson.json_util.loads(
+                bson.json_util.dumps({"$date": value}),
+                json_options=bson.json_util.DEFAULT_JSON_OPTIONS.with_options(
+                    tz_aware=True, tzinfo=bson.tz_util.utc
+                ),
             )
+            if query_datetime.microsecond != 0:
+                self._warn(
+                    f"Query for timestamp {value!r} for field {prop!r} contained microseconds, which is not RFC3339 compliant. "
+                    "This may cause undefined behaviour for the underlying database.",
+                    TimestampNotRFCCompliant,
+                )
 
-        def replace_known_filter_with_or(subdict, prop, expr):
-            """Replace magic key `"#known"` (added by this transformer) with the appropriate
-            combination of `$exists` and/or test for nullity.
-            combination of $exists and/or $eq/$ne null.
+            new_expr[operator] = query_datetime
 
-            """
-            not_ = set(expr.keys()) == {"$not"}
-            if not_:
-                expr = expr["$not"]
+        return {prop: new_expr}
 
-            exists = expr["#known"] ^ not_
 
-            top_level_key = "$or"
-            comparison_operator = "$eq"
-            if exists:
-                top_level_key = "$and"
-                comparison_operator = "$ne"
+RewriteRule = Callable[[str, Any], dict | None]
+"""A rewrite rule for [`rewrite_query`][optimade.filtertransformers.mongo.rewrite_query].
 
-            if top_level_key not in subdict:
-                subdict[top_level_key] = []
+It takes the property and expression of one entry in a query dictionary and returns
+either `None`, if the rule does not apply, or the dictionary that should replace the
+entry `{prop: expr}`.
+A rule must not modify the expression it is given in-place.
+"""
 
-            subdict[top_level_key].append({prop: {"$exists": exists}})
-            subdict[top_level_key].append({prop: {comparison_operator: None}})
 
-            subdict.pop(prop)
+def rewrite_query(filter_: Any, rules: Sequence[RewriteRule]) -> Any:
+    """Apply a sequence of rewrite rules to a query in a single traversal.
 
-            return subdict
+    Each entry `(prop, expr)` of every dictionary in the query (contained in a list,
+    or as an entry in another dictionary) is passed through the rules in order.
+    When a rule applies, the entries it returns are passed through the remaining
+    rules only, and any lists they contain (e.g., the operands of a new `$and`) are
+    rewritten with the remaining rules.
+    This gives the same result as applying each rule to the whole query in turn,
+    without re-traversing the query once per rule.
 
-        return recursive_postprocessing(
-            filter_, check_for_known_filter, replace_known_filter_with_or
-        )
+    Rewritten `$and` entries are merged with any existing `$and` of the same
+    dictionary, and two `$or` entries of the same dictionary are combined with
+    an `$and`.
+    Only the dictionaries and lists on the path to a rewritten entry are copied;
+    any unchanged part of the query is returned as-is.
 
-    def _apply_mongo_id_filter(self, filter_: dict) -> dict:
-        """This method loops through the query and replaces any operations
-        on the special Mongodb `_id` key with the corresponding operation
-        on a BSON `ObjectId` type.
-        """
+    Parameters:
+        filter_: The query to rewrite.
+        rules: The rewrite rules to apply, in order.
 
-        def check_for_id_key(prop, _):
-            """Find cases where the query dict is operating on the `_id` field."""
-            return prop == "_id"
-
-        def replace_str_id_with_objectid(subdict, prop, expr):
-            from bson import ObjectId
-
-            for operator in subdict[prop]:
-                val = subdict[prop][operator]
-                if operator not in ("$eq", "$ne"):
-                    if self.mapper is not None:
-                        prop = self.mapper.get_optimade_field(prop)
-                    raise NotImplementedError(
-                        f"Operator {operator} not supported for query on field {prop!r}, can only test for equality"
-                    )
-                if isinstance(val, str):
-                    subdict[prop][operator] = ObjectId(val)
-            return subdict
-
-        return recursive_postprocessing(
-            filter_, check_for_id_key, replace_str_id_with_objectid
-        )
+    Returns:
+        The rewritten query.
 
-    def _apply_mongo_date_filter(self, filter_: dict) -> dict:
-        """This method loops through the query and replaces any operations
-        on suspected timestamp properties with the corresponding operation
-        on a BSON `DateTime` type.
-        """
+    """
+    if isinstance(filter_, list):
+        new_list = [rewrite_query(q, rules) for q in filter_]
+        if all(new is old for new, old in zip(new_list, filter_)):
+            return filter_
+        return new_list
 
-        def check_for_timestamp_field(prop, _):
-            """Find cases where the query dict is operating on a timestamp field."""
-            if self.mapper is not None:
-                prop = self.mapper.get_optimade_field(prop)
-            return prop == "last_modified"
-
-        def replace_str_date_with_datetime(subdict, prop, expr):
-            """Encode suspected dates in with BSON."""
-            import bson.json_util
-
-            for operator in subdict[prop]:
-                query_datetime = bson.json_util.loads(
-                    bson.json_util.dumps({"$date": subdict[prop][operator]}),
-                    json_options=bson.json_util.DEFAULT_JSON_OPTIONS.with_options(
-                        tz_aware=True, tzinfo=bson.tz_util.utc
-                    ),
-                )
-                if query_datetime.microsecond != 0:
-                    warnings.warn(
-                        f"Query for timestamp {subdict[prop][operator]!r} for field {prop!r} contained microseconds, which is not RFC3339 compliant. "
-                        "This may cause undefined behaviour for the underlying database.",
-                        TimestampNotRFCCompliant,
-                    )
+    if isinstance(filter_, dict):
+        changed = False
+        new_dict: dict[str, Any] = {}
+        for prop, expr in filter_.items():
+            entries = _rewrite_entry(prop, expr, rules)
+            if len(entries) != 1 or entries[0][0] != prop or entries[0][1] is not expr:
+                changed = True
+            for key, value in entries:
+                if key == "$and" and key in new_dict:
+                    new_dict[key] = new_dict[key] + value
+                elif key == "$or" and key in new_dict:
+                    # Both disjunctions must hold, so they cannot be concatenated
+                    new_dict["$and"] = [
+                        *new_dict.get("$and", []),
+                        {"$or": new_dict.pop("$or")},
+                        {"$or": value},
+                    ]
+                else:
+                    new_dict[key] = value
+        return new_dict if changed else filter_
 
-                subdict[prop][operator] = query_datetime
+    return filter_
 
-            return subdict
 
-        return recursive_postprocessing(
-            filter_, check_for_timestamp_field, replace_str_date_with_datetime
-        )
+def _rewrite_entry(
+    prop: str, expr: Any, rules: Sequence[RewriteRule]
+) -> list[tuple[str, Any]]:
+    """Pass a single query entry through the rewrite rules, returning the
+    list of entries that should replace it.
+
+    """
+    if isinstance(expr, list):
+        return [(prop, rewrite_query(expr, rules))]
+
+    for ind, rule in enumerate(rules):
+        replacement = rule(prop, expr)
+        if replacement is not None:
+            remaining = rules[ind + 1 :]
+            entries: list[tuple[str, Any]] = []
+            for key, value in replacement.items():
+                entries.extend(_rewrite_entry(key, value, remaining))
+            return entries
+
+    return [(prop, expr)]
 
 
 def recursive_postprocessing(filter_: dict | list, condition, replacement):
@@ -573,6 +742,13 @@ def recursive_postprocessing(filter_: dict | list, condition, replacement):
     the condition passed. If the condition is true, apply the
     replacement to the dictionary.
 
+    Note:
+        This is a thin wrapper around
+        [`rewrite_query`][optimade.filtertransformers.mongo.rewrite_query], that
+        only copies the expressions for which the condition is true.
+        The replacement is called with a dictionary containing just the
+        matching property and a copy of its expression.
+
     Parameters:
         filter_ : the filter_ to process.
         condition (callable): a function that returns True if the
@@ -593,7 +769,8 @@ def recursive_postprocessing(filter_: dict | list, condition, replacement):
             return prop == "field_name_old"
 
         def replacement(d, prop, expr):
-            d["field_name_old"] = d.pop(prop)
+            d["field_name_new"] = d.pop(prop)
+            return d
 
         filter_ = recursive_postprocessing(
             filter_, condition, replacement
@@ -602,20 +779,10 @@ def recursive_postprocessing(filter_: dict | list, condition, replacement):
         ```
 
     """
-    if isinstance(filter_, list):
-        result = [recursive_postprocessing(q, condition, replacement) for q in filter_]
-        return result
 
-    if isinstance(filter_, dict):
-        # this could potentially lead to memory leaks if the filter_ is *heavily* nested
-        _cached_filter = copy.deepcopy(filter_)
-        for prop, expr in filter_.items():
-            if condition(prop, expr):
-                _cached_filter = replacement(_cached_filter, prop, expr)
-            elif isinstance(expr, list):
-                _cached_filter[prop] = [
-                    recursive_postprocessing(q, condition, replacement) for q in expr
-                ]
-        return _cached_filter
+    def rule(prop: str, expr: Any) -> dict | None:
+        if not condition(prop, expr):
+            return None
+        return replacement({prop: copy.deepcopy(expr)}, prop, expr)
 
-    return filter_
+    return rewrite_query(filter_, (rule,))
@@ -0,0 +1,271 @@
+"""This submodule implements the
+[`SQLTransformer`][optimade.filtertransformers.sql.SQLTransformer],
+which compiles the parsed filter into a parameterized SQL condition over the
+normalized schema of the
+[`SQLiteCollection`][optimade.server.entry_collections.sqlite.SQLiteCollection].
+"""
+
+from datetime import datetime, timezone
+from typing import Any
+
+from lark import v_args
+
+from optimade.exceptions import BadRequest
+from optimade.filtertransformers.base_transformer import QueryObjectTransformer
+
+__all__ = ("SQLQuery", "SQLTransformer", "sql_timestamp")
+
+_SCALAR_KINDS = "kind NOT IN ('array', 'object')"
+
+
+def sql_timestamp(value: datetime) -> str:
+    """Format a timestamp as stored in the SQL backend, i.e., as a fixed-width
+    ISO 8601 string in UTC, such that timestamps compare as strings.
+    Timestamps without a timezone are taken to be in UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _glob_escape(value: str) -> str:
+    """Escape the special characters of an SQLite `GLOB` pattern."""
+    return "".join(f"[{char}]" if char in "*?[" else char for char in value)
+
+
+class SQLQuery:
+    """A filter compiled into a parameterized SQL condition on the `entries` table.
+
+    Following the OPTIMADE semantics for `null` values, the query also holds the
+    condition for its negation, which does not match entries for which the compared
+    properties are unknown, e.g., `NOT nelements = 2` does not match entries with
+    an unknown `nelements`.
+
+    Attributes:
+        sql: The SQL condition, with `?` placeholders.
+        params: The parameters of the placeholders in `sql`.
+        negation_sql: The SQL condition of the negated query.
+        negation_params: The parameters of the placeholders in `negation_sql`.
+
+    """
+
+    def __init__(
+        self,
+        sql: str,
+        params: list[Any],
+        negation_sql: str,
+        negation_params: list[Any],
+    ):
+        self.sql = sql
+        self.params = params
+        self.negation_sql = negation_sql
+        self.negation_params = negation_params
+
+    def __and__(self, other: "SQLQuery") -> "SQLQuery":
+        return SQLQuery(
+            f"({self.sql} AND {other.sql})",
+            self.params + other.params,
+            f"({self.negation_sql} OR {other.negation_sql})",
+            self.negation_params + other.negation_params,
+        )
+
+    def __or__(self, other: "SQLQuery") -> "SQLQuery":
+        return SQLQuery(
+            f"({self.sql} OR {other.sql})",
+            self.params + other.params,
+            f"({self.negation_sql} AND {other.negation_sql})",
+            self.negation_params + other.negation_params,
+        )
+
+    def __invert__(self) -> "SQLQuery":
+        return SQLQuery(self.negation_sql, self.negation_params, self.sql, self.params)
+
+    def __deepcopy__(self, memo: dict) -> "SQLQuery":
+        # Compiled queries are immutable
+        return self
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.sql!r}, {self.params!r})"
+
+
+class SQLTransformer(QueryObjectTransformer):
+    """Transformer that compiles the filter into an
+    [`SQLQuery`][optimade.filtertransformers.sql.SQLQuery].
+
+    The values of the entries are stored in a normalized table with one row per
+    value, such that any (nested) property can be queried:
+    `(entry, field, position, kind, number, text)`, where `field` is the dotted
+    backend field, `position` is the index of the value in its list (or `NULL`
+    if it is not in a list), `kind` is one of `number`, `bool`, `string`, `date`,
+    `array` or `object`, and `number` and `text` hold the value (the length for
+    an `array`).
+    Every condition selects the `entry` column of the `entries` table
+    from the values matching a comparison.
+
+    """
+
+    def __init__(self, mapper=None, values_table: str = "entry_values"):
+        """Initialise the transformer object, optionally loading in a
+        resource mapper for use when parsing filters.
+
+        Parameters:
+            mapper: A resource mapper object that defines the
+                expected fields and acts as a container for
+                various field-related configuration.
+            values_table: The (quoted) name of the table of values.
+
+        """
+        super().__init__(mapper=mapper)
+        self.values_table = values_table
+
+    def _known(self, field: str) -> tuple[str, list[Any]]:
+        return (
+            f"entries.entry IN (SELECT entry FROM {self.values_table} WHERE field = ?)",
+            [field],
+        )
+
+    def _match(
+        self, field: str, condition: str, params: list[Any]
+    ) -> tuple[str, list[Any]]:
+        return (
+            f"entries.entry IN (SELECT entry FROM {self.values_table} "
+            f"WHERE field = ? AND {condition})",
+            [field, *params],
+        )
+
+    def _on_field(
+        self, field: str, condition: str | None, params: list[Any]
+    ) -> SQLQuery:
+        """Create the query matching the entries with a value of the field satisfying
+        the condition, whose negation matches the other entries with a known value."""
+        known_sql, known_params = self._known(field)
+        if condition is None:
+            return SQLQuery("0", [], known_sql, known_params)
+        sql, params = self._match(field, condition, params)
+        return SQLQuery(
+            sql, params, f"({known_sql} AND NOT {sql})", known_params + params
+        )
+
+    def _condition(
+        self, field: str, operator: str, value: Any
+    ) -> tuple[str | None, list[Any]]:
+        """Return the condition on a single value, or `None` if the value
+        cannot be compared."""
+        if isinstance(value, int | float) and not isinstance(value, bool):
+            return f"kind = 'number' AND number {operator} ?", [value]
+        if not isinstance(value, str):
+            return None, []
+        if self._is_timestamp(field):
+            try:
+                timestamp = datetime.fromisoformat(value)
+            except ValueError:
+                raise BadRequest(
+                    detail=f"Unable to parse timestamp {value!r} for field {field!r}."
+                )
+            return f"kind = 'date' AND text {operator} ?", [sql_timestamp(timestamp)]
+        return f"kind = 'string' AND text {operator} ?", [value]
+
+    def _any_condition(
+        self, field: str, values: list[Any]
+    ) -> tuple[str | None, list[Any]]:
+        """Return the condition on a single value being equal to any of the values."""
+        conditions, params = [], []
+        for value in values:
+            condition, condition_params = self._condition(field, "=", value)
+            if condition is not None:
+                conditions.append(f"({condition})")
+                params.extend(condition_params)
+        if not conditions:
+            return None, []
+        return "(" + " OR ".join(conditions) + ")", params
+
+    def _is_timestamp(self, field: str) -> bool:
+        if self.mapper is not None:
+            field = self.mapper.get_optimade_field(field)
+        return field == "last_modified"
+
+    def _compare(self, field: Any, operator: str, value: Any) -> SQLQuery:
+        if not isinstance(field, str):
+            raise NotImplementedError("Comparing two constants is not supported.")
+        if operator == "!=":
+            return ~self._compare(field, "=", value)
+        return self._on_field(field, *self._condition(field, operator, value))
+
+    @v_args(inline=True)
+    def known_op_rhs(self, _, value):
+        # known_op_rhs: IS ( KNOWN | UNKNOWN )
+        def query(field: str) -> SQLQuery:
+            sql, params = self._known(field)
+            result = SQLQuery(sql, params, f"NOT {sql}", params)
+            return result if value == "KNOWN" else ~result
+
+        return query
+
+    def fuzzy_string_op_rhs(self, arg):
+        # fuzzy_string_op_rhs: CONTAINS value | STARTS [ WITH ] value | ENDS [ WITH ] value
+        operator, value = str(arg[0]), arg[-1]
+        if not isinstance(value, str):
+            raise NotImplementedError(
+                f"{operator} is only supported for string values, not {value!r}."
+            )
+        pattern = {"CONTAINS": "*{}*", "STARTS": "{}*", "ENDS": "*{}"}[operator]
+        return lambda field: self._on_field(
+            field,
+            "kind = 'string' AND text GLOB ?",
+            [pattern.format(_glob_escape(value))],
+        )
+
+    def set_op_rhs(self, arg):
+        # set_op_rhs: HAS ( [ OPERATOR ] value | ALL value_list | ANY value_list | ONLY value_list )
+        if len(arg) == 2 or (len(arg) == 3 and arg[1] in self.operator_map):
+            operator = "=" if len(arg) == 2 else str(arg[1])
+            value = arg[-1]
+            return lambda field: self._on_field(
+                field, *self._condition(field, operator, value)
+            )
+
+        mode, values = str(arg[1]), arg[2]
+        if mode == "ALL":
+
+            def has_all(field: str) -> SQLQuery:
+                result = self._on_field(field, *self._condition(field, "=", values[0]))
+                for value in values[1:]:
+                    result &= self._on_field(field, *self._condition(field, "=", value))
+                return result
+
+            return has_all
+
+        if mode == "ANY":
+            return lambda field: self._on_field(
+                field, *self._any_condition(field, values)
+            )
+
+        def has_only(field: str) -> SQLQuery:
+            # Lists with at least one value, none of which is outside the given values
+            allowed, params = self._any_condition(field, values)
+            in_list = f"position IS NOT NULL AND {_SCALAR_KINDS}"
+            non_empty_sql, non_empty_params = self._match(field, in_list, [])
+            other_sql, other_params = self._match(
+                field,
+                in_list if allowed is None else f"{in_list} AND NOT {allowed}",
+                params,
+            )
+            sql = f"({non_empty_sql} AND NOT {other_sql})"
+            known_sql, known_params = self._known(field)
+            return SQLQuery(
+                sql,
+                non_empty_params + other_params,
+                f"({known_sql} AND NOT {sql})",
+                known_params + non_empty_params + other_params,
+            )
+
+        return has_only
+
+    def length_op_rhs(self, arg):
+        # length_op_rhs: LENGTH [ OPERATOR ] value
+        operator = str(arg[1]) if len(arg) == 3 else "="
+        value = arg[-1]
+        if not isinstance(value, int | float) or isinstance(value, bool):
+            return lambda field: self._on_field(field, None, [])
+        return lambda field: self._on_field(
+            field, f"kind = 'array' AND number {operator} ?", [value]
+        )
@@ -61,12 +61,22 @@ class SupportedBackend(Enum):
         database instance, this will use the
         [`mongomock`](https://github.com/mongomock/mongomock) driver, creating an
         in-memory database, which is mainly used for testing.
+    - `jsonl`: A read-only backend serving the entries of an OPTIMADE JSONL file
+        directly from disk, without any database server or extra dependencies.
+    - `columnar`: An in-memory backend storing the entries in
+        [NumPy](https://numpy.org/) column arrays, with filters evaluated as
+        vectorized operations over these columns.
+    - `sqlite`: An embedded [SQLite](https://www.sqlite.org/) database, stored
+        in memory or in the `sqlite_database` file.
 
     """
 
     ELASTIC = "elastic"
     MONGODB = "mongodb"
     MONGOMOCK = "mongomock"
+    JSONL = "jsonl"
+    COLUMNAR = "columnar"
+    SQLITE = "sqlite"
 
 
 class ConfigFileSettingsSource(PydanticBaseSettingsSource):
@@ -179,6 +189,27 @@ class ServerConfig(BaseSettings):
         ),
     ] = None
 
+    jsonl_database: Annotated[
+        Path | None,
+        Field(
+            description=(
+                "The path to the OPTIMADE JSONL file served by the `jsonl` database backend, "
+                "by default the `insert_from_jsonl` file. An index of the file is stored "
+                "next to it, in a file with the `.index` suffix."
+            )
+        ),
+    ] = None
+
+    sqlite_database: Annotated[
+        str,
+        Field(
+            description=(
+                "The SQLite database file used by the `sqlite` database backend, "
+                "or `:memory:` to keep the database in memory."
+            )
+        ),
+    ] = ":memory:"
+
     create_default_index: Annotated[
         bool,
         Field(
@@ -189,6 +220,63 @@ class ServerConfig(BaseSettings):
         ),
     ] = False
 
+    create_advised_indexes: Annotated[
+        bool,
+        Field(
+            description=(
+                "Whether the default indices of the MongoDB backend also include the "
+                "indices derived from the schema of each entry type and from the queries "
+                "run so far, e.g., on `elements` and `nelements`, rather than only a "
+                "unique index on `id`. The index plan can be printed with `optimade-index-plan`."
+            )
+        ),
+    ] = False
+
+    elements_bitmask: Annotated[
+        bool,
+        Field(
+            description=(
+                "Whether the MongoDB backend stores a bitmask and a sorted key of the "
+                "`elements` of every inserted structure, and uses them for `HAS ALL`, "
+                "`HAS ANY` and `HAS ONLY` filters on `elements`. "
+                "The bitwise operators require MongoDB, they are not supported by mongomock."
+            )
+        ),
+    ] = False
+
+    insert_batch_size: Annotated[
+        int,
+        Field(
+            description=(
+                "The number of entries of each type inserted into the database at once "
+                "when loading the `insert_from_jsonl` file."
+            ),
+            ge=1,
+        ),
+    ] = 1000
+
+    insert_workers: Annotated[
+        int,
+        Field(
+            description=(
+                "The maximum number of batches inserted into the database concurrently "
+                "when loading the `insert_from_jsonl` file."
+            ),
+            ge=1,
+        ),
+    ] = 4
+
+    insert_decode_processes: Annotated[
+        int | None,
+        Field(
+            description=(
+                "The number of processes decoding the `insert_from_jsonl` file, by default "
+                "one per CPU. If 0, the file is decoded in the server process."
+            ),
+            ge=0,
+        ),
+    ] = None
+
     use_real_mongo: Annotated[
         bool | None,
         Field(description="DEPRECATED: force usage of MongoDB over any other backend."),
@@ -201,6 +289,19 @@ class ServerConfig(BaseSettings):
         ),
     ] = SupportedBackend.MONGOMOCK
 
+    async_database: Annotated[
+        bool,
+        Field(
+            description=(
+                "Query the entry collections through an asynchronous database client, "
+                "such that requests waiting on the database do not occupy a worker thread. "
+                "Only supported by the MongoDB backends: `mongodb` requires `pymongo>=4.9` "
+                "(or `motor`), while `mongomock` uses an in-memory stand-in. "
+                "Other backends ignore this option."
+            ),
+        ),
+    ] = False
+
     elastic_hosts: Annotated[
         str | list[str] | dict[str, Any] | list[dict[str, Any]] | None,
         Field(
@@ -220,6 +321,78 @@ class ServerConfig(BaseSettings):
             ),
         ),
     ] = 5
+    count_mode: Annotated[
+        Literal["exact", "first_page", "estimate", "background"],
+        Field(
+            description=(
+                "How the MongoDB backends compute `meta.data_returned` for entry listings. "
+                "`exact` counts the matching documents for every page; `first_page` only "
+                "counts them for the first page of results and reuses the cached count (if "
+                "any) for later pages; `estimate` extrapolates the number of matches in a "
+                "random sample of `count_estimate_sample_size` documents; `background` "
+                "counts in a worker thread and reports the result once it is available. "
+                "In all modes but `exact`, `more_data_available` is determined without "
+                "the count."
+            ),
+        ),
+    ] = "exact"
+    query_workers: Annotated[
+        int,
+        Field(
+            description=(
+                "Number of threads shared by the entry collections to run the database "
+                "round-trips of a request (the page query, the count of matching entries "
+                "for `data_returned` and the collection size for `data_available`) "
+                "concurrently rather than one after another. Set to 0 to run them "
+                "sequentially."
+            ),
+            ge=0,
+        ),
+    ] = 8
+    count_cache_size: Annotated[
+        int,
+        Field(
+            description=(
+                "Maximum number of `data_returned` counts to keep in the per-collection "
+                "cache, keyed by the normalized backend filter. Set to 0 to disable the cache."
+            ),
+            ge=0,
+        ),
+    ] = 256
+    count_cache_ttl: Annotated[
+        float | None,
+        Field(
+            description=(
+                "Number of seconds for which a cached count is reused when `count_mode` is "
+                "not `exact` (exact counts are never cached). Cached counts are also "
+                "discarded whenever data is inserted through the server. `None` keeps them "
+                "until they are evicted."
+            ),
+            ge=0,
+        ),
+    ] = 60
+    data_available_ttl: Annotated[
+        float | None,
+        Field(
+            description=(
+                "Number of seconds for which the total number of entries in a collection "
+                "(`meta.data_available`) is reused before it is queried again. It is also "
+                "refreshed whenever data is inserted through the server. `None` keeps it "
+                "until then, and 0 queries it for every response."
+            ),
+            ge=0,
+        ),
+    ] = 60
+    count_estimate_sample_size: Annotated[
+        int,
+        Field(
+            description=(
+                "Number of randomly sampled documents used to estimate `data_returned` "
+                "when `count_mode` is `estimate`."
+            ),
+            gt=0,
+        ),
+    ] = 1000
 
     mongo_database: Annotated[
         str,
@@ -256,6 +429,30 @@ class ServerConfig(BaseSettings):
     page_limit_max: Annotated[
         int, Field(description="Max allowed number of resources per page")
     ] = 500
+    pagination_mechanism: Annotated[
+        Literal["page_offset", "page_above"],
+        Field(
+            description=(
+                "The pagination mechanism to use for the `next` links of entry listings "
+                "when the client does not request a particular one. `page_above` "
+                "(value-based pagination over the `sort` fields, with `id` as a "
+                "tie-breaker) keeps the cost of deep pages constant, but is currently only "
+                "supported by the MongoDB backends, and not when sorting on a list field; "
+                "`page_offset` is used otherwise."
+            ),
+        ),
+    ] = "page_offset"
+    filter_cache_size: Annotated[
+        int,
+        Field(
+            description=(
+                "Maximum number of compiled filters (the backend query produced by parsing "
+                "and transforming a `filter` string) to keep in the per-collection "
+                "least-recently-used cache. Set to 0 to disable the cache."
+            ),
+            ge=0,
+        ),
+    ] = 256
     default_db: Annotated[
         str,
         Field(
@@ -351,6 +548,19 @@ class ServerConfig(BaseSettings):
             ),
         ),
     ] = {}
+    materialize_length_fields: Annotated[
+        bool,
+        Field(
+            description=(
+                "Whether to store the length of every list property of the schema that "
+                "has no length alias in an `n<field>` field when inserting entries, "
+                "e.g. `nspecies` for `species`, and to register these fields as length "
+                "aliases, so that `LENGTH` filters become (indexable) range queries. "
+                "Entries that are not inserted by the server, e.g. those served by the "
+                "read-only JSONL backend, must already contain these fields."
+            ),
+        ),
+    ] = False
     index_links_path: Annotated[
         Path,
         Field(
@@ -432,7 +642,74 @@ class ServerConfig(BaseSettings):
         ),
     ] = True
 
-    @field_validator("insert_from_jsonl", mode="before")
+    response_validation: Annotated[
+        Literal["always", "sampled", "first_per_shape"],
+        Field(
+            description=(
+                "Which responses are validated if `validate_api_response` is True: "
+                "`always` validates every response against its response model, `sampled` "
+                "only validates a random fraction (`response_validation_sample_rate`) of the "
+                "responses, and `first_per_shape` only validates the first response for each "
+                "query shape, i.e., the entry type and the query parameters used. "
+                "The outcomes of the latter two modes are counted in "
+                "`optimade.server.routers.utils.RESPONSE_VALIDATION_STATS`."
+            ),
+        ),
+    ] = "always"
+    response_validation_sample_rate: Annotated[
+        float,
+        Field(
+            description=(
+                "The fraction of responses that are validated if `response_validation` "
+                "is `sampled`."
+            ),
+            ge=0,
+            le=1,
+        ),
+    ] = 0.05
+
+    response_serializer: Annotated[
+        Literal["json", "orjson"],
+        Field(
+            description=(
+                "The library used to serialize JSON responses: the standard library `json` "
+                "module or the much faster [`orjson`](https://github.com/ijl/orjson), which "
+                "must be installed separately (e.g., `pip install optimade[orjson]`). "
+                "If `validate_api_response` is False, entry listings are serialized with "
+                "`orjson` directly, without a separate conversion step."
+            ),
+        ),
+    ] = "json"
+
+    stream_responses: Annotated[
+        bool,
+        Field(
+            description=(
+                "Stream the responses of entry listings, writing each batch of entries as "
+                "it is fetched from the database cursor, with `included`, `links` and `meta` "
+                "written after the data. This keeps memory use constant regardless of "
+                "`page_limit`, but errors occurring after the response has started cannot "
+                "be reported. As streamed responses cannot be validated, they are only used "
+                "if not every response is validated (see `validate_api_response` and "
+                "`response_validation`)."
+            ),
+        ),
+    ] = False
+
+    explain_endpoint: Annotated[
+        bool,
+        Field(
+            description=(
+                "Serve the `/extensions/explain` endpoint, which returns the parse tree "
+                "and the backend query of a filter, the query plan of the database and "
+                "the time spent in each phase of handling it. As it exposes the database "
+                "layout and runs the query more than once, it should only be enabled for "
+                "debugging."
+            ),
+        ),
+    ] = False
+
+    @field_validator("insert_from_jsonl", "jsonl_database", mode="before")
     @classmethod
     def check_jsonl_path(cls, value: Any) -> Path | None:
         """Check that the path to the JSONL file is valid."""
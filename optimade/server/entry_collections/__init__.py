@@ -1,3 +1,15 @@
-from .entry_collections import EntryCollection, PaginationMechanism, create_collection
+from .entry_collections import (
+    AsyncEntryCollection,
+    BaseEntryCollection,
+    EntryCollection,
+    PaginationMechanism,
+    create_collection,
+)
 
-__all__ = ("EntryCollection", "create_collection", "PaginationMechanism")
+__all__ = (
+    "EntryCollection",
+    "AsyncEntryCollection",
+    "BaseEntryCollection",
+    "create_collection",
+    "PaginationMechanism",
+)
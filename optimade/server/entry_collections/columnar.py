@@ -0,0 +1,605 @@
+"""An in-process database backend that keeps the entries in memory, with the values
+of their properties stored in NumPy column arrays.
+
+Filters are compiled by the
+[`ColumnarTransformer`][optimade.filtertransformers.columnar.ColumnarTransformer]
+into vectorized operations over these columns, such that small and medium databases
+can be served without any external database.
+
+"""
+
+import bisect
+import threading
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timezone
+from typing import Any
+
+import numpy as np
+
+from optimade.exceptions import BadRequest
+from optimade.filtertransformers.columnar import ColumnarTransformer
+from optimade.models import EntryResource
+from optimade.server.entry_collections import EntryCollection, PaginationMechanism
+from optimade.server.entry_collections.entry_collections import (
+    resolve_path,
+    timed,
+    value_kind,
+)
+from optimade.server.mappers import BaseResourceMapper
+
+__all__ = (
+    "Column",
+    "ColumnarCollection",
+    "DateColumn",
+    "ListColumn",
+    "NumberColumn",
+    "StringColumn",
+)
+
+_OPERATORS = {
+    "=": np.equal,
+    "!=": np.not_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+}
+
+
+def _timestamp(value: datetime) -> float:
+    """The POSIX timestamp of a `datetime`, which is taken to be in UTC if naive."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class Column:
+    """A column of the values of a field across the entries of a collection.
+
+    This base class holds the values that cannot be compared, e.g., objects
+    or values of mixed types, for which only `IS KNOWN` and `IS UNKNOWN` can match.
+    Subclasses implement the comparisons for their type of values.
+
+    Each comparison returns the mask of the rows for which it is true, which only
+    includes rows with a known value.
+
+    Attributes:
+        known: The mask of the rows with a known, i.e., present and non-null, value.
+
+    """
+
+    def __init__(self, known: np.ndarray):
+        self.known = known
+
+    def __len__(self) -> int:
+        return len(self.known)
+
+    def _none(self) -> np.ndarray:
+        return np.zeros(len(self), dtype=bool)
+
+    def compare(self, operator: str, value: Any) -> np.ndarray:
+        """Compare the values to `value` with an OPTIMADE comparison operator
+        (`=`, `!=`, `<`, `<=`, `>` or `>=`)."""
+        # Values of different kinds are never equal
+        if operator == "!=":
+            return self.known.copy()
+        return self._none()
+
+    def fuzzy(self, operator: str, value: str) -> np.ndarray:
+        """Match the values with a fuzzy string operator (`CONTAINS`, `STARTS` or `ENDS`)."""
+        return self._none()
+
+    def has(self, operator: str, value: Any) -> np.ndarray:
+        """Select the rows with a value matching `HAS <operator> value`.
+
+        A single value is treated as a list with a single element.
+
+        """
+        return self.compare(operator, value)
+
+    def has_all(self, values: list[Any]) -> np.ndarray:
+        """Select the rows with a value matching `HAS ALL values`."""
+        if not values:
+            return self._none()
+        return np.logical_and.reduce([self.has("=", value) for value in values])
+
+    def has_any(self, values: list[Any]) -> np.ndarray:
+        """Select the rows with a value matching `HAS ANY values`."""
+        if not values:
+            return self._none()
+        return np.logical_or.reduce([self.has("=", value) for value in values])
+
+    def has_only(self, values: list[Any]) -> np.ndarray:
+        """Select the rows with a value matching `HAS ONLY values`."""
+        return self.has_any(values)
+
+    def length(self, operator: str, value: Any) -> np.ndarray:
+        """Select the rows with a value matching `LENGTH <operator> value`."""
+        return self._none()
+
+    def sort_key(self, direction: int) -> np.ndarray:
+        """Return the keys to sort the rows by, in ascending order.
+
+        Like for MongoDB, unknown values come first in ascending order (`direction=1`)
+        and last in descending order (`direction=-1`).
+
+        """
+        return self._sort_key(np.zeros(len(self)), direction)
+
+    def _sort_key(self, keys: np.ndarray, direction: int) -> np.ndarray:
+        return np.where(self.known, keys * direction, -np.inf * direction)
+
+
+class NumberColumn(Column):
+    """A column of numbers, stored as integers if possible."""
+
+    def __init__(self, values: list[Any]):
+        super().__init__(np.array([value is not None for value in values], dtype=bool))
+        integers = all(isinstance(value, int) for value in values if value is not None)
+        self.values = np.array(
+            [0 if value is None else value for value in values],
+            dtype=np.int64 if integers else np.float64,
+        )
+
+    def compare(self, operator: str, value: Any) -> np.ndarray:
+        if value_kind(value) != "number":
+            return super().compare(operator, value)
+        return self.known & _OPERATORS[operator](self.values, value)
+
+    def sort_key(self, direction: int) -> np.ndarray:
+        return self._sort_key(self.values.astype(np.float64), direction)
+
+
+class DateColumn(NumberColumn):
+    """A column of timestamps, stored as POSIX timestamps and compared to
+    RFC 3339 strings."""
+
+    def __init__(self, values: list[Any]):
+        super().__init__(
+            [None if value is None else _timestamp(value) for value in values]
+        )
+
+    def compare(self, operator: str, value: Any) -> np.ndarray:
+        if not isinstance(value, str):
+            return Column.compare(self, operator, value)
+        try:
+            timestamp = _timestamp(datetime.fromisoformat(value))
+        except ValueError:
+            raise BadRequest(detail=f"Unable to parse timestamp {value!r}.")
+        return self.known & _OPERATORS[operator](self.values, timestamp)
+
+
+class StringColumn(Column):
+    """A dictionary-encoded column of strings.
+
+    The distinct values are stored in sorted order, such that every comparison
+    is a comparison of the integer codes of the values.
+
+    Attributes:
+        categories: The sorted distinct values.
+        codes: The index of the value of each row in `categories`, or -1 if unknown.
+
+    """
+
+    def __init__(self, values: list[Any]):
+        super().__init__(np.array([value is not None for value in values], dtype=bool))
+        self.categories = sorted({value for value in values if value is not None})
+        lookup = {category: code for code, category in enumerate(self.categories)}
+        self.codes = np.array(
+            [-1 if value is None else lookup[value] for value in values],
+            dtype=np.int64,
+        )
+
+    def compare(self, operator: str, value: Any) -> np.ndarray:
+        if not isinstance(value, str):
+            return super().compare(operator, value)
+
+        left = bisect.bisect_left(self.categories, value)
+        right = bisect.bisect_right(self.categories, value)
+        if operator in ("=", "!="):
+            equal = self.codes == left if right > left else self._none()
+            return equal if operator == "=" else self.known & ~equal
+        if operator == "<":
+            return self.known & (self.codes < left)
+        if operator == "<=":
+            return self.known & (self.codes < right)
+        if operator == ">":
+            return self.codes >= right
+        return self.codes >= left
+
+    def fuzzy(self, operator: str, value: str) -> np.ndarray:
+        if operator == "CONTAINS":
+            matches = [value in category for category in self.categories]
+        elif operator == "STARTS":
+            matches = [category.startswith(value) for category in self.categories]
+        else:
+            matches = [category.endswith(value) for category in self.categories]
+        return self.select_categories(np.array(matches, dtype=bool))
+
+    def has_any(self, values: list[Any]) -> np.ndarray:
+        codes = [
+            bisect.bisect_left(self.categories, value)
+            for value in values
+            if isinstance(value, str)
+        ]
+        codes = [
+            code
+            for code, value in zip(codes, values)
+            if code < len(self.categories) and self.categories[code] == value
+        ]
+        return np.isin(self.codes, codes)
+
+    def select_categories(self, category_mask: np.ndarray) -> np.ndarray:
+        """Select the rows with a value in the categories selected by the mask."""
+        if not self.categories:
+            return self._none()
+        return self.known & category_mask[self.codes]
+
+    def sort_key(self, direction: int) -> np.ndarray:
+        return self._sort_key(self.codes.astype(np.float64), direction)
+
+
+class ListColumn(Column):
+    """A column of lists, stored as the column of all their elements, along with
+    the row of every element.
+
+    The lists of strings with few distinct values, e.g., `elements`, are also
+    stored as bitsets, to test for `HAS ALL`, `HAS ANY` and `HAS ONLY` with
+    bitwise operations.
+
+    Attributes:
+        lengths: The length of the list of each row, or 0 if unknown.
+        rows: The row of every element.
+        elements: The column of all elements.
+
+    """
+
+    bitset_max_categories = 256
+    """The maximum number of distinct strings for which bitsets are used."""
+
+    def __init__(self, values: list[Any]):
+        super().__init__(np.array([value is not None for value in values], dtype=bool))
+        self.lengths = np.array(
+            [0 if value is None else len(value) for value in values], dtype=np.int64
+        )
+        self.rows: np.ndarray = np.repeat(np.arange(len(values)), self.lengths)
+        self.elements = build_column(
+            [item for value in values if value is not None for item in value],
+            nested=True,
+        )
+        self._bitset: np.ndarray | None = None
+
+    def _any(self, element_mask: np.ndarray) -> np.ndarray:
+        """Select the rows with any element in the mask."""
+        mask = self._none()
+        mask[self.rows[element_mask]] = True
+        return mask
+
+    def _bits(self) -> np.ndarray | None:
+        """Return the bitsets of the string elements of each row, if used."""
+        if (
+            not isinstance(self.elements, StringColumn)
+            or len(self.elements.categories) > self.bitset_max_categories
+        ):
+            return None
+        if self._bitset is None:
+            codes = self.elements.codes
+            known = codes >= 0
+            bits: np.ndarray = np.zeros(
+                (len(self), max(1, -(-len(self.elements.categories) // 64))),
+                dtype=np.uint64,
+            )
+            np.bitwise_or.at(
+                bits,
+                (self.rows[known], codes[known] // 64),
+                np.left_shift(np.uint64(1), (codes[known] % 64).astype(np.uint64)),
+            )
+            self._bitset = bits
+        return self._bitset
+
+    def _mask(self, values: list[Any], bits: np.ndarray) -> tuple[np.ndarray, bool]:
+        """Return the bitset of the given values, and whether they were all found."""
+        assert isinstance(self.elements, StringColumn)
+        mask = np.zeros(bits.shape[1], dtype=np.uint64)
+        found = True
+        for value in values:
+            code = bisect.bisect_left(self.elements.categories, value)
+            if (
+                code == len(self.elements.categories)
+                or self.elements.categories[code] != value
+            ):
+                found = False
+                continue
+            mask[code // 64] |= np.uint64(1) << np.uint64(code % 64)
+        return mask, found
+
+    def has(self, operator: str, value: Any) -> np.ndarray:
+        return self._any(self.elements.compare(operator, value))
+
+    def has_all(self, values: list[Any]) -> np.ndarray:
+        bits = self._bits()
+        if bits is None or not all(isinstance(value, str) for value in values):
+            return super().has_all(values)
+        mask, found = self._mask(values, bits)
+        if not values or not found:
+            return self._none()
+        return self.known & np.all((bits & mask) == mask, axis=1)
+
+    def has_any(self, values: list[Any]) -> np.ndarray:
+        bits = self._bits()
+        if bits is None or not all(isinstance(value, str) for value in values):
+            return super().has_any(values)
+        mask, _ = self._mask(values, bits)
+        return self.known & np.any(bits & mask, axis=1)
+
+    def has_only(self, values: list[Any]) -> np.ndarray:
+        non_empty = self.known & (self.lengths > 0)
+        bits = self._bits()
+        if bits is not None and all(isinstance(value, str) for value in values):
+            mask, _ = self._mask(values, bits)
+            return non_empty & np.all((bits & ~mask) == 0, axis=1)
+
+        allowed: np.ndarray = np.zeros(len(self.elements), dtype=bool)
+        for value in values:
+            allowed |= self.elements.compare("=", value)
+        return non_empty & ~self._any(~allowed)
+
+    def length(self, operator: str, value: Any) -> np.ndarray:
+        if value_kind(value) != "number":
+            return super().length(operator, value)
+        return self.known & _OPERATORS[operator](self.lengths, value)
+
+    def sort_key(self, direction: int) -> np.ndarray:
+        # Like for MongoDB, lists are sorted by their lowest element in ascending
+        # order, and by their highest element in descending order
+        keys = np.full(len(self), np.inf)
+        np.minimum.at(keys, self.rows, self.elements.sort_key(direction))
+        return np.where(self.known & (self.lengths > 0), keys, -np.inf * direction)
+
+
+def build_column(values: list[Any], nested: bool = False) -> Column:
+    """Build the column for the given values, depending on their type.
+
+    Parameters:
+        values: The value of each row, `None` if unknown.
+        nested: Whether the values are the elements of lists, which are not
+            stored as [`ListColumn`][optimade.server.entry_collections.columnar.ListColumn]s
+            themselves.
+
+    Returns:
+        The column of the values.
+
+    """
+    kinds = {value_kind(value) for value in values} - {"null"}
+    if not kinds or kinds == {"number"}:
+        return NumberColumn(values)
+    if kinds == {"string"}:
+        return StringColumn(values)
+    if kinds == {"date"}:
+        return DateColumn(values)
+    if kinds == {"array"} and not nested:
+        return ListColumn(values)
+    return Column(np.array([value is not None for value in values], dtype=bool))
+
+
+class _ColumnTable:
+    """The columns of the first `size` documents of a collection, built on demand."""
+
+    def __init__(self, documents: list[dict[str, Any]], size: int):
+        self.documents = documents
+        self.size = size
+        self._columns: dict[str, Column] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def column(self, field: str) -> Column:
+        column = self._columns.get(field)
+        if column is None:
+            with self._lock:
+                column = self._columns.get(field)
+                if column is None:
+                    parts = field.split(".")
+                    column = build_column(
+                        [
+                            resolve_path(document, parts)
+                            for document in self.documents[: self.size]
+                        ]
+                    )
+                    self._columns[field] = column
+        return column
+
+
+class ColumnarCollection(EntryCollection):
+    """In-memory collection of [`EntryResource`][optimade.models.entries.EntryResource]s,
+    with the values of every queried field stored in NumPy column arrays.
+
+    The documents are kept as inserted. The column of a field is built from them
+    when the field is first queried or sorted by, or when an index is created for
+    it, and is built again after further insertions.
+    Only offset-based pagination is supported.
+
+    """
+
+    pagination_mechanism = PaginationMechanism("page_offset")
+    page_above_supported = False
+
+    def __init__(
+        self,
+        name: str,
+        resource_cls: type[EntryResource],
+        resource_mapper: type[BaseResourceMapper],
+    ):
+        """Initialize the ColumnarCollection for the given parameters.
+
+        Parameters:
+            name: The name of the collection.
+            resource_cls: The type of entry resource that is stored by the collection.
+            resource_mapper: A resource mapper object that handles aliases and
+                format changes between deserialization and response.
+
+        """
+        super().__init__(
+            resource_cls=resource_cls,
+            resource_mapper=resource_mapper,
+            transformer=ColumnarTransformer(mapper=resource_mapper),
+        )
+
+        self.name = name
+        self._documents: list[dict[str, Any]] = []
+        self._insert_lock = threading.Lock()
+        self._table = _ColumnTable(self._documents, 0)
+
+    def __len__(self) -> int:
+        """Returns the total number of entries in the collection."""
+        return len(self._table)
+
+    def insert(self, data: list[EntryResource | dict]) -> None:
+        """Add the given entries to the collection.
+
+        Warning:
+            No validation is performed on the incoming data, this data
+            should have been mapped to the appropriate format before
+            insertion.
+
+        Arguments:
+            data: The entries to add to the collection.
+
+        """
+        data = self._with_length_fields(data)
+        with self._insert_lock:
+            self._documents.extend(dict(document) for document in data)
+            # Queries that are already running keep using the previous columns
+            self._table = _ColumnTable(self._documents, len(self._documents))
+        self._data_available_cache.invalidate()
+
+    def count(self, **kwargs: Any) -> int | None:
+        """Returns the number of entries matching the query specified
+        by the keyword arguments.
+
+        Parameters:
+            **kwargs: Query parameters as keyword arguments. The keys
+                'filter', 'skip' and 'limit' are used as for MongoDB.
+
+        """
+        nresults = len(self._find_rows(self._table, kwargs.get("filter"), ()))
+        nresults = max(nresults - kwargs.get("skip", 0), 0)
+        if kwargs.get("limit"):
+            nresults = min(nresults, kwargs["limit"])
+        return nresults
+
+    def create_index(self, field: str, unique: bool = False) -> None:
+        """Build the column of the given field, as stored in the collection.
+
+        Arguments:
+            field: The field to index (i.e., if different from the OPTIMADE field,
+                the mapper should be used to convert between the two).
+            unique: Not used, uniqueness is not enforced.
+
+        """
+        self._table.column(field)
+
+    def create_default_index(self) -> None:
+        """Create the default index for the collection, i.e., on the `id` field."""
+        self.create_index(self.resource_mapper.get_backend_field("id"))
+
+    @staticmethod
+    def _find_rows(
+        table: _ColumnTable, filter_: Any, sort_spec: Iterable[tuple[str, int]]
+    ) -> np.ndarray:
+        """Return the rows matching the compiled filter, in the requested order."""
+        rows = np.flatnonzero(filter_(table)) if filter_ else np.arange(len(table))
+        sort_spec = list(sort_spec)
+        if sort_spec and len(rows):
+            # The last key is the primary sort key
+            keys = [
+                table.column(field).sort_key(direction)[rows]
+                for field, direction in reversed(sort_spec)
+            ]
+            rows = rows[np.lexsort(keys)]
+        return rows
+
+    @staticmethod
+    def _documents_for(
+        table: _ColumnTable, rows: Iterable[int], projection: Iterable[str] | None
+    ) -> Iterator[dict[str, Any]]:
+        """Return (shallow copies of) the documents of the given rows, with only
+        the top-level fields of the projection."""
+        top_level = (
+            None
+            if projection is None
+            else {field.split(".")[0] for field in projection}
+        )
+        for row in rows:
+            document = table.documents[row]
+            yield {
+                key: value
+                for key, value in document.items()
+                if top_level is None or key in top_level
+            }
+
+    def _page(
+        self, table: _ColumnTable, criteria: dict[str, Any]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return all matching rows and the rows of the requested page."""
+        rows = self._find_rows(table, criteria.get("filter"), criteria.get("sort", ()))
+        skip = criteria.get("skip", 0)
+        limit = criteria.get("limit", 0)
+        return rows, rows[skip : skip + limit] if limit else rows[skip:]
+
+    def _run_db_query(
+        self, criteria: dict[str, Any], single_entry: bool = False
+    ) -> tuple[list[dict[str, Any]], int | None, bool]:
+        """Run the query on the columns and collect the results.
+
+        Arguments:
+            criteria: A dictionary representation of the query parameters.
+            single_entry: Whether or not the caller is expecting a single entry response.
+
+        Returns:
+            The list of entries from the collection (without any re-mapping), the total number of
+            entries matching the query and a boolean for whether or not there is more data available.
+
+        """
+        table = self._table
+        with timed("query"):
+            rows, page = self._page(table, criteria)
+            results = list(self._documents_for(table, page, criteria.get("projection")))
+
+        if single_entry:
+            # SingleEntryQueryParams, e.g., /structures/{entry_id}
+            return results, len(results), False
+
+        more_data_available = bool(criteria.get("limit")) and criteria.get(
+            "skip", 0
+        ) + len(page) < len(rows)
+        return results, len(rows), more_data_available
+
+    def _iter_db_query(
+        self, criteria: dict[str, Any], summary: dict[str, Any]
+    ) -> Iterator[dict[str, Any]]:
+        """Run the query on the columns and iterate over the results, see
+        `EntryCollection._iter_db_query`."""
+        table = self._table
+        rows, page = self._page(table, criteria)
+        yield from self._documents_for(table, page, criteria.get("projection"))
+
+        summary["data_returned"] = len(rows)
+        summary["more_data_available"] = bool(criteria.get("limit")) and criteria.get(
+            "skip", 0
+        ) + len(page) < len(rows)
+
+    def _run_ids_query(self, ids: list[str], fields: set[str]) -> list[dict[str, Any]]:
+        """Look up the entries with the given IDs in the column of the `id` field."""
+        table = self._table
+        id_field = self.resource_mapper.get_backend_field("id")
+        with timed("query"):
+            rows = np.flatnonzero(table.column(id_field).has_any(ids))
+            return list(
+                self._documents_for(
+                    table,
+                    rows,
+                    [self.resource_mapper.get_backend_field(field) for field in fields],
+                )
+            )
@@ -1,5 +1,5 @@
 import json
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 from typing import Any, Optional
 
@@ -7,6 +7,7 @@ from optimade.filtertransformers.elasticsearch import ElasticTransformer
 from optimade.models import EntryResource
 from optimade.server.config import CONFIG
 from optimade.server.entry_collections import EntryCollection, PaginationMechanism
+from optimade.server.entry_collections.entry_collections import timed
 from optimade.server.logger import LOGGER
 from optimade.server.mappers import BaseResourceMapper
 
@@ -141,6 +142,7 @@ class ElasticCollection(EntryCollection):
             item.pop("_id", None)
             return id_
 
+        data = self._with_length_fields(data)
         bulk(
             self.client,
             (
@@ -152,6 +154,24 @@ class ElasticCollection(EntryCollection):
                 for item in data
             ),
         )
+        self._data_available_cache.invalidate()
+
+    def _run_ids_query(self, ids: list[str], fields: set[str]) -> list[dict[str, Any]]:
+        """Look up the entries with the given IDs with a single `terms` query."""
+        id_field = self.resource_mapper.get_backend_field("id")
+        search = (
+            Search(using=self.client, index=self.name)
+            .filter("terms", **{id_field: ids})
+            .source(
+                includes=[
+                    self.resource_mapper.get_backend_field(field) for field in fields
+                ]
+            )
+        )
+        search = search[0 : len(ids)]
+        with timed("query"):
+            response = search.execute()
+        return [hit.to_dict() for hit in response.hits]
 
     def _run_db_query(
         self, criteria: dict[str, Any], single_entry=False
@@ -168,32 +188,13 @@ class ElasticCollection(EntryCollection):
 
         """
 
-        search = Search(using=self.client, index=self.name)
-
-        if criteria.get("filter", False):
-            search = search.query(criteria["filter"])
+        search = self._search(criteria)
 
         page_offset = criteria.get("skip", None)
         page_above = criteria.get("page_above", None)
 
         limit = criteria.get("limit", CONFIG.page_limit)
 
-        all_aliased_fields = [
-            self.resource_mapper.get_backend_field(field) for field in self.all_fields
-        ]
-        search = search.source(includes=all_aliased_fields)
-
-        elastic_sort = [
-            {field: {"order": "desc" if sort_dir == -1 else "asc"}}
-            for field, sort_dir in criteria.get("sort", {})
-        ]
-        if not elastic_sort:
-            elastic_sort = [
-                {self.resource_mapper.get_backend_field("id"): {"order": "asc"}}
-            ]
-
-        search = search.sort(*elastic_sort)
-
         if page_offset:
             search = search[page_offset : page_offset + limit]
 
@@ -204,8 +205,11 @@ class ElasticCollection(EntryCollection):
             search = search[0:limit]
             page_offset = 0
 
+        # The total number of hits is tracked by the same search request, so
+        # there is no separate count round-trip to run concurrently here
         search = search.extra(track_total_hits=True)
-        response = search.execute()
+        with timed("query"):
+            response = search.execute()
 
         results = [hit.to_dict() for hit in response.hits]
 
@@ -221,3 +225,64 @@ class ElasticCollection(EntryCollection):
             data_returned = len(results)
 
         return results, data_returned, more_data_available
+
+    def explain(self, criteria: dict[str, Any]) -> dict[str, Any] | None:
+        """Return the profile of the search for the requested page of entries,
+        as given by the Elasticsearch profile API.
+
+        Arguments:
+            criteria: A dictionary representation of the query parameters.
+
+        Returns:
+            The `profile` of the search response.
+
+        """
+        page_offset = criteria.get("skip") or 0
+        limit = criteria.get("limit", CONFIG.page_limit)
+        search = self._search(criteria)[page_offset : page_offset + limit]
+        response = search.extra(profile=True).execute()
+        return response.to_dict().get("profile")
+
+    def _iter_db_query(
+        self, criteria: dict[str, Any], summary: dict[str, Any]
+    ) -> Iterator[dict[str, Any]]:
+        """Run the query on the backend and iterate over the results, see
+        `EntryCollection._iter_db_query`.
+
+        Queries without a page limit, e.g., for JSON Lines downloads, are scrolled
+        through with `Search.scan`, rather than fetched in a single request.
+
+        """
+        if criteria.get("limit"):
+            yield from super()._iter_db_query(criteria, summary)
+            return
+
+        search = self._search(criteria).params(preserve_order=True)
+        nresults = 0
+        for hit in search.scan():
+            nresults += 1
+            yield hit.to_dict()
+
+        summary["data_returned"] = nresults
+        summary["more_data_available"] = False
+
+    def _search(self, criteria: dict[str, Any]) -> "Search":
+        """Build the sorted search for the query criteria, returning only the
+        projected fields."""
+        search = Search(using=self.client, index=self.name)
+
+        if criteria.get("filter", False):
+            search = search.query(criteria["filter"])
+
+        search = search.source(includes=list(criteria["projection"]))
+
+        elastic_sort = [
+            {field: {"order": "desc" if sort_dir == -1 else "asc"}}
+            for field, sort_dir in criteria.get("sort", {})
+        ]
+        if not elastic_sort:
+            elastic_sort = [
+                {self.resource_mapper.get_backend_field("id"): {"order": "asc"}}
+            ]
+
+        return search.sort(*elastic_sort)
@@ -1,14 +1,23 @@
+import contextvars
+import copy
 import enum
 import re
+import threading
+import time
 import warnings
 from abc import ABC, abstractmethod
-from collections.abc import Iterable
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable, Hashable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
 from typing import Any
 
 from lark import Transformer
 
 from optimade.exceptions import BadRequest, Forbidden, NotFound
 from optimade.filterparser import LarkParser
+from optimade.filtertransformers.base_transformer import TRANSFORM_WARNINGS
 from optimade.models import Attributes, EntryResource
 from optimade.models.types import NoneType, _get_origin_type
 from optimade.server.config import CONFIG, SupportedBackend
@@ -25,9 +34,9 @@ def create_collection(
     name: str,
     resource_cls: type[EntryResource],
     resource_mapper: type[BaseResourceMapper],
-) -> "EntryCollection":
-    """Create an `EntryCollection` of the configured type, depending on the value of
-    `CONFIG.database_backend`.
+) -> "EntryCollection | AsyncEntryCollection":
+    """Create an entry collection of the configured type, depending on the value of
+    `CONFIG.database_backend` (and `CONFIG.async_database`).
 
     Arguments:
         name: The collection name.
@@ -35,14 +44,25 @@ def create_collection(
         resource_mapper: The associated resource mapper for that entry resource type.
 
     Returns:
-        The created `EntryCollection`.
+        The created `EntryCollection`, or `AsyncEntryCollection` if
+        `CONFIG.async_database` is set for the MongoDB backends.
 
     """
     if CONFIG.database_backend in (
         SupportedBackend.MONGODB,
         SupportedBackend.MONGOMOCK,
     ):
-        from optimade.server.entry_collections.mongo import MongoCollection
+        from optimade.server.entry_collections.mongo import (
+            AsyncMongoCollection,
+            MongoCollection,
+        )
+
+        if CONFIG.async_database:
+            return AsyncMongoCollection(
+                name=name,
+                resource_cls=resource_cls,
+                resource_mapper=resource_mapper,
+            )
 
         return MongoCollection(
             name=name,
@@ -59,6 +79,33 @@ def create_collection(
             resource_mapper=resource_mapper,
         )
 
+    if CONFIG.database_backend is SupportedBackend.JSONL:
+        from optimade.server.entry_collections.jsonl import JSONLCollection
+
+        return JSONLCollection(
+            name=name,
+            resource_cls=resource_cls,
+            resource_mapper=resource_mapper,
+        )
+
+    if CONFIG.database_backend is SupportedBackend.COLUMNAR:
+        from optimade.server.entry_collections.columnar import ColumnarCollection
+
+        return ColumnarCollection(
+            name=name,
+            resource_cls=resource_cls,
+            resource_mapper=resource_mapper,
+        )
+
+    if CONFIG.database_backend is SupportedBackend.SQLITE:
+        from optimade.server.entry_collections.sqlite import SQLiteCollection
+
+        return SQLiteCollection(
+            name=name,
+            resource_cls=resource_cls,
+            resource_mapper=resource_mapper,
+        )
+
     raise NotImplementedError(
         f"The database backend {CONFIG.database_backend!r} is not implemented"
     )
@@ -74,15 +121,345 @@ class PaginationMechanism(enum.Enum):
     BELOW = "page_below"
 
 
-class EntryCollection(ABC):
+class QueryCache:
+    """A bounded, thread-safe least-recently-used cache for backend queries.
+
+    Cached values are stored and returned as-is, so callers that may mutate
+    them are responsible for making a defensive copy.
+
+    Attributes:
+        maxsize: The maximum number of entries to keep; a value of 0
+            disables the cache.
+        ttl: The number of seconds after which an entry expires, or `None`
+            if entries never expire.
+        hits: The number of successful lookups.
+        misses: The number of unsuccessful lookups (including expired entries).
+
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float | None = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the value cached for `key`, marking it as most recently used,
+        or `default` if it is not present or has expired.
+
+        """
+        with self._lock:
+            try:
+                value, expires = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            if expires <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Cache `value` under `key`, evicting the least recently used
+        entries if the cache is full.
+
+        """
+        if self.maxsize <= 0:
+            return
+        expires = float("inf") if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self) -> None:
+        """Remove all entries from the cache, e.g., after the underlying data
+        has changed, keeping the counters.
+
+        """
+        with self._lock:
+            self._data.clear()
+
+    def clear(self) -> None:
+        """Remove all entries from the cache and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> dict[str, int]:
+        """Return the cache statistics, in the spirit of `functools.lru_cache`."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "maxsize": self.maxsize,
+            "currsize": len(self._data),
+        }
+
+
+QUERY_TIMINGS: contextvars.ContextVar[dict[str, float] | None] = contextvars.ContextVar(
+    "optimade_query_timings", default=None
+)
+"""Request-scoped wall-clock durations (in seconds) of the phases of handling a
+query, e.g., `query_params`, `query`, `count`, `data_available` and `results`,
+recorded by [`timed`][optimade.server.entry_collections.entry_collections.timed]."""
+
+
+@contextmanager
+def record_query_timings(
+    timings: dict[str, float] | None = None,
+) -> Iterator[dict[str, float]]:
+    """Record the durations of the query phases within the context, see
+    [`QUERY_TIMINGS`][optimade.server.entry_collections.entry_collections.QUERY_TIMINGS].
+
+    Parameters:
+        timings: The durations recorded so far for the current request, e.g.,
+            to continue recording them while a response is streamed.
+
+    Yields:
+        The dictionary the durations are recorded in.
+
+    """
+    if timings is None:
+        timings = {}
+    token = QUERY_TIMINGS.set(timings)
+    try:
+        yield timings
+    finally:
+        QUERY_TIMINGS.reset(token)
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """Add the wall-clock duration of the context to the given phase of the
+    current request, if its query timings are being recorded.
+
+    Parameters:
+        phase: The name of the query phase.
+
+    """
+    timings = QUERY_TIMINGS.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[phase] = timings.get(phase, 0.0) + time.perf_counter() - start
+
+
+_QUERY_EXECUTOR: ThreadPoolExecutor | None = None
+_QUERY_EXECUTOR_LOCK = threading.Lock()
+
+
+def submit_query(fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+    """Run a blocking backend round-trip on the thread pool shared by all
+    collections, such that it runs concurrently with the caller.
+
+    The call runs in a copy of the current context, so that warnings and query
+    timings are still attributed to the current request.
+    If `CONFIG.query_workers` is 0, the call is made immediately instead.
+
+    Parameters:
+        fn: The function to call.
+        *args: Positional arguments to pass to `fn`.
+        **kwargs: Keyword arguments to pass to `fn`.
+
+    Returns:
+        A future holding the result of the call.
+
+    """
+    global _QUERY_EXECUTOR
+
+    if CONFIG.query_workers <= 0:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+        return future
+
+    if _QUERY_EXECUTOR is None:
+        with _QUERY_EXECUTOR_LOCK:
+            if _QUERY_EXECUTOR is None:
+                _QUERY_EXECUTOR = ThreadPoolExecutor(
+                    max_workers=CONFIG.query_workers,
+                    thread_name_prefix="optimade-query",
+                )
+    return _QUERY_EXECUTOR.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+def resolve_path(value: Any, parts: list[str], missing: Any = None) -> Any:
+    """Resolve a dotted path in a document with MongoDB semantics, for the
+    in-process backends: integer parts index into lists, and other parts are looked
+    up in each element of a list, collecting all values found.
+
+    Parameters:
+        value: The document.
+        parts: The parts of the dotted path.
+        missing: The value returned for a path that is not present in the document.
+
+    Returns:
+        The value at the path, or `missing`.
+
+    """
+    for ind, part in enumerate(parts):
+        if isinstance(value, dict):
+            value = value.get(part, missing)
+            if value is missing:
+                return missing
+        elif isinstance(value, list):
+            if part.isdigit():
+                if int(part) >= len(value):
+                    return missing
+                value = value[int(part)]
+                continue
+            found: list[Any] = []
+            for item in value:
+                item_value = resolve_path(item, parts[ind:], missing)
+                if isinstance(item_value, list):
+                    found.extend(item_value)
+                elif item_value is not missing:
+                    found.append(item_value)
+            return found if found else missing
+        else:
+            return missing
+    return value
+
+
+def value_kind(value: Any, missing: Any = None) -> str:
+    """The kind of a value, values of different kinds never compare equal.
+
+    Parameters:
+        value: The value, as returned by
+            [`resolve_path`][optimade.server.entry_collections.entry_collections.resolve_path].
+        missing: The value of a path that is not present in the document,
+            which is of the same kind as `null`.
+
+    """
+    if value is None or value is missing:
+        return "null"
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int | float):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, datetime):
+        return "date"
+    if isinstance(value, list):
+        return "array"
+    return "object"
+
+
+class EntryStream:
+    """The entries matching a query, fetched lazily from the backend and mapped
+    back to OPTIMADE format in batches while being iterated over, see
+    [`EntryCollection.find_stream`][optimade.server.entry_collections.entry_collections.EntryCollection.find_stream].
+
+    Iterating over the stream yields lists of at most `batch_size` entries, with
+    `async for` for an
+    [`AsyncEntryCollection`][optimade.server.entry_collections.entry_collections.AsyncEntryCollection].
+    Only once all entries have been consumed are `data_returned` and
+    `more_data_available` known.
+
+    Attributes:
+        exclude_fields: The fields to exclude from the response, as returned by `find`.
+        include_fields: The requested fields under `attributes`, as returned by `find`.
+        nreturned: The number of entries yielded so far.
+        last: The last entry yielded so far, e.g., to build the `next` link from its
+            sort values, which must therefore not be pruned in place.
+
+    """
+
+    def __init__(
+        self,
+        raw_results: Iterator[dict[str, Any]] | AsyncIterator[dict[str, Any]],
+        summary: dict[str, Any],
+        resource_mapper: type[BaseResourceMapper],
+        exclude_fields: set[str],
+        include_fields: set[str],
+        batch_size: int = 100,
+    ):
+        self._raw_results = raw_results
+        self._summary = summary
+        self._resource_mapper = resource_mapper
+        self.exclude_fields = exclude_fields
+        self.include_fields = include_fields
+        self.batch_size = batch_size
+        self.nreturned = 0
+        self.last: dict[str, Any] | None = None
+
+    @property
+    def data_returned(self) -> int | None:
+        """The number of entries matching the query, once the stream is exhausted."""
+        return self._summary.get("data_returned")
+
+    @property
+    def more_data_available(self) -> bool:
+        """Whether there are more entries than returned, once the stream is exhausted."""
+        return self._summary.get("more_data_available", False)
+
+    def __iter__(self) -> Iterator[list[dict[str, Any]]]:
+        batch: list[dict[str, Any]] = []
+        for raw_result in self._raw_results:  # type: ignore[union-attr]
+            batch.append(raw_result)
+            if len(batch) >= self.batch_size:
+                yield self._map_back(batch)
+                batch = []
+        if batch:
+            yield self._map_back(batch)
+
+    async def __aiter__(self) -> AsyncIterator[list[dict[str, Any]]]:
+        batch: list[dict[str, Any]] = []
+        async for raw_result in self._raw_results:  # type: ignore[union-attr]
+            batch.append(raw_result)
+            if len(batch) >= self.batch_size:
+                yield self._map_back(batch)
+                batch = []
+        if batch:
+            yield self._map_back(batch)
+
+    def _map_back(self, batch: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        with timed("results"):
+            results = self._resource_mapper.map_back_many(batch)
+        self.nreturned += len(results)
+        self.last = results[-1]
+        return results
+
+
+class BaseEntryCollection(ABC):
     """Backend-agnostic base class for querying collections of
-    [`EntryResource`][optimade.models.entries.EntryResource]s."""
+    [`EntryResource`][optimade.models.entries.EntryResource]s, shared by the
+    synchronous [`EntryCollection`][optimade.server.entry_collections.entry_collections.EntryCollection]
+    and the asynchronous [`AsyncEntryCollection`][optimade.server.entry_collections.entry_collections.AsyncEntryCollection].
+
+    It handles the query parameters, filters and results independently of how the
+    backend is queried: the query path itself (`find`, `find_by_ids`, `count` and
+    `_run_db_query`) is defined by the subclasses.
+
+    """
 
     pagination_mechanism = PaginationMechanism("page_offset")
     """The default pagination mechansim to use with a given collection,
     if the user does not provide any pagination query parameters.
     """
 
+    page_above_supported = True
+    """Whether the backend supports value-based pagination with `page_above`;
+    otherwise, a requested `page_above` is ignored with a warning.
+    """
+
     def __init__(
         self,
         resource_cls: type[EntryResource],
@@ -113,10 +490,10 @@ class EntryCollection(ABC):
         ]
 
         self._all_fields: set[str] = set()
-
-    @abstractmethod
-    def __len__(self) -> int:
-        """Returns the total number of entries in the collection."""
+        self._filter_cache = QueryCache(maxsize=CONFIG.filter_cache_size)
+        self._data_available_cache = QueryCache(
+            maxsize=1, ttl=CONFIG.data_available_ttl
+        )
 
     @abstractmethod
     def insert(self, data: list[EntryResource | dict]) -> None:
@@ -132,18 +509,98 @@ class EntryCollection(ABC):
 
         """
 
-    @abstractmethod
-    def count(self, **kwargs: Any) -> int | None:
-        """Returns the number of entries matching the query specified
-        by the keyword arguments.
+    def _with_length_fields(
+        self, data: list[EntryResource | dict]
+    ) -> list[EntryResource | dict]:
+        """Add the length fields materialized at ingest (see
+        [`length_fields()`][optimade.server.mappers.entries.BaseResourceMapper.length_fields])
+        to copies of the given entries, to be called by `insert`.
+
+        Arguments:
+            data: The entries to add to the database.
+
+        Returns:
+            The entries with their length fields, or the given entries if no length
+            fields are materialized.
+
+        """
+        if not self.resource_mapper.length_fields():
+            return data
+        return [self.resource_mapper.add_length_fields(dict(entry)) for entry in data]
+
+    def find_stream(
+        self, params: EntryListingQueryParams, batch_size: int = 100
+    ) -> EntryStream:
+        """Fetches the results of an entry listing lazily, such that they can be
+        streamed into the response one batch at a time.
+
+        Unlike [`find`][optimade.server.entry_collections.entry_collections.EntryCollection.find],
+        the page of results is never held in memory as a whole, regardless of the
+        page limit. The query parameters are checked immediately, but the backend
+        is only queried once the stream is iterated over.
 
         Parameters:
-            **kwargs: Query parameters as keyword arguments.
+            params: Entry listing URL query params.
+            batch_size: The number of entries mapped back to OPTIMADE format at once.
+
+        Returns:
+            The stream of results.
 
         """
+        with timed("query_params"):
+            criteria = self.handle_query_params(params)
+        exclude_fields, include_fields = self._check_response_fields(
+            criteria.pop("fields")
+        )
+        summary: dict[str, Any] = {}
+        return EntryStream(
+            self._iter_db_query(criteria, summary),
+            summary,
+            self.resource_mapper,
+            exclude_fields,
+            include_fields,
+            batch_size=batch_size,
+        )
 
-    def find(
-        self, params: EntryListingQueryParams | SingleEntryQueryParams
+    def _ids_query_fields(self, fields: set[str] | None) -> set[str]:
+        if fields is None:
+            return self.all_fields
+        return fields | self.resource_mapper.get_required_fields()
+
+    @staticmethod
+    def _id_batches(ids: list[str], batch_size: int | None) -> Iterator[list[str]]:
+        batch_size = batch_size or CONFIG.page_limit_max
+        for start in range(0, len(ids), batch_size):
+            yield ids[start : start + batch_size]
+
+    @staticmethod
+    def _ids_query_params(ids: list[str]) -> EntryListingQueryParams:
+        return EntryListingQueryParams(
+            filter=" OR ".join(f'id="{id_}"' for id_ in ids),
+            response_format="json",
+            response_fields="",
+            sort="",
+            page_limit=0,
+            page_offset=0,
+        )
+
+    def _order_by_ids(
+        self, raw_results: list[dict[str, Any]], ids: list[str]
+    ) -> list[dict[str, Any]]:
+        """Map the raw results of an ID lookup back to OPTIMADE format and
+        sort them in the order of the requested IDs."""
+        order = {id_: index for index, id_ in enumerate(ids)}
+        results = self.resource_mapper.map_back_many(raw_results)
+        results.sort(key=lambda entry: order.get(entry["id"], len(order)))
+        return results
+
+    def _process_results(
+        self,
+        raw_results: list[dict[str, Any]],
+        data_returned: int | None,
+        more_data_available: bool,
+        response_fields: set[str],
+        single_entry: bool,
     ) -> tuple[
         dict[str, Any] | list[dict[str, Any]] | None,
         int | None,
@@ -151,33 +608,50 @@ class EntryCollection(ABC):
         set[str],
         set[str],
     ]:
+        """Check the requested response fields and map the raw database results
+        back to OPTIMADE entries, see
+        [`find`][optimade.server.entry_collections.entry_collections.EntryCollection.find].
+
         """
-        Fetches results and indicates if more data is available.
+        exclude_fields, include_fields = self._check_response_fields(response_fields)
 
-        Also gives the total number of data available in the absence of `page_limit`.
-        See [`EntryListingQueryParams`][optimade.server.query_params.EntryListingQueryParams]
-        for more information.
+        results: list[dict[str, Any]] | dict[str, Any] | None = None
 
-        Returns a list of the mapped database reponse.
+        if raw_results:
+            results = self.resource_mapper.map_back_many(raw_results)
 
-        If no results match the query, then `results` is set to `None`.
+            if single_entry:
+                results = results[0]
 
-        Parameters:
-            params: Entry listing URL query params.
+                if (
+                    CONFIG.validate_api_response
+                    and data_returned is not None
+                    and data_returned > 1
+                ):
+                    raise NotFound(
+                        detail=f"Instead of a single entry, {data_returned} entries were found",
+                    )
+                else:
+                    data_returned = 1
 
-        Returns:
-            A tuple of various relevant values:
-            (`results`, `data_returned`, `more_data_available`, `exclude_fields`, `include_fields`).
+        return (
+            results,
+            data_returned,
+            more_data_available,
+            exclude_fields,
+            include_fields,
+        )
 
-        """
-        criteria = self.handle_query_params(params)
-        single_entry = isinstance(params, SingleEntryQueryParams)
-        response_fields: set[str] = criteria.pop("fields")
+    def _check_response_fields(
+        self, response_fields: set[str]
+    ) -> tuple[set[str], set[str]]:
+        """Check the requested response fields and split them into the fields to
+        exclude from the response and the requested fields under `attributes`.
 
-        raw_results, data_returned, more_data_available = self._run_db_query(
-            criteria, single_entry
-        )
+        Raises:
+            BadRequest: If unknown OPTIMADE fields are requested.
 
+        """
         exclude_fields = self.all_fields - response_fields
         include_fields = (
             response_fields - self.resource_mapper.TOP_LEVEL_NON_ATTRIBUTES_FIELDS
@@ -208,48 +682,33 @@ class EntryCollection(ABC):
                 detail=f"Unrecognised OPTIMADE field(s) in requested `response_fields`: {bad_optimade_fields}."
             )
 
-        results: list[dict[str, Any]] | dict[str, Any] | None = None
-
-        if raw_results:
-            results = [self.resource_mapper.map_back(doc) for doc in raw_results]
+        return exclude_fields, include_fields
 
-            if single_entry:
-                results = results[0]
+    @abstractmethod
+    def _iter_db_query(
+        self, criteria: dict[str, Any], summary: dict[str, Any]
+    ) -> Iterator[dict[str, Any]] | AsyncIterator[dict[str, Any]]:
+        """Run the query on the backend and iterate over the results, synchronously
+        or asynchronously, see `EntryCollection._iter_db_query`.
 
-                if (
-                    CONFIG.validate_api_response
-                    and data_returned is not None
-                    and data_returned > 1
-                ):
-                    raise NotFound(
-                        detail=f"Instead of a single entry, {data_returned} entries were found",
-                    )
-                else:
-                    data_returned = 1
+        """
 
-        return (
-            results,
-            data_returned,
-            more_data_available,
-            exclude_fields,
-            include_fields,
-        )
+    def explain(self, criteria: dict[str, Any]) -> Any:
+        """Return the plan of the backend for running the query, e.g., to be
+        served by the `/extensions/explain` endpoint.
 
-    @abstractmethod
-    def _run_db_query(
-        self, criteria: dict[str, Any], single_entry: bool = False
-    ) -> tuple[list[dict[str, Any]], int | None, bool]:
-        """Run the query on the backend and collect the results.
+        This generic implementation returns `None`, for backends that cannot
+        explain their queries.
 
         Arguments:
-            criteria: A dictionary representation of the query parameters.
-            single_entry: Whether or not the caller is expecting a single entry response.
+            criteria: A dictionary representation of the query parameters, as
+                returned by `handle_query_params`.
 
         Returns:
-            The list of entries from the database (without any re-mapping), the total number of
-            entries matching the query and a boolean for whether or not there is more data available.
+            The query plan, in the format of the backend.
 
         """
+        return None
 
     @property
     def all_fields(self) -> set[str]:
@@ -339,6 +798,9 @@ class EntryCollection(ABC):
             Currently this method returns the pymongo interpretation of the parameters,
             which will need modification for modified for other backends.
 
+        For `response_format=jsonl`, which is only supported for entry listings,
+        neither a page limit nor the pagination parameters are applied.
+
         Parameters:
             params: The initialized query parameter model from the server.
 
@@ -355,23 +817,30 @@ class EntryCollection(ABC):
 
         # filter
         if getattr(params, "filter", False):
-            cursor_kwargs["filter"] = self.transformer.transform(
-                self.parser.parse(params.filter)  # type: ignore[union-attr]
-            )
+            cursor_kwargs["filter"] = self.transform_filter(params.filter)  # type: ignore[union-attr]
         else:
             cursor_kwargs["filter"] = {}
 
         # response_format
+        bulk_download = False
         if (
             getattr(params, "response_format", False)
             and params.response_format != "json"
         ):
-            raise BadRequest(
-                detail=f"Response format {params.response_format} is not supported, please use response_format='json'"
-            )
+            if params.response_format == "jsonl" and isinstance(
+                params, EntryListingQueryParams
+            ):
+                bulk_download = True
+            else:
+                raise BadRequest(
+                    detail=f"Response format {params.response_format} is not supported, please use response_format='json' (or 'jsonl' for entry listings)"
+                )
 
         # page_limit
-        if getattr(params, "page_limit", False):
+        if bulk_download:
+            # JSON Lines responses contain all matching entries
+            cursor_kwargs["limit"] = 0
+        elif getattr(params, "page_limit", False):
             limit = params.page_limit  # type: ignore[union-attr]
             if limit > CONFIG.page_limit_max:
                 raise Forbidden(
@@ -382,11 +851,6 @@ class EntryCollection(ABC):
             cursor_kwargs["limit"] = CONFIG.page_limit
 
         # response_fields
-        cursor_kwargs["projection"] = {
-            f"{self.resource_mapper.get_backend_field(f)}": True
-            for f in self.all_fields
-        }
-
         if getattr(params, "response_fields", False):
             response_fields = set(params.response_fields.split(","))
             response_fields |= self.resource_mapper.get_required_fields()
@@ -399,6 +863,12 @@ class EntryCollection(ABC):
         if getattr(params, "sort", False):
             cursor_kwargs["sort"] = self.parse_sort_params(params.sort)  # type: ignore[union-attr]
 
+        # Only fetch the requested fields from the backend, and those that are
+        # needed to paginate through the sorted results
+        cursor_kwargs["projection"] = self._projection(
+            response_fields, cursor_kwargs.get("sort", [])
+        )
+
         # warn if multiple pagination keys are present, and only use the first from this list
         received_pagination_option = False
         warn_multiple_keys = False
@@ -425,6 +895,11 @@ class EntryCollection(ABC):
         if isinstance(getattr(params, "page_above", None), str):
             if received_pagination_option:
                 warn_multiple_keys = True
+            elif not self.page_above_supported:
+                warnings.warn(
+                    message="'page_above' is not supported by this implementation, please use 'page_offset'",
+                    category=QueryParamNotUsed,
+                )
             else:
                 received_pagination_option = True
                 cursor_kwargs["page_above"] = params.page_above  # type: ignore[union-attr]
@@ -435,8 +910,72 @@ class EntryCollection(ABC):
                 category=QueryParamNotUsed,
             )
 
+        if bulk_download:
+            for pagination_key in ("skip", "page_above"):
+                cursor_kwargs.pop(pagination_key, None)
+
         return cursor_kwargs
 
+    def _projection(
+        self, response_fields: set[str], sort_spec: Iterable[tuple[str, int]]
+    ) -> dict[str, bool]:
+        """Return the backend fields to fetch for the given response fields and
+        sort spec, leaving out those already covered by a parent field."""
+        projection = {
+            self.resource_mapper.get_backend_field(field): True
+            for field in response_fields
+        }
+        for field, _ in sort_spec:
+            parts = field.split(".")
+            if not any(
+                ".".join(parts[:ind]) in projection for ind in range(1, len(parts) + 1)
+            ):
+                projection[field] = True
+        return projection
+
+    def transform_filter(self, filter_: str) -> Any:
+        """Parse and transform a filter string into the backend query,
+        using the compiled filter cache of the collection where possible.
+
+        The cache is keyed on the grammar version and variant, the filter string
+        and the resource mapper.
+        Any warnings emitted by the transformer while compiling the filter (see
+        [`TRANSFORM_WARNINGS`][optimade.filtertransformers.base_transformer.TRANSFORM_WARNINGS])
+        are stored alongside the query and re-emitted on every cache hit, so that
+        responses are identical whether or not the filter was already cached.
+        A deep copy of the cached query is returned, such that later mutation by
+        the caller cannot poison the cache.
+
+        Parameters:
+            filter_: The OPTIMADE filter string.
+
+        Raises:
+            BadRequest: If the filter cannot be parsed.
+
+        Returns:
+            The backend-specific query.
+
+        """
+        key = (self.parser.version, self.parser.variant, filter_, self.resource_mapper)
+        cached = self._filter_cache.get(key)
+        if cached is None:
+            # The warnings are recorded for the current context only, as the
+            # process-wide warnings state is shared between concurrent requests
+            emitted: list[tuple[Warning | str, type[Warning], str, int]] = []
+            token = TRANSFORM_WARNINGS.set(emitted)
+            try:
+                query = self.transformer.transform(self.parser.parse(filter_))
+            finally:
+                TRANSFORM_WARNINGS.reset(token)
+            self._filter_cache.put(key, (copy.deepcopy(query), emitted))
+            return query
+
+        query, emitted = cached
+        for message, category, filename, lineno in emitted:
+            warnings.warn_explicit(message, category, filename, lineno)
+
+        return copy.deepcopy(query)
+
     def parse_sort_params(self, sort_params: str) -> Iterable[tuple[str, int]]:
         """Handles any sort parameters passed to the collection,
         resolving aliases and dealing with any invalid fields.
@@ -510,23 +1049,333 @@ class EntryCollection(ABC):
             A dictionary with the necessary query parameters.
 
         """
-        query: dict[str, list[str]] = dict()
         if isinstance(results, list) and results:
-            # If a user passed a particular pagination mechanism, keep using it
-            # Otherwise, use the default pagination mechanism of the collection
-            pagination_mechanism = PaginationMechanism.OFFSET
-            for pagination_key in (
-                "page_offset",
-                "page_number",
-                "page_above",
-            ):
-                if getattr(params, pagination_key, None) is not None:
-                    pagination_mechanism = PaginationMechanism(pagination_key)
-                    break
+            return self._next_query_params(params, len(results), results[-1])
+        return {}
 
-            if pagination_mechanism == PaginationMechanism.OFFSET:
-                query["page_offset"] = [
-                    str(params.page_offset + len(results))  # type: ignore[list-item]
-                ]
+    def _next_query_params(
+        self, params: EntryListingQueryParams, nresults: int, last: dict[str, Any]
+    ) -> dict[str, list[str]]:
+        """Provides the url query pagination parameters of the next link from the
+        number of results of the current page and its last result, see
+        [`get_next_query_params`][optimade.server.entry_collections.entry_collections.EntryCollection.get_next_query_params].
+
+        """
+        query: dict[str, list[str]] = dict()
+        # If a user passed a particular pagination mechanism, keep using it
+        # Otherwise, use the default pagination mechanism of the collection
+        pagination_mechanism = PaginationMechanism.OFFSET
+        for pagination_key in (
+            "page_offset",
+            "page_number",
+            "page_above",
+        ):
+            if getattr(params, pagination_key, None) is not None:
+                pagination_mechanism = PaginationMechanism(pagination_key)
+                break
+
+        if pagination_mechanism == PaginationMechanism.OFFSET:
+            query["page_offset"] = [
+                str(params.page_offset + nresults)  # type: ignore[list-item]
+            ]
 
         return query
+
+
+class EntryCollection(BaseEntryCollection):
+    """Backend-agnostic base class for querying collections of
+    [`EntryResource`][optimade.models.entries.EntryResource]s through a
+    synchronous client."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Returns the total number of entries in the collection."""
+
+    @property
+    def data_available(self) -> int:
+        """The total number of entries in the collection, as reported in
+        `meta.data_available`.
+
+        The value of `len(collection)` is reused for `CONFIG.data_available_ttl`
+        seconds, or until data is inserted into the collection.
+
+        """
+        data_available = self._data_available_cache.get("data_available")
+        if data_available is None:
+            data_available = len(self)
+            self._data_available_cache.put("data_available", data_available)
+        return data_available
+
+    @abstractmethod
+    def count(self, **kwargs: Any) -> int | None:
+        """Returns the number of entries matching the query specified
+        by the keyword arguments.
+
+        Parameters:
+            **kwargs: Query parameters as keyword arguments.
+
+        """
+
+    def find(
+        self, params: EntryListingQueryParams | SingleEntryQueryParams
+    ) -> tuple[
+        dict[str, Any] | list[dict[str, Any]] | None,
+        int | None,
+        bool,
+        set[str],
+        set[str],
+    ]:
+        """
+        Fetches results and indicates if more data is available.
+
+        Also gives the total number of data available in the absence of `page_limit`.
+        See [`EntryListingQueryParams`][optimade.server.query_params.EntryListingQueryParams]
+        for more information.
+
+        Returns a list of the mapped database reponse.
+
+        If no results match the query, then `results` is set to `None`.
+
+        Parameters:
+            params: Entry listing URL query params.
+
+        Returns:
+            A tuple of various relevant values:
+            (`results`, `data_returned`, `more_data_available`, `exclude_fields`, `include_fields`).
+
+        """
+        with timed("query_params"):
+            criteria = self.handle_query_params(params)
+        single_entry = isinstance(params, SingleEntryQueryParams)
+        response_fields: set[str] = criteria.pop("fields")
+
+        raw_results, data_returned, more_data_available = self._run_db_query(
+            criteria, single_entry
+        )
+
+        with timed("results"):
+            return self._process_results(
+                raw_results,
+                data_returned,
+                more_data_available,
+                response_fields,
+                single_entry,
+            )
+
+    def find_by_ids(
+        self,
+        ids: Iterable[str],
+        fields: set[str] | None = None,
+        batch_size: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Fetches the entries with the given IDs, e.g., the related resources to
+        include in a response.
+
+        Unlike [`find`][optimade.server.entry_collections.entry_collections.EntryCollection.find],
+        the IDs are looked up directly rather than through a filter, in pages of at
+        most `batch_size` IDs per backend query.
+
+        Parameters:
+            ids: The IDs of the entries to fetch; duplicates are ignored.
+            fields: The OPTIMADE fields to return, by default all fields.
+            batch_size: The maximum number of IDs to look up per backend query,
+                by default `CONFIG.page_limit_max`.
+
+        Returns:
+            The entries found, mapped back to OPTIMADE format and in the order
+            of `ids`. Unknown IDs are skipped.
+
+        """
+        unique_ids = list(dict.fromkeys(ids))
+        raw_results: list[dict[str, Any]] = []
+        with timed("included"):
+            for batch in self._id_batches(unique_ids, batch_size):
+                raw_results.extend(
+                    self._run_ids_query(batch, self._ids_query_fields(fields))
+                )
+            return self._order_by_ids(raw_results, unique_ids)
+
+    def _run_ids_query(self, ids: list[str], fields: set[str]) -> list[dict[str, Any]]:
+        """Run the query for the entries with the given IDs on the backend.
+
+        This generic implementation goes through the filter grammar by combining
+        the IDs with `OR`; backends should override it with a direct lookup.
+
+        Arguments:
+            ids: The IDs of the entries to fetch.
+            fields: The OPTIMADE fields to return.
+
+        Returns:
+            The list of entries from the database, without any re-mapping.
+
+        """
+        criteria = self.handle_query_params(self._ids_query_params(ids))
+        criteria.pop("fields")
+        return self._run_db_query(criteria)[0]
+
+    @abstractmethod
+    def _run_db_query(
+        self, criteria: dict[str, Any], single_entry: bool = False
+    ) -> tuple[list[dict[str, Any]], int | None, bool]:
+        """Run the query on the backend and collect the results.
+
+        Arguments:
+            criteria: A dictionary representation of the query parameters.
+            single_entry: Whether or not the caller is expecting a single entry response.
+
+        Returns:
+            The list of entries from the database (without any re-mapping), the total number of
+            entries matching the query and a boolean for whether or not there is more data available.
+
+        """
+
+    def _iter_db_query(
+        self, criteria: dict[str, Any], summary: dict[str, Any]
+    ) -> Iterator[dict[str, Any]]:
+        """Run the query on the backend and iterate over the results.
+
+        Once the results are exhausted, the total number of entries matching the query
+        and whether or not there is more data available are stored under the
+        `"data_returned"` and `"more_data_available"` keys of `summary`.
+
+        This generic implementation fetches the whole page of results with `_run_db_query`;
+        backends should override it to fetch the results lazily from a cursor.
+
+        Arguments:
+            criteria: A dictionary representation of the query parameters.
+            summary: The dictionary to store the totals of the query in.
+
+        Yields:
+            The entries from the database, without any re-mapping.
+
+        """
+        results, data_returned, more_data_available = self._run_db_query(criteria)
+        summary["data_returned"] = data_returned
+        summary["more_data_available"] = more_data_available
+        yield from results
+
+
+class AsyncEntryCollection(BaseEntryCollection):
+    """Backend-agnostic base class for collections that query their backend
+    through an asynchronous client.
+
+    The query path ([`find`][optimade.server.entry_collections.entry_collections.AsyncEntryCollection.find],
+    `find_by_ids`, `count`, `_run_db_query` and
+    [`length`][optimade.server.entry_collections.entry_collections.AsyncEntryCollection.length])
+    consists of coroutines that are awaited by the `async` routes, such that
+    requests waiting on the database do not occupy a thread.
+    Administrative methods, such as `insert` and `create_index`, remain synchronous.
+
+    """
+
+    async def find(
+        self, params: EntryListingQueryParams | SingleEntryQueryParams
+    ) -> tuple[
+        dict[str, Any] | list[dict[str, Any]] | None,
+        int | None,
+        bool,
+        set[str],
+        set[str],
+    ]:
+        """Asynchronous version of
+        [`EntryCollection.find`][optimade.server.entry_collections.entry_collections.EntryCollection.find].
+
+        Parameters:
+            params: Entry listing URL query params.
+
+        Returns:
+            A tuple of various relevant values:
+            (`results`, `data_returned`, `more_data_available`, `exclude_fields`, `include_fields`).
+
+        """
+        with timed("query_params"):
+            criteria = self.handle_query_params(params)
+        single_entry = isinstance(params, SingleEntryQueryParams)
+        response_fields: set[str] = criteria.pop("fields")
+
+        raw_results, data_returned, more_data_available = await self._run_db_query(
+            criteria, single_entry
+        )
+
+        with timed("results"):
+            return self._process_results(
+                raw_results,
+                data_returned,
+                more_data_available,
+                response_fields,
+                single_entry,
+            )
+
+    async def find_by_ids(
+        self,
+        ids: Iterable[str],
+        fields: set[str] | None = None,
+        batch_size: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Asynchronous version of
+        [`EntryCollection.find_by_ids`][optimade.server.entry_collections.entry_collections.EntryCollection.find_by_ids]."""
+        unique_ids = list(dict.fromkeys(ids))
+        raw_results: list[dict[str, Any]] = []
+        with timed("included"):
+            for batch in self._id_batches(unique_ids, batch_size):
+                raw_results.extend(
+                    await self._run_ids_query(batch, self._ids_query_fields(fields))
+                )
+            return self._order_by_ids(raw_results, unique_ids)
+
+    async def _run_ids_query(
+        self, ids: list[str], fields: set[str]
+    ) -> list[dict[str, Any]]:
+        """Asynchronous version of `EntryCollection._run_ids_query`."""
+        criteria = self.handle_query_params(self._ids_query_params(ids))
+        criteria.pop("fields")
+        return (await self._run_db_query(criteria))[0]
+
+    @abstractmethod
+    async def length(self) -> int:
+        """Returns the total number of entries in the collection."""
+
+    async def data_available_async(self) -> int:
+        """Asynchronous version of
+        [`EntryCollection.data_available`][optimade.server.entry_collections.entry_collections.EntryCollection.data_available]."""
+        data_available = self._data_available_cache.get("data_available")
+        if data_available is None:
+            data_available = await self.length()
+            self._data_available_cache.put("data_available", data_available)
+        return data_available
+
+    @abstractmethod
+    async def count(self, **kwargs: Any) -> int | None:
+        """Returns the number of entries matching the query specified
+        by the keyword arguments.
+
+        Parameters:
+            **kwargs: Query parameters as keyword arguments.
+
+        """
+
+    @abstractmethod
+    async def _run_db_query(
+        self, criteria: dict[str, Any], single_entry: bool = False
+    ) -> tuple[list[dict[str, Any]], int | None, bool]:
+        """Run the query on the backend and collect the results.
+
+        Arguments:
+            criteria: A dictionary representation of the query parameters.
+            single_entry: Whether or not the caller is expecting a single entry response.
+
+        Returns:
+            The list of entries from the database (without any re-mapping), the total number of
+            entries matching the query and a boolean for whether or not there is more data available.
+
+        """
+
+    async def _iter_db_query(
+        self, criteria: dict[str, Any], summary: dict[str, Any]
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Asynchronous version of `EntryCollection._iter_db_query`."""
+        results, data_returned, more_data_available = await self._run_db_query(criteria)
+        summary["data_returned"] = data_returned
+        summary["more_data_available"] = more_data_available
+        for result in results:
+            yield result
@@ -0,0 +1,870 @@
+"""A read-only database backend that serves the entries of an OPTIMADE JSONL file,
+i.e., a file in the format read by [`insert_from_jsonl`][optimade.utils.insert_from_jsonl],
+directly from disk, without any database server.
+
+The file is memory-mapped and indexed by a
+[`JSONLIndex`][optimade.server.entry_collections.jsonl.JSONLIndex], which records
+the byte offsets of the entries of each type and builds a column with the values
+of every queried field across the entries on demand.
+Filters are evaluated against these columns, such that only the entries on the
+requested page have to be read and decoded.
+
+The offsets and columns are stored in a sidecar file next to the JSONL file
+(`<file>.index`) and reused on the next start, as long as the JSONL file is unchanged.
+
+"""
+
+import bisect
+import json
+import mmap
+import os
+import re
+import sys
+import threading
+from array import array
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from optimade.filtertransformers.jsonl import JSONLTransformer
+from optimade.models import EntryResource
+from optimade.server.config import CONFIG
+from optimade.server.entry_collections import EntryCollection, PaginationMechanism
+from optimade.server.entry_collections.entry_collections import (
+    QueryCache,
+    resolve_path,
+    timed,
+    value_kind,
+)
+from optimade.server.logger import LOGGER
+from optimade.server.mappers import BaseResourceMapper
+from optimade.utils import jsonl_entry_document
+
+__all__ = ("JSONLCollection", "JSONLIndex", "jsonl_index")
+
+
+class _Missing:
+    """The type of the value of a field that is not present in an entry."""
+
+    def __repr__(self) -> str:
+        return "MISSING"
+
+    def __reduce__(self) -> str:
+        # Unpickle as the module-level singleton
+        return "MISSING"
+
+
+MISSING = _Missing()
+"""The value of a field that is not present in an entry."""
+
+
+def _object_hook(obj: dict[str, Any]) -> Any:
+    """Decode the MongoDB extended JSON values used in OPTIMADE JSONL files,
+    i.e., `{"$date": ...}` and `{"$oid": ...}`."""
+    if len(obj) == 1:
+        if "$date" in obj:
+            value = obj["$date"]
+            if isinstance(value, dict) and "$numberLong" in value:
+                value = int(value["$numberLong"])
+            if isinstance(value, int | float):
+                return datetime.fromtimestamp(value / 1000, tz=timezone.utc)
+            timestamp = datetime.fromisoformat(value)
+            if timestamp.tzinfo is None:
+                timestamp = timestamp.replace(tzinfo=timezone.utc)
+            return timestamp
+        if "$oid" in obj:
+            return obj["$oid"]
+    return obj
+
+
+def _json_default(value: Any) -> Any:
+    """Encode dates in MongoDB extended JSON, as read by `_object_hook`."""
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _loads(line: bytes) -> Any:
+    # Only lines with MongoDB extended JSON need the (slower) object hook
+    if b'"$' in line:
+        return json.loads(line, object_hook=_object_hook)
+    return json.loads(line)
+
+
+def _resolve(value: Any, parts: list[str]) -> Any:
+    return resolve_path(value, parts, MISSING)
+
+
+def _kind(value: Any) -> str:
+    return value_kind(value, MISSING)
+
+
+_SORTABLE_KINDS = ("bool", "number", "string", "date")
+
+# The MongoDB sort order of the kinds of values
+_SORT_RANKS = {
+    "null": 0,
+    "number": 1,
+    "string": 2,
+    "object": 3,
+    "array": 4,
+    "bool": 5,
+    "date": 6,
+}
+
+
+def _equals(value: Any, operand: Any) -> bool:
+    if value is MISSING:
+        return operand is None
+    if _kind(value) == _kind(operand) and value == operand:
+        return True
+    if isinstance(value, list):
+        return any(_kind(item) == _kind(operand) and item == operand for item in value)
+    return False
+
+
+def _compare(value: Any, operand: Any, operator: str) -> bool:
+    if value is MISSING:
+        return False
+    if operand is None:
+        # Only `null` is both greater and lower than or equal to `null`
+        return operator in ("$gte", "$lte") and _equals(value, None)
+    kind = _kind(operand)
+    for item in value if isinstance(value, list) else (value,):
+        if _kind(item) != kind or kind not in _SORTABLE_KINDS:
+            continue
+        if (
+            (operator == "$gt" and item > operand)
+            or (operator == "$gte" and item >= operand)
+            or (operator == "$lt" and item < operand)
+            or (operator == "$lte" and item <= operand)
+        ):
+            return True
+    return False
+
+
+def _regex(value: Any, pattern: Any) -> bool:
+    if isinstance(pattern, str):
+        pattern = re.compile(pattern)
+    return any(
+        isinstance(item, str) and pattern.search(item) is not None
+        for item in (value if isinstance(value, list) else (value,))
+    )
+
+
+def _is_operator_expr(expr: Any) -> bool:
+    return (
+        isinstance(expr, dict)
+        and bool(expr)
+        and all(key.startswith("$") for key in expr)
+    )
+
+
+def _match_value(value: Any, ops: dict[str, Any]) -> bool:
+    """Whether the value of a field matches all the operators of a query
+    expression, following the MongoDB semantics for missing values and arrays."""
+    for operator, operand in ops.items():
+        if operator == "$eq":
+            matches = _equals(value, operand)
+        elif operator == "$ne":
+            matches = not _equals(value, operand)
+        elif operator in ("$gt", "$gte", "$lt", "$lte"):
+            matches = _compare(value, operand, operator)
+        elif operator == "$in":
+            matches = any(_equals(value, item) for item in operand)
+        elif operator == "$nin":
+            matches = not any(_equals(value, item) for item in operand)
+        elif operator == "$all":
+            matches = (
+                isinstance(value, list)
+                and bool(operand)
+                and all(_equals(value, item) for item in operand)
+            )
+        elif operator == "$size":
+            matches = isinstance(value, list) and len(value) == operand
+        elif operator == "$exists":
+            matches = (value is not MISSING) == bool(operand)
+        elif operator == "$regex":
+            matches = _regex(value, operand)
+        elif operator == "$not":
+            matches = not _match_value(value, operand)
+        elif operator == "$elemMatch":
+            matches = isinstance(value, list) and any(
+                _match_value(item, operand)
+                if _is_operator_expr(operand)
+                else _match_document(item, operand)
+                for item in value
+            )
+        else:
+            raise NotImplementedError(
+                f"Operator {operator!r} is not supported by the JSONL backend."
+            )
+        if not matches:
+            return False
+    return True
+
+
+def _match_document(document: Any, query: dict[str, Any]) -> bool:
+    """Whether a single (sub-)document matches a query."""
+    if not isinstance(document, dict):
+        return False
+    for key, expr in query.items():
+        if key == "$and":
+            matches = all(_match_document(document, sub) for sub in expr)
+        elif key == "$or":
+            matches = any(_match_document(document, sub) for sub in expr)
+        elif key == "$nor":
+            matches = not any(_match_document(document, sub) for sub in expr)
+        else:
+            value = _resolve(document, key.split("."))
+            matches = _match_value(
+                value, expr if _is_operator_expr(expr) else {"$eq": expr}
+            )
+        if not matches:
+            return False
+    return True
+
+
+def _query_fields(query: dict[str, Any]) -> set[str]:
+    """Return the fields queried at the top level of a query."""
+    fields = set()
+    for key, expr in query.items():
+        if key in ("$and", "$or", "$nor"):
+            for sub in expr:
+                fields |= _query_fields(sub)
+        else:
+            fields.add(key)
+    return fields
+
+
+def _sort_key(value: Any, direction: int) -> tuple[int, Any]:
+    """The key to sort a value by, in the MongoDB sort order; lists are sorted by
+    their lowest value in ascending order and by their highest in descending order."""
+    if isinstance(value, list):
+        if not value:
+            return (0, 0)
+        keys = [_sort_key(item, direction) for item in value]
+        return min(keys) if direction == 1 else max(keys)
+    kind = _kind(value)
+    return (_SORT_RANKS[kind], value if kind in _SORTABLE_KINDS else 0)
+
+
+class _SortedColumn:
+    """The scalar values of a column (including the elements of any list values)
+    sorted by kind, to select the rows matching a comparison by bisection."""
+
+    def __init__(self, values: list[Any]):
+        pairs: dict[str, list[tuple[Any, int]]] = defaultdict(list)
+        for row, value in enumerate(values):
+            for item in value if isinstance(value, list) else (value,):
+                kind = _kind(item)
+                if kind in _SORTABLE_KINDS:
+                    pairs[kind].append((item, row))
+
+        self.keys: dict[str, list[Any]] = {}
+        self.rows: dict[str, list[int]] = {}
+        for kind, kind_pairs in pairs.items():
+            kind_pairs.sort(key=lambda pair: pair[0])
+            self.keys[kind] = [key for key, _ in kind_pairs]
+            self.rows[kind] = [row for _, row in kind_pairs]
+
+    def select(self, operator: str, operand: Any) -> set[int]:
+        """Return the rows with a value matching `{"$operator": operand}`."""
+        if operator == "$in":
+            return set().union(*(self.select("$eq", item) for item in operand))
+
+        kind = _kind(operand)
+        keys = self.keys.get(kind, [])
+        start, stop = 0, len(keys)
+        if operator in ("$eq", "$gte"):
+            start = bisect.bisect_left(keys, operand)
+        elif operator == "$gt":
+            start = bisect.bisect_right(keys, operand)
+        if operator in ("$eq", "$lte"):
+            stop = bisect.bisect_right(keys, operand)
+        elif operator == "$lt":
+            stop = bisect.bisect_left(keys, operand)
+        return set(self.rows.get(kind, [])[start:stop])
+
+    @staticmethod
+    def supports(operator: str, operand: Any) -> bool:
+        """Whether the rows matching `{"$operator": operand}` can be selected."""
+        if operator == "$in":
+            return isinstance(operand, list) and all(
+                _kind(item) in _SORTABLE_KINDS for item in operand
+            )
+        return (
+            operator in ("$eq", "$gt", "$gte", "$lt", "$lte")
+            and _kind(operand) in _SORTABLE_KINDS
+        )
+
+
+class JSONLIndex:
+    """A memory-mapped OPTIMADE JSONL file, indexed by entry type.
+
+    On creation, the byte offsets of the entries of every type are read from the
+    sidecar index file or, if it is missing or out of date, by scanning the file once.
+    The columns of the values of a field across the entries of a type are built
+    on demand, i.e., when the field is first queried or sorted by, or
+    when an index is created for it, and are then added to the sidecar index file.
+
+    Attributes:
+        path: The path to the JSONL file.
+        index_path: The path to the sidecar index file.
+
+    """
+
+    version = 2
+    """The version of the sidecar index file format."""
+
+    def __init__(self, path: Path):
+        """Open and index the given JSONL file.
+
+        Parameters:
+            path: The path to the JSONL file.
+
+        """
+        self.path = path
+        self.index_path = path.with_name(f"{path.name}.index")
+        self._lock = threading.Lock()
+        self._offsets: dict[str, tuple[array, array]] = {}
+        self._columns: dict[tuple[str, str], list[Any]] = {}
+        self._sorted_columns: dict[tuple[str, str], _SortedColumn] = {}
+
+        with open(path, "rb") as handle:
+            stat = os.fstat(handle.fileno())
+            if not stat.st_size:
+                raise ValueError(f"The JSONL file {path} is empty")
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self._signature = (stat.st_size, stat.st_mtime_ns)
+
+        if not self._load():
+            self._build()
+            self._save()
+
+    def __len__(self) -> int:
+        """Returns the total number of entries in the file."""
+        return sum(len(starts) for starts, _ in self._offsets.values())
+
+    def count(self, entry_type: str) -> int:
+        """Returns the number of entries of the given type."""
+        return len(self._offsets.get(entry_type, ((), ()))[0])
+
+    def _build(self) -> None:
+        """Index the offsets of the entries of every type by scanning the file."""
+        data = self._mmap
+        size = len(data)
+        pos = data.find(b"\n") + 1 or size
+        header = json.loads(data[:pos])
+        if not isinstance(header, dict) or not header.get("x-optimade"):
+            raise ValueError(
+                f"No x-optimade header in {self.path}, not sure if this is a JSONL file"
+            )
+
+        starts: dict[str, array] = defaultdict(lambda: array("q"))
+        ends: dict[str, array] = defaultdict(lambda: array("q"))
+        line_no = 0
+        bad_rows = 0
+        while pos < size:
+            end = data.find(b"\n", pos)
+            if end == -1:
+                end = size
+            line_no += 1
+            line = data[pos:end]
+            if line.strip():
+                try:
+                    entry = json.loads(line)
+                    if entry.get("id") is not None and entry.get("type") != "info":
+                        if not isinstance(entry.get("attributes"), dict):
+                            raise ValueError("the entry has no attributes")
+                        starts[entry["type"]].append(pos)
+                        ends[entry["type"]].append(end)
+                except (ValueError, AttributeError, KeyError) as exc:
+                    bad_rows += 1
+                    LOGGER.warning(
+                        "Could not index entry L%d of %s: %s", line_no, self.path, exc
+                    )
+            pos = end + 1
+
+        if bad_rows:
+            LOGGER.warning("Could not index %d rows of %s", bad_rows, self.path)
+        self._offsets = {
+            entry_type: (starts[entry_type], ends[entry_type]) for entry_type in starts
+        }
+        LOGGER.info("Indexed %d entries of %s", len(self), self.path)
+
+    def _load(self) -> bool:
+        """Load the sidecar index file, returning whether it is valid for the JSONL file.
+
+        The file holds a JSON header line, followed by the raw start and end offsets
+        of the entries of every type and a JSON line for every column, see `_save`.
+
+        """
+        try:
+            with open(self.index_path, "rb") as handle:
+                header = json.loads(handle.readline())
+                if (
+                    not isinstance(header, dict)
+                    or header.get("version") != self.version
+                    or header.get("byteorder") != sys.byteorder
+                    or header.get("signature") != list(self._signature)
+                ):
+                    LOGGER.info(
+                        "The index %s is out of date, re-indexing", self.index_path
+                    )
+                    return False
+
+                offsets: dict[str, tuple[array, array]] = {}
+                for entry_type, nentries in header["offsets"].items():
+                    starts, ends = array("q"), array("q")
+                    starts.fromfile(handle, nentries)
+                    ends.fromfile(handle, nentries)
+                    offsets[entry_type] = (starts, ends)
+
+                columns: dict[tuple[str, str], list[Any]] = {}
+                for entry_type, field in header["columns"]:
+                    column = json.loads(handle.readline(), object_hook=_object_hook)
+                    values = column["values"]
+                    for row in column["missing"]:
+                        values[row] = MISSING
+                    columns[(entry_type, field)] = values
+        except FileNotFoundError:
+            return False
+        except Exception as exc:
+            LOGGER.warning("Unable to read the index %s: %s", self.index_path, exc)
+            return False
+
+        self._offsets = offsets
+        self._columns = columns
+        return True
+
+    def _save(self) -> None:
+        """Write the sidecar index file, if possible.
+
+        Only data is stored, such that reading the file cannot run any code:
+        the offsets are written as raw arrays of 64-bit integers, and the columns
+        as JSON, with dates in MongoDB extended JSON (as in the JSONL file) and the
+        rows with a missing value listed separately.
+
+        """
+        header = {
+            "version": self.version,
+            "byteorder": sys.byteorder,
+            "signature": list(self._signature),
+            "offsets": {
+                entry_type: len(starts)
+                for entry_type, (starts, _) in self._offsets.items()
+            },
+            "columns": list(self._columns),
+        }
+        tmp_path = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}")
+        try:
+            with open(tmp_path, "wb") as handle:
+                handle.write(json.dumps(header).encode("utf-8") + b"\n")
+                for starts, ends in self._offsets.values():
+                    starts.tofile(handle)
+                    ends.tofile(handle)
+                for values in self._columns.values():
+                    column = {
+                        "missing": [
+                            row for row, value in enumerate(values) if value is MISSING
+                        ],
+                        "values": [
+                            None if value is MISSING else value for value in values
+                        ],
+                    }
+                    handle.write(
+                        json.dumps(column, default=_json_default).encode("utf-8")
+                        + b"\n"
+                    )
+            os.replace(tmp_path, self.index_path)
+        except (OSError, TypeError, ValueError) as exc:
+            LOGGER.warning("Unable to write the index %s: %s", self.index_path, exc)
+            tmp_path.unlink(missing_ok=True)
+
+    def _entries(
+        self, entry_type: str, rows: Iterable[int]
+    ) -> Iterator[dict[str, Any]]:
+        starts, ends = self._offsets.get(entry_type, ((), ()))
+        for row in rows:
+            yield _loads(self._mmap[starts[row] : ends[row]])
+
+    def documents(
+        self,
+        entry_type: str,
+        rows: Iterable[int],
+        projection: Iterable[str] | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Read the documents of the given rows of an entry type, in the format stored
+        by the database backends (see [`jsonl_entry_document`][optimade.utils.jsonl_entry_document]).
+
+        Parameters:
+            entry_type: The type of the entries.
+            rows: The row numbers of the entries.
+            projection: The fields to return, by default all fields; nested fields
+                are returned in full.
+
+        """
+        top_level = (
+            None
+            if projection is None
+            else {field.split(".")[0] for field in projection}
+        )
+        for entry in self._entries(entry_type, rows):
+            document = jsonl_entry_document(entry)
+            if top_level is not None:
+                document = {
+                    key: value for key, value in document.items() if key in top_level
+                }
+            yield document
+
+    def ensure_columns(self, entry_type: str, fields: Iterable[str]) -> None:
+        """Build the columns for the given fields of an entry type, if missing.
+
+        Columns of nested fields are derived from the column of their top-level
+        field, if it exists; all other columns are built in a single pass over the entries.
+
+        """
+        missing = {
+            field for field in fields if (entry_type, field) not in self._columns
+        }
+        if not missing:
+            return
+
+        with self._lock:
+            missing = {
+                field for field in missing if (entry_type, field) not in self._columns
+            }
+            if not missing:
+                return
+
+            columns: dict[str, list[Any]] = {}
+            for field in list(missing):
+                top_level, *rest = field.split(".")
+                if rest and (entry_type, top_level) in self._columns:
+                    columns[field] = [
+                        _resolve(value, rest) if value is not MISSING else MISSING
+                        for value in self._columns[(entry_type, top_level)]
+                    ]
+                    missing.remove(field)
+
+            if missing:
+                paths = {field: field.split(".") for field in missing}
+                for field in missing:
+                    columns[field] = []
+                for document in self.documents(
+                    entry_type, range(self.count(entry_type))
+                ):
+                    for field, parts in paths.items():
+                        columns[field].append(_resolve(document, parts))
+                LOGGER.info(
+                    "Indexed field(s) %s of the %s in %s",
+                    sorted(missing),
+                    entry_type,
+                    self.path,
+                )
+
+            for field, values in columns.items():
+                self._columns[(entry_type, field)] = values
+            if missing:
+                self._save()
+
+    def _sorted_column(self, entry_type: str, field: str) -> _SortedColumn:
+        key = (entry_type, field)
+        if key not in self._sorted_columns:
+            self._sorted_columns[key] = _SortedColumn(self._columns[key])
+        return self._sorted_columns[key]
+
+    def match(self, entry_type: str, query: dict[str, Any]) -> list[int]:
+        """Return the rows of an entry type that match a MongoDB-style query,
+        e.g., as produced by the
+        [`JSONLTransformer`][optimade.filtertransformers.jsonl.JSONLTransformer].
+
+        Parameters:
+            entry_type: The type of the entries.
+            query: The query to evaluate.
+
+        Returns:
+            The sorted row numbers of the matching entries.
+
+        """
+        self.ensure_columns(entry_type, _query_fields(query))
+        rows = self._match(entry_type, query)
+        if rows is None:
+            return list(range(self.count(entry_type)))
+        return sorted(rows)
+
+    def _match(self, entry_type: str, query: dict[str, Any]) -> set[int] | None:
+        """Evaluate a query, returning `None` if all rows match."""
+        rows: set[int] | None = None
+        selected: set[int] | None
+        for key, expr in query.items():
+            if key == "$and":
+                selected = None
+                for sub in expr:
+                    sub_rows = self._match(entry_type, sub)
+                    if sub_rows is None:
+                        continue
+                    if selected is None:
+                        selected = sub_rows
+                    else:
+                        selected = selected & sub_rows
+            elif key in ("$or", "$nor"):
+                selected = set()
+                for sub in expr:
+                    sub_rows = self._match(entry_type, sub)
+                    if sub_rows is None:
+                        selected = None
+                        break
+                    selected |= sub_rows
+                if key == "$nor":
+                    selected = (
+                        set(range(self.count(entry_type))) - selected
+                        if selected is not None
+                        else set()
+                    )
+            else:
+                selected = self._match_field(entry_type, key, expr)
+
+            if selected is not None:
+                rows = selected if rows is None else rows & selected
+        return rows
+
+    def _match_field(self, entry_type: str, field: str, expr: Any) -> set[int]:
+        """Evaluate the expression for a single field, selecting the rows from
+        the sorted column where possible and scanning the column otherwise."""
+        ops = expr if _is_operator_expr(expr) else {"$eq": expr}
+        rows: set[int] | None = None
+        remaining = {}
+        for operator, operand in ops.items():
+            if _SortedColumn.supports(operator, operand):
+                selected = self._sorted_column(entry_type, field).select(
+                    operator, operand
+                )
+                rows = selected if rows is None else rows & selected
+            else:
+                remaining[operator] = operand
+
+        if remaining:
+            values = self._columns[(entry_type, field)]
+            candidates = range(len(values)) if rows is None else rows
+            rows = {row for row in candidates if _match_value(values[row], remaining)}
+        return rows if rows is not None else set()
+
+    def sort(
+        self,
+        entry_type: str,
+        rows: list[int],
+        sort_spec: Iterable[tuple[str, int]],
+    ) -> list[int]:
+        """Sort the rows of an entry type by the given fields and directions."""
+        sort_spec = list(sort_spec)
+        self.ensure_columns(entry_type, (field for field, _ in sort_spec))
+        rows = list(rows)
+        # Sorting is stable, so sort by the least significant field first
+        for field, direction in reversed(sort_spec):
+            values = self._columns[(entry_type, field)]
+            rows.sort(
+                key=lambda row: _sort_key(values[row], direction),
+                reverse=direction == -1,
+            )
+        return rows
+
+
+_INDEXES: dict[Path, JSONLIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def jsonl_index(path: Path) -> JSONLIndex:
+    """Return the shared [`JSONLIndex`][optimade.server.entry_collections.jsonl.JSONLIndex]
+    of a JSONL file, opening it on first use.
+
+    Like for [`insert_from_jsonl`][optimade.utils.insert_from_jsonl], relative paths
+    are also looked up relative to the `optimade` package.
+
+    """
+    if not path.is_file():
+        _path = Path(__file__).parent.parent.parent.joinpath(path)
+        if not _path.is_file():
+            raise FileNotFoundError(f"Could not find file {path} or {_path}")
+        path = _path
+    path = path.resolve()
+
+    with _INDEXES_LOCK:
+        if path not in _INDEXES:
+            _INDEXES[path] = JSONLIndex(path)
+        return _INDEXES[path]
+
+
+class JSONLCollection(EntryCollection):
+    """Read-only collection of the entries of a single type in an OPTIMADE JSONL file.
+
+    Filters are transformed by the
+    [`JSONLTransformer`][optimade.filtertransformers.jsonl.JSONLTransformer] into
+    the same queries as for MongoDB, which are then evaluated against the columns of
+    the shared [`JSONLIndex`][optimade.server.entry_collections.jsonl.JSONLIndex]
+    of the file.
+    Only offset-based pagination is supported.
+
+    """
+
+    pagination_mechanism = PaginationMechanism("page_offset")
+    page_above_supported = False
+
+    match_cache_size = 64
+    """The number of sorted query results kept to serve the next pages."""
+
+    def __init__(
+        self,
+        name: str,
+        resource_cls: type[EntryResource],
+        resource_mapper: type[BaseResourceMapper],
+        path: Path | None = None,
+    ):
+        """Initialize the JSONLCollection for the given parameters.
+
+        Parameters:
+            name: The name of the collection, i.e., the type of the entries.
+            resource_cls: The type of entry resource that is stored by the collection.
+            resource_mapper: A resource mapper object that handles aliases and
+                format changes between deserialization and response.
+            path: The path to the JSONL file, by default `CONFIG.jsonl_database`,
+                or else `CONFIG.insert_from_jsonl`.
+
+        """
+        super().__init__(
+            resource_cls=resource_cls,
+            resource_mapper=resource_mapper,
+            transformer=JSONLTransformer(mapper=resource_mapper),
+        )
+
+        path = path or CONFIG.jsonl_database or CONFIG.insert_from_jsonl
+        if path is None:
+            raise RuntimeError(
+                "The 'jsonl' database backend requires the path to a JSONL file, "
+                "please set 'jsonl_database'."
+            )
+        self.name = name
+        self.index = jsonl_index(Path(path))
+        self._match_cache = QueryCache(maxsize=self.match_cache_size)
+
+    def __len__(self) -> int:
+        """Returns the total number of entries in the collection."""
+        return self.index.count(self.name)
+
+    def insert(self, data: list[EntryResource | dict]) -> None:
+        """The JSONL backend is read-only, so no data can be inserted.
+
+        Raises:
+            NotImplementedError: Always.
+
+        """
+        raise NotImplementedError("The JSONL database backend is read-only.")
+
+    def count(self, **kwargs: Any) -> int | None:
+        """Returns the number of entries matching the query specified
+        by the keyword arguments.
+
+        Parameters:
+            **kwargs: Query parameters as keyword arguments. The keys
+                'filter', 'skip' and 'limit' are used as for MongoDB.
+
+        """
+        nresults = len(self._find_rows(kwargs.get("filter") or {}, ()))
+        nresults = max(nresults - kwargs.get("skip", 0), 0)
+        if kwargs.get("limit"):
+            nresults = min(nresults, kwargs["limit"])
+        return nresults
+
+    def create_index(self, field: str, unique: bool = False) -> None:
+        """Build the column index of the given field, as stored in the file.
+
+        Arguments:
+            field: The field to index (i.e., if different from the OPTIMADE field,
+                the mapper should be used to convert between the two).
+            unique: Not used, as the collection is read-only.
+
+        """
+        self.index.ensure_columns(self.name, [field])
+
+    def create_default_index(self) -> None:
+        """Create the default index for the collection, i.e., on the `id` field."""
+        self.create_index(self.resource_mapper.get_backend_field("id"))
+
+    def _find_rows(
+        self, filter_: dict[str, Any], sort_spec: Iterable[tuple[str, int]]
+    ) -> list[int]:
+        """Return the sorted rows matching the filter, reusing recent results."""
+        sort_spec = tuple(tuple(_) for _ in sort_spec)
+        key = (repr(filter_), sort_spec)
+        rows = self._match_cache.get(key)
+        if rows is None:
+            rows = self.index.match(self.name, filter_)
+            if sort_spec:
+                rows = self.index.sort(self.name, rows, sort_spec)
+            self._match_cache.put(key, rows)
+        return rows
+
+    def _page(self, criteria: dict[str, Any]) -> tuple[list[int], list[int]]:
+        """Return all matching rows and the rows of the requested page."""
+        rows = self._find_rows(criteria.get("filter") or {}, criteria.get("sort", ()))
+        skip = criteria.get("skip", 0)
+        limit = criteria.get("limit", 0)
+        return rows, rows[skip : skip + limit] if limit else rows[skip:]
+
+    def _run_db_query(
+        self, criteria: dict[str, Any], single_entry: bool = False
+    ) -> tuple[list[dict[str, Any]], int | None, bool]:
+        """Run the query on the file indexes and collect the results.
+
+        Arguments:
+            criteria: A dictionary representation of the query parameters.
+            single_entry: Whether or not the caller is expecting a single entry response.
+
+        Returns:
+            The list of entries from the file (without any re-mapping), the total number of
+            entries matching the query and a boolean for whether or not there is more data available.
+
+        """
+        with timed("query"):
+            rows, page = self._page(criteria)
+            results = list(
+                self.index.documents(self.name, page, criteria.get("projection"))
+            )
+
+        if single_entry:
+            # SingleEntryQueryParams, e.g., /structures/{entry_id}
+            return results, len(results), False
+
+        more_data_available = bool(criteria.get("limit")) and criteria.get(
+            "skip", 0
+        ) + len(page) < len(rows)
+        return results, len(rows), more_data_available
+
+    def _iter_db_query(
+        self, criteria: dict[str, Any], summary: dict[str, Any]
+    ) -> Iterator[dict[str, Any]]:
+        """Run the query on the file indexes and read the results lazily, see
+        `EntryCollection._iter_db_query`."""
+        rows, page = self._page(criteria)
+        yield from self.index.documents(self.name, page, criteria.get("projection"))
+
+        summary["data_returned"] = len(rows)
+        summary["more_data_available"] = bool(criteria.get("limit")) and criteria.get(
+            "skip", 0
+        ) + len(page) < len(rows)
+
+    def _run_ids_query(self, ids: list[str], fields: set[str]) -> list[dict[str, Any]]:
+        """Look up the entries with the given IDs in the column of the `id` field."""
+        id_field = self.resource_mapper.get_backend_field("id")
+        with timed("query"):
+            rows = self.index.match(self.name, {id_field: {"$in": ids}})
+            return list(
+                self.index.documents(
+                    self.name,
+                    rows,
+                    [self.resource_mapper.get_backend_field(field) for field in fields],
+                )
+            )
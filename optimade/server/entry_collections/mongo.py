@@ -1,9 +1,33 @@
+import asyncio
+import base64
+import binascii
+import itertools
+import json
+import threading
+from collections.abc import AsyncIterator, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any
 
-from optimade.filtertransformers.mongo import MongoTransformer
+from optimade.exceptions import BadRequest
+from optimade.filtertransformers.mongo import (
+    ELEMENTS_KEY_FIELD,
+    MongoTransformer,
+    elements_bitmask_fields,
+)
 from optimade.models import EntryResource
 from optimade.server.config import CONFIG, SupportedBackend
-from optimade.server.entry_collections import EntryCollection
+from optimade.server.entry_collections import (
+    AsyncEntryCollection,
+    BaseEntryCollection,
+    EntryCollection,
+    PaginationMechanism,
+)
+from optimade.server.entry_collections.entry_collections import (
+    QueryCache,
+    submit_query,
+    timed,
+)
+from optimade.server.indexes import IndexAdvisor, IndexSpec, is_list_field
 from optimade.server.logger import LOGGER
 from optimade.server.mappers import BaseResourceMapper
 from optimade.server.query_params import EntryListingQueryParams, SingleEntryQueryParams
@@ -28,10 +52,32 @@ elif CONFIG.database_backend.value == "mongomock":
 if CONFIG.database_backend.value in ("mongomock", "mongodb"):
     CLIENT = MongoClient(CONFIG.mongo_uri)
 
+ASYNC_CLIENT: Any = None
 
-class MongoCollection(EntryCollection):
-    """Class for querying MongoDB collections (implemented by either pymongo or mongomock)
-    containing serialized [`EntryResource`][optimade.models.entries.EntryResource]s objects.
+_COUNT_EXECUTOR: ThreadPoolExecutor | None = None
+
+
+_COUNT_EXECUTOR_LOCK = threading.Lock()
+
+
+def _count_executor() -> ThreadPoolExecutor:
+    """Returns the executor shared by all collections for background counts."""
+    global _COUNT_EXECUTOR
+    if _COUNT_EXECUTOR is None:
+        with _COUNT_EXECUTOR_LOCK:
+            if _COUNT_EXECUTOR is None:
+                _COUNT_EXECUTOR = ThreadPoolExecutor(
+                    max_workers=2, thread_name_prefix="optimade-count"
+                )
+    return _COUNT_EXECUTOR
+
+
+class _MongoCollectionBase(BaseEntryCollection):
+    """The parts of [`MongoCollection`][optimade.server.entry_collections.mongo.MongoCollection]
+    and [`AsyncMongoCollection`][optimade.server.entry_collections.mongo.AsyncMongoCollection]
+    that do not depend on how MongoDB is queried: the query criteria, value-based
+    pagination, the count cache, and inserting data and creating indexes through the
+    synchronous client.
 
     """
 
@@ -52,13 +98,28 @@ class MongoCollection(EntryCollection):
             database: The name of the underlying MongoDB database to connect to.
 
         """
+        # Only entry types with `elements` store the derived bitmask fields
+        self._elements_bitmask = (
+            CONFIG.elements_bitmask
+            and "elements" in resource_mapper.ENTRY_RESOURCE_ATTRIBUTES
+        )
         super().__init__(
             resource_cls,
             resource_mapper,
-            MongoTransformer(mapper=resource_mapper),
+            MongoTransformer(
+                mapper=resource_mapper, elements_bitmask=self._elements_bitmask
+            ),
         )
 
         self.collection = CLIENT[database][name]
+        self.pagination_mechanism = PaginationMechanism(CONFIG.pagination_mechanism)
+        self._count_cache = QueryCache(
+            maxsize=CONFIG.count_cache_size, ttl=CONFIG.count_cache_ttl
+        )
+        self._pending_counts: dict[str, Future | asyncio.Future] = {}
+        self._count_generation = 0
+        self._count_lock = threading.Lock()
+        self.index_advisor = IndexAdvisor(resource_mapper)
 
         # check aliases do not clash with mongo operators
         self._check_aliases(self.resource_mapper.all_aliases())
@@ -68,32 +129,15 @@ class MongoCollection(EntryCollection):
         """Returns the total number of entries in the collection."""
         return self.collection.estimated_document_count()
 
-    def count(self, **kwargs: Any) -> int | None:
-        """Returns the number of entries matching the query specified
-        by the keyword arguments, or `None` if the count timed out.
-
-        Parameters:
-            **kwargs: Query parameters as keyword arguments. The keys
-                'filter', 'skip', 'limit', 'hint' and 'maxTimeMS' will be passed
-                to the `pymongo.collection.Collection.count_documents` method.
-
-        """
-        for k in list(kwargs.keys()):
-            if k not in ("filter", "skip", "limit", "hint", "maxTimeMS"):
-                del kwargs[k]
-        if "filter" not in kwargs:
-            return self.collection.estimated_document_count()
-        else:
-            if "maxTimeMS" not in kwargs:
-                kwargs["maxTimeMS"] = 1000 * CONFIG.mongo_count_timeout
-            try:
-                return self.collection.count_documents(**kwargs)
-            except ExecutionTimeout:
-                return None
-
     def insert(self, data: list[EntryResource | dict]) -> None:
         """Add the given entries to the underlying database.
 
+        If `elements_bitmask` is set in the configuration, the fields derived from
+        the `elements` of each entry by
+        [`elements_bitmask_fields`][optimade.filtertransformers.mongo.elements_bitmask_fields]
+        are added to (a copy of) the entry, as are the
+        [materialized length fields][optimade.server.mappers.entries.BaseResourceMapper.length_fields].
+
         Warning:
             No validation is performed on the incoming data, this data
             should have been mapped to the appropriate format before
@@ -103,7 +147,18 @@ class MongoCollection(EntryCollection):
             data: The entries to add to the database.
 
         """
+        data = self._with_length_fields(data)
+        if self._elements_bitmask:
+            elements_field = self.resource_mapper.get_backend_field("elements")
+            data = [dict(entry) for entry in data]
+            for entry in data:
+                entry.update(elements_bitmask_fields(entry.get(elements_field)))
         self.collection.insert_many(data, ordered=False)
+        with self._count_lock:
+            self._count_generation += 1
+            self._pending_counts.clear()
+        self._count_cache.invalidate()
+        self._data_available_cache.invalidate()
 
     def create_index(self, field: str, unique: bool = False) -> None:
         """Create an index on the given field, as stored in the database.
@@ -126,8 +181,56 @@ class MongoCollection(EntryCollection):
         on the `id` field. This method should obey any configured
         mappers.
 
+        If `elements_bitmask` is set in the configuration, an index on the
+        sorted elements key is created for `HAS ONLY` filters, and if
+        `create_advised_indexes` is set, the missing
+        indexes of the [index plan][optimade.server.indexes.IndexAdvisor.plan]
+        are created as well.
+
         """
         self.create_index(self.resource_mapper.get_backend_field("id"), unique=True)
+        if self._elements_bitmask:
+            self.create_index(ELEMENTS_KEY_FIELD)
+        if CONFIG.create_advised_indexes:
+            self.create_indexes(
+                [index for index, exists in self.index_plan() if not exists]
+            )
+
+    def create_indexes(self, indexes: Iterable[IndexSpec]) -> None:
+        """Create the given (compound) indexes in the database.
+
+        Arguments:
+            indexes: The specifications of the indexes to create.
+
+        """
+        for index in indexes:
+            LOGGER.info("Creating index %s on %r", index, self.collection.name)
+            self.collection.create_index(
+                list(index.keys), unique=index.unique, background=True
+            )
+
+    def existing_indexes(self) -> list[IndexSpec]:
+        """Return the indexes that exist in the database for the collection.
+
+        The keys of special indexes, e.g., text, geospatial or hashed indexes, are
+        kept with their type instead of a direction.
+
+        """
+        return [
+            IndexSpec(
+                tuple(
+                    (key, direction if isinstance(direction, str) else int(direction))
+                    for key, direction in info["key"]
+                ),
+                unique=bool(info.get("unique")),
+            )
+            for info in self.collection.index_information().values()
+        ]
+
+    def index_plan(self, min_queries: int = 1) -> list[tuple[IndexSpec, bool]]:
+        """Return the index plan of the collection, see
+        [`IndexAdvisor.plan`][optimade.server.indexes.IndexAdvisor.plan]."""
+        return self.index_advisor.plan(self.existing_indexes(), min_queries)
 
     def handle_query_params(
         self, params: EntryListingQueryParams | SingleEntryQueryParams
@@ -151,38 +254,105 @@ class MongoCollection(EntryCollection):
 
         """
         criteria = super().handle_query_params(params)
+        if isinstance(params, EntryListingQueryParams):
+            self.index_advisor.record(criteria.get("filter"), criteria.get("sort"))
+
         # Handle MongoDB ObjectIDs:
         # - If they were not requested, then explicitly remove them
         # - If they were requested, then cast them to strings in the response
         if "_id" not in criteria.get("projection", {}):
             criteria["projection"]["_id"] = False
 
-        if "page_above" in criteria:
-            raise NotImplementedError(
-                "`page_above` is not implemented for this backend."
-            )
+        if "page_above" in criteria or (
+            self.pagination_mechanism is PaginationMechanism.ABOVE
+            and isinstance(params, EntryListingQueryParams)
+            and "skip" not in criteria
+            and not self._list_sort_fields(criteria.get("sort") or [])
+        ):
+            self._handle_page_above(criteria)
 
         if criteria.get("projection", {}).get("_id"):
             criteria["projection"]["_id"] = {"$toString": "$_id"}
 
         return criteria
 
-    def _run_db_query(
-        self, criteria: dict[str, Any], single_entry: bool = False
-    ) -> tuple[list[dict[str, Any]], int | None, bool]:
-        """Run the query on the backend and collect the results.
+    def explain(self, criteria: dict[str, Any]) -> dict[str, Any] | None:
+        """Return the query plan of MongoDB for finding the requested page of
+        entries, as given by `Cursor.explain()`.
+
+        Arguments:
+            criteria: A dictionary representation of the query parameters.
+
+        Returns:
+            The query plan, or `None` for mongomock, which cannot explain queries.
+
+        """
+        _, find_criteria, _ = self._prepare_db_query(criteria, False)
+        cursor = self.collection.find(**find_criteria)
+        if not hasattr(cursor, "explain"):
+            return None
+        return cursor.explain()
+
+    def _prepare_db_query(
+        self, criteria: dict[str, Any], single_entry: bool
+    ) -> tuple[dict[str, Any], dict[str, Any], bool]:
+        """Split the query criteria into the criteria for finding the requested page
+        of entries and those describing the full result set.
 
         Arguments:
             criteria: A dictionary representation of the query parameters.
             single_entry: Whether or not the caller is expecting a single entry response.
 
         Returns:
-            The list of entries from the database (without any re-mapping), the total number of
-            entries matching the query and a boolean for whether or not there is more data available.
+            The criteria without the internal `keyset_filter`, the criteria to pass to
+            `find` and whether the criteria are for the first page of results.
 
         """
-        results = list(self.collection.find(**criteria))
+        criteria = criteria.copy()
+        keyset_filter = criteria.pop("keyset_filter", None)
+        first_page = not criteria.get("skip") and not keyset_filter
+        if single_entry or not (
+            keyset_filter is not None or CONFIG.count_mode != "exact"
+        ):
+            criteria.pop("probe", None)
+        else:
+            # Unless every page is counted exactly, request one more entry than needed
+            # to know whether there is a next page
+            criteria["probe"] = True
+
+        find_criteria = criteria.copy()
+        find_criteria.pop("probe", None)
+        if keyset_filter:
+            find_criteria["filter"] = (
+                {"$and": [criteria["filter"], keyset_filter]}
+                if criteria.get("filter")
+                else keyset_filter
+            )
+        if criteria.get("probe") and criteria.get("limit"):
+            find_criteria["limit"] = criteria["limit"] + 1
+
+        return criteria, find_criteria, first_page
 
+    @staticmethod
+    def _count_criteria(criteria: dict[str, Any]) -> dict[str, Any]:
+        """Returns the query criteria describing the full result set, i.e., without
+        the pagination of the requested page."""
+        count_criteria = criteria.copy()
+        for key in ("limit", "skip", "probe"):
+            count_criteria.pop(key, None)
+        return count_criteria
+
+    def _collect_results(
+        self,
+        results: list[dict[str, Any]],
+        criteria: dict[str, Any],
+        data_returned: int | None,
+        single_entry: bool,
+    ) -> tuple[list[dict[str, Any]], int | None, bool]:
+        """Determine whether more data is available from the results found for the
+        criteria prepared by `_prepare_db_query` and the number of matching entries.
+
+        """
         if CONFIG.database_backend == SupportedBackend.MONGOMOCK and criteria.get(
             "projection", {}
         ).get("_id"):
@@ -191,27 +361,781 @@ class MongoCollection(EntryCollection):
                 results[ind]["_id"] = str(doc["_id"])
 
         nresults_now = len(results)
-        if not single_entry:
-            criteria_nolimit = criteria.copy()
-            criteria_nolimit.pop("limit", None)
-            skip = criteria_nolimit.pop("skip", 0)
-            data_returned = self.count(**criteria_nolimit)
-            # Only correct most of the time: if the total number of remaining results is exactly the page limit
-            # then this will incorrectly say there is more_data_available
-            if data_returned is None:
-                more_data_available = nresults_now == criteria.get("limit", 0)
-            else:
-                more_data_available = nresults_now + skip < data_returned
-        else:
+        if single_entry:
             # SingleEntryQueryParams, e.g., /structures/{entry_id}
             data_returned = nresults_now
             more_data_available = False
+        else:
+            more_data_available = self._more_data_available(
+                nresults_now, criteria, data_returned
+            )
+            if more_data_available and criteria.get("probe"):
+                results = results[: criteria["limit"]]
+            data_returned = self._at_least_found(
+                data_returned, criteria, len(results) + int(more_data_available)
+            )
 
         return results, data_returned, more_data_available
 
+    @staticmethod
+    def _at_least_found(
+        data_returned: int | None, criteria: dict[str, Any], nfound: int
+    ) -> int | None:
+        """Raise an estimated number of matching entries to at least the number of
+        entries known to match: if any entries were found for the page, these
+        `nfound` entries (including the extra entry requested to probe for more data)
+        and all the skipped entries.
+
+        """
+        if data_returned is None or not nfound:
+            return data_returned
+        return max(data_returned, criteria.get("skip", 0) + nfound)
+
+    @staticmethod
+    def _more_data_available(
+        nresults: int, criteria: dict[str, Any], data_returned: int | None
+    ) -> bool:
+        """Whether more data is available than the page of `nresults` results fetched
+        for the criteria prepared by `_prepare_db_query`, including the extra entry
+        requested if `"probe"` is set."""
+        if not criteria.get("limit"):
+            return False
+        if criteria.get("probe"):
+            return bool(criteria.get("limit") and nresults > criteria["limit"])
+        # Only correct most of the time: if the total number of remaining results is exactly the page limit
+        # then this will incorrectly say there is more_data_available
+        if data_returned is None:
+            return nresults == criteria.get("limit", 0)
+        return nresults + criteria.get("skip", 0) < data_returned
+
+    @staticmethod
+    def _stringify_cursor_id(
+        doc: dict[str, Any], criteria: dict[str, Any]
+    ) -> dict[str, Any]:
+        if CONFIG.database_backend == SupportedBackend.MONGOMOCK and criteria.get(
+            "projection", {}
+        ).get("_id"):
+            # mongomock does not support `$toString`` in projection
+            doc["_id"] = str(doc["_id"])
+        return doc
+
+    def _ids_find_criteria(self, ids: list[str], fields: set[str]) -> dict[str, Any]:
+        projection: dict[str, Any] = {
+            self.resource_mapper.get_backend_field(field): True for field in fields
+        }
+        projection.setdefault("_id", False)
+        return {
+            "filter": {self.resource_mapper.get_backend_field("id"): {"$in": ids}},
+            "projection": projection,
+        }
+
+    @staticmethod
+    def _stringify_ids(
+        results: list[dict[str, Any]], find_criteria: dict[str, Any]
+    ) -> list[dict[str, Any]]:
+        if find_criteria["projection"]["_id"]:
+            for doc in results:
+                doc["_id"] = str(doc["_id"])
+        return results
+
+    def _plan_count(
+        self, criteria: dict[str, Any], first_page: bool
+    ) -> tuple[str, int | None, str | None]:
+        """Look up the number of entries matching the query criteria in the cache,
+        unless `count_mode` is `exact`.
+
+        Parameters:
+            criteria: The query criteria, without `limit` and `skip`.
+            first_page: Whether the criteria are for the first page of results.
+
+        Returns:
+            The cache key for the criteria, the cached count (if any) and the
+            `count_mode` to use if the count still has to be determined, or `None`.
+
+        """
+        import bson.json_util
+
+        key = bson.json_util.dumps(criteria.get("filter"), sort_keys=True)
+        if CONFIG.count_mode == "exact":
+            # Exact counts are not cached, as the data may be changed by other clients
+            return key, None, CONFIG.count_mode
+        data_returned = self._count_cache.get(key)
+        if data_returned is not None or (
+            CONFIG.count_mode == "first_page" and not first_page
+        ):
+            return key, data_returned, None
+        return key, None, CONFIG.count_mode
+
+    def _next_query_params(
+        self, params: EntryListingQueryParams, nresults: int, last: dict[str, Any]
+    ) -> dict[str, list[str]]:
+        """Provides url query pagination parameters that will be used in the next
+        link.
+
+        If `page_above` was requested, or if no pagination parameter was requested
+        and the collection defaults to value-based pagination (unless the results
+        are sorted on a list field), the `page_above` token for the last entry of
+        the current page is returned.
+        Otherwise, the base `EntryCollection._next_query_params` is used.
+
+        Arguments:
+            params: The parsed request params produced by handle_query_params.
+            nresults: The number of results of the current page.
+            last: The last result of the current page.
+
+        Returns:
+            A dictionary with the necessary query parameters.
+
+        """
+        sort_spec = self._keyset_sort_spec(
+            self.parse_sort_params(params.sort) if getattr(params, "sort", "") else []
+        )
+        use_page_above = getattr(params, "page_above", None) is not None or (
+            self.pagination_mechanism is PaginationMechanism.ABOVE
+            and not getattr(params, "page_offset", 0)
+            and getattr(params, "page_number", None) is None
+            and not self._list_sort_fields(sort_spec)
+        )
+        if not use_page_above:
+            return super()._next_query_params(params, nresults, last)
+
+        values = [self._get_sort_value(last, field) for field, _ in sort_spec]
+        return {"page_above": [self._encode_page_above(sort_spec, values)]}
+
+    def _keyset_sort_spec(
+        self, sort_spec: Iterable[tuple[str, int]]
+    ) -> list[tuple[str, int]]:
+        """Return the sort spec with the backend `id` field appended as a
+        tie-breaker, if it is not already present.
+
+        """
+        id_field = self.resource_mapper.get_backend_field("id")
+        sort_spec = list(sort_spec)
+        if id_field not in (field for field, _ in sort_spec):
+            sort_spec.append((id_field, 1))
+        return sort_spec
+
+    def _list_sort_fields(self, sort_spec: Iterable[tuple[str, int]]) -> list[str]:
+        """Return the sort fields that are (in) lists according to the schema.
+
+        MongoDB sorts a list by its lowest value (its highest value in descending
+        order), whereas a range filter on the field matches a list if any of its
+        values is in the range, such that value-based pagination cannot be used
+        for these fields.
+
+        """
+        return [
+            field
+            for field, _ in sort_spec
+            if is_list_field(self.resource_mapper, field)
+        ]
+
+    def _handle_page_above(self, criteria: dict[str, Any]) -> None:
+        """Set up value-based pagination for the query criteria, in-place.
+
+        The sort spec is completed with the `id` tie-breaker and, if a `page_above`
+        value was passed, a filter selecting the entries that come after it in
+        that order is stored under the `"keyset_filter"` key.
+        This filter is only applied to the page query, not to the count.
+
+        Raises:
+            BadRequest: If the results are sorted on a list field.
+
+        """
+        list_fields = self._list_sort_fields(criteria.get("sort") or [])
+        if list_fields:
+            raise BadRequest(
+                detail=(
+                    "'page_above' is not supported when sorting on the list "
+                    f"field(s) {', '.join(map(repr, list_fields))}, please use 'page_offset'."
+                )
+            )
+        sort_spec = self._keyset_sort_spec(criteria.get("sort", []))
+        criteria["sort"] = sort_spec
+
+        page_above = criteria.pop("page_above", None)
+        if page_above is None:
+            criteria["keyset_filter"] = {}
+            return
+
+        values = self._decode_page_above(page_above, sort_spec)
+        clauses: list[dict[str, Any]] = []
+        for ind, (field, sort_dir) in enumerate(sort_spec):
+            after = self._after_value_filter(field, sort_dir, values[ind])
+            if after is None:
+                continue
+            clause = {
+                prev_field: prev_value
+                for (prev_field, _), prev_value in zip(sort_spec[:ind], values[:ind])
+            }
+            if clause:
+                clauses.append({"$and": [clause, after]})
+            else:
+                clauses.append(after)
+
+        if not clauses:
+            # No entry can come after the given values
+            clauses.append({sort_spec[-1][0]: {"$in": []}})
+        criteria["keyset_filter"] = {"$or": clauses}
+
+    @staticmethod
+    def _after_value_filter(
+        field: str, sort_dir: int, value: Any
+    ) -> dict[str, Any] | None:
+        """Return a filter selecting the values of `field` that are sorted after `value`,
+        or `None` if there are no such values.
+
+        MongoDB sorts missing and `null` values before any other value.
+
+        """
+        if sort_dir == 1:
+            if value is None:
+                return {field: {"$ne": None}}
+            return {field: {"$gt": value}}
+        if value is None:
+            return None
+        return {"$or": [{field: {"$lt": value}}, {field: None}]}
+
+    def _get_sort_value(self, entry: dict[str, Any], backend_field: str) -> Any:
+        """Return the value of a (backend) sort field from a mapped entry."""
+        first, *rest = backend_field.split(".")
+        optimade_field = self.resource_mapper.get_optimade_field(first)
+        if optimade_field in self.resource_mapper.TOP_LEVEL_NON_ATTRIBUTES_FIELDS:
+            value = entry.get(optimade_field)
+        else:
+            value = entry.get("attributes", {}).get(optimade_field)
+        for part in rest:
+            value = value.get(part) if isinstance(value, dict) else None
+        return value
+
+    @staticmethod
+    def _encode_page_above(sort_spec: list[tuple[str, int]], values: list[Any]) -> str:
+        """Encode the sort spec and the sort values of an entry as an opaque,
+        URL-safe `page_above` token.
+
+        """
+        import bson.json_util
+
+        payload = bson.json_util.dumps({"sort": sort_spec, "values": values})
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+    def _decode_page_above(
+        self, page_above: str, sort_spec: list[tuple[str, int]]
+    ) -> list[Any]:
+        """Decode a `page_above` token into the list of sort values.
+
+        Any value that is not a token produced by this collection is taken to be
+        an `id` value, as long as the results are only sorted by `id`.
+
+        Raises:
+            BadRequest: If the token is invalid, or was produced for a different
+                sort order.
+
+        """
+        import bson.json_util
+
+        try:
+            payload = bson.json_util.loads(
+                base64.urlsafe_b64decode(page_above.encode("ascii")).decode("utf-8")
+            )
+            token_sort = [tuple(_) for _ in payload["sort"]]
+            values = list(payload["values"])
+        except (
+            binascii.Error,
+            UnicodeError,
+            ValueError,
+            json.JSONDecodeError,
+            KeyError,
+            TypeError,
+        ):
+            if len(sort_spec) == 1:
+                return [page_above]
+            raise BadRequest(
+                detail=f"Unable to interpret 'page_above' value {page_above!r} for the requested sort."
+            )
+
+        if token_sort != sort_spec or len(values) != len(sort_spec):
+            raise BadRequest(
+                detail=(
+                    "The 'page_above' value was created for a different sort order, "
+                    "please restart pagination for this sort."
+                )
+            )
+
+        return values
+
     def _check_aliases(self, aliases):
         """Check that aliases do not clash with mongo keywords."""
         if any(
             alias[0].startswith("$") or alias[1].startswith("$") for alias in aliases
         ):
             raise RuntimeError(f"Cannot define an alias starting with a '$': {aliases}")
+
+
+class MongoCollection(_MongoCollectionBase, EntryCollection):
+    """Class for querying MongoDB collections (implemented by either pymongo or mongomock)
+    containing serialized [`EntryResource`][optimade.models.entries.EntryResource]s objects.
+
+    Besides offset-based pagination, value-based (keyset) pagination is supported with
+    `page_above`: results are sorted by the requested `sort` fields followed by `id`,
+    and the opaque `page_above` token emitted in the `next` link holds the sort values
+    of the last entry of the page, such that any page can be found from an index
+    without skipping over the preceding entries.
+
+    """
+
+    def count(self, **kwargs: Any) -> int | None:
+        """Returns the number of entries matching the query specified
+        by the keyword arguments, or `None` if the count timed out.
+
+        Parameters:
+            **kwargs: Query parameters as keyword arguments. The keys
+                'filter', 'skip', 'limit', 'hint' and 'maxTimeMS' will be passed
+                to the `pymongo.collection.Collection.count_documents` method.
+
+        """
+        for k in list(kwargs.keys()):
+            if k not in ("filter", "skip", "limit", "hint", "maxTimeMS"):
+                del kwargs[k]
+        if "filter" not in kwargs:
+            return self.collection.estimated_document_count()
+        else:
+            if "maxTimeMS" not in kwargs:
+                kwargs["maxTimeMS"] = 1000 * CONFIG.mongo_count_timeout
+            try:
+                return self.collection.count_documents(**kwargs)
+            except ExecutionTimeout:
+                return None
+
+    def _run_db_query(
+        self, criteria: dict[str, Any], single_entry: bool = False
+    ) -> tuple[list[dict[str, Any]], int | None, bool]:
+        """Run the query on the backend and collect the results.
+
+        Arguments:
+            criteria: A dictionary representation of the query parameters.
+            single_entry: Whether or not the caller is expecting a single entry response.
+
+        Returns:
+            The list of entries from the database (without any re-mapping), the total number of
+            entries matching the query and a boolean for whether or not there is more data available.
+
+        """
+        criteria, find_criteria, first_page = self._prepare_db_query(
+            criteria, single_entry
+        )
+
+        # The count is independent of the page of results, so run it concurrently
+        count: Future | None = None
+        if not single_entry:
+            count = submit_query(
+                self._count_matches,
+                self._count_criteria(criteria),
+                first_page=first_page,
+            )
+
+        with timed("query"):
+            results = list(self.collection.find(**find_criteria))
+
+        data_returned = count.result() if count is not None else None
+
+        return self._collect_results(results, criteria, data_returned, single_entry)
+
+    def _iter_db_query(
+        self, criteria: dict[str, Any], summary: dict[str, Any]
+    ) -> Iterator[dict[str, Any]]:
+        """Run the query on the backend and iterate over the results lazily from
+        the cursor, see `EntryCollection._iter_db_query`."""
+        criteria, find_criteria, first_page = self._prepare_db_query(criteria, False)
+        # Without pagination, e.g., for JSON Lines downloads, all matches are counted
+        # while iterating
+        count: Future | None = None
+        if criteria.get("limit") or criteria.get("skip"):
+            count = submit_query(
+                self._count_matches,
+                self._count_criteria(criteria),
+                first_page=first_page,
+            )
+
+        # Stop at the extra entry requested to probe for more data
+        probe_limit = criteria.get("limit") if criteria.get("probe") else None
+        nresults = 0
+        with self.collection.find(**find_criteria) as cursor:
+            for doc in cursor:
+                nresults += 1
+                if probe_limit and nresults > probe_limit:
+                    break
+                yield self._stringify_cursor_id(doc, criteria)
+
+        data_returned = count.result() if count is not None else nresults
+        summary["more_data_available"] = self._more_data_available(
+            nresults, criteria, data_returned
+        )
+        summary["data_returned"] = self._at_least_found(
+            data_returned, criteria, nresults
+        )
+
+    def _run_ids_query(self, ids: list[str], fields: set[str]) -> list[dict[str, Any]]:
+        """Look up the entries with the given IDs with a single `$in` query."""
+        find_criteria = self._ids_find_criteria(ids, fields)
+        with timed("query"):
+            results = list(self.collection.find(**find_criteria))
+        return self._stringify_ids(results, find_criteria)
+
+    def _count_matches(
+        self, criteria: dict[str, Any], first_page: bool = True
+    ) -> int | None:
+        """Returns the number of entries matching the query criteria according to
+        the configured `count_mode`, reusing cached counts for the same filter in
+        all modes but `exact`.
+
+        Parameters:
+            criteria: The query criteria, without `limit` and `skip`.
+            first_page: Whether the criteria are for the first page of results.
+
+        Returns:
+            The (possibly estimated) number of matching entries, or `None` if it is
+            not known (yet).
+
+        """
+        key, data_returned, count_mode = self._plan_count(criteria, first_page)
+        if count_mode == "background":
+            self._count_in_background(key, criteria)
+        elif count_mode is not None:
+            with timed("count"):
+                if count_mode == "estimate":
+                    data_returned = self._estimate_count(criteria)
+                else:
+                    data_returned = self.count(**criteria)
+            if data_returned is not None and count_mode != "exact":
+                self._count_cache.put(key, data_returned)
+        return data_returned
+
+    def _estimate_count(self, criteria: dict[str, Any]) -> int | None:
+        """Estimates the number of entries matching the filter of the query criteria
+        from the fraction of matches in a random sample of the collection.
+
+        """
+        total = self.data_available
+        if not criteria.get("filter") or total <= CONFIG.count_estimate_sample_size:
+            return self.count(**criteria)
+        sampled = list(
+            self.collection.aggregate(
+                [
+                    {"$sample": {"size": CONFIG.count_estimate_sample_size}},
+                    {"$match": criteria["filter"]},
+                    {"$count": "matches"},
+                ]
+            )
+        )
+        matches = sampled[0]["matches"] if sampled else 0
+        return round(total * matches / CONFIG.count_estimate_sample_size)
+
+    def _count_in_background(self, key: str, criteria: dict[str, Any]) -> None:
+        """Submits a count for the query criteria to the background executor,
+        unless one is already running, and caches its result once it is done.
+
+        """
+
+        def _count_and_store(generation: int) -> None:
+            try:
+                data_returned = self.count(**criteria)
+            except Exception as exc:
+                LOGGER.warning("Background count failed: %r", exc)
+                data_returned = None
+            with self._count_lock:
+                self._pending_counts.pop(key, None)
+                # Discard counts started before data was inserted
+                if data_returned is not None and generation == self._count_generation:
+                    self._count_cache.put(key, data_returned)
+
+        with self._count_lock:
+            if key not in self._pending_counts:
+                self._pending_counts[key] = _count_executor().submit(
+                    _count_and_store, self._count_generation
+                )
+
+
+class _AsyncMongomockCursor:
+    """Asynchronous wrapper of a mongomock cursor."""
+
+    def __init__(self, cursor: Any):
+        self._cursor = cursor
+
+    async def to_list(self, length: int | None = None) -> list[dict[str, Any]]:
+        return list(itertools.islice(self._cursor, length))
+
+    async def __aiter__(self) -> AsyncIterator[dict[str, Any]]:
+        for doc in self._cursor:
+            yield doc
+
+
+class _AsyncMongomockCollection:
+    """Asynchronous wrapper of the parts of a mongomock collection used by
+    [`AsyncMongoCollection`][optimade.server.entry_collections.mongo.AsyncMongoCollection]."""
+
+    def __init__(self, collection: Any):
+        self.collection = collection
+
+    def find(self, *args: Any, **kwargs: Any) -> _AsyncMongomockCursor:
+        return _AsyncMongomockCursor(self.collection.find(*args, **kwargs))
+
+    async def aggregate(self, *args: Any, **kwargs: Any) -> _AsyncMongomockCursor:
+        return _AsyncMongomockCursor(self.collection.aggregate(*args, **kwargs))
+
+    async def count_documents(self, *args: Any, **kwargs: Any) -> int:
+        return self.collection.count_documents(*args, **kwargs)
+
+    async def estimated_document_count(self, *args: Any, **kwargs: Any) -> int:
+        return self.collection.estimated_document_count(*args, **kwargs)
+
+
+class AsyncMongomockClient:
+    """An in-memory stand-in for `pymongo.AsyncMongoClient`, backed by a (synchronous)
+    mongomock client, such that the asynchronous database path can be used and tested
+    without a MongoDB server.
+
+    Only the subset of the client API used by
+    [`AsyncMongoCollection`][optimade.server.entry_collections.mongo.AsyncMongoCollection]
+    is implemented.
+
+    """
+
+    def __init__(self, client: Any):
+        self.client = client
+
+    def __getitem__(self, database: str) -> "_AsyncMongomockDatabase":
+        return _AsyncMongomockDatabase(self.client[database])
+
+
+class _AsyncMongomockDatabase:
+    def __init__(self, database: Any):
+        self.database = database
+
+    def __getitem__(self, name: str) -> _AsyncMongomockCollection:
+        return _AsyncMongomockCollection(self.database[name])
+
+
+def _async_client() -> Any:
+    """Returns the asynchronous client shared by all
+    [`AsyncMongoCollection`][optimade.server.entry_collections.mongo.AsyncMongoCollection]s,
+    creating it on first use.
+
+    """
+    global ASYNC_CLIENT
+    if ASYNC_CLIENT is None:
+        if CONFIG.database_backend.value == "mongomock":
+            ASYNC_CLIENT = AsyncMongomockClient(CLIENT)
+        else:
+            try:
+                from pymongo import AsyncMongoClient
+            except ImportError:
+                try:
+                    from motor.motor_asyncio import (
+                        AsyncIOMotorClient as AsyncMongoClient,
+                    )
+                except ImportError as exc:
+                    raise RuntimeError(
+                        "The asynchronous database path requires pymongo>=4.9 or motor."
+                    ) from exc
+            ASYNC_CLIENT = AsyncMongoClient(CONFIG.mongo_uri)
+    return ASYNC_CLIENT
+
+
+class AsyncMongoCollection(_MongoCollectionBase, AsyncEntryCollection):
+    """Class for querying MongoDB collections through an asynchronous client
+    (`pymongo.AsyncMongoClient`, `motor`, or an
+    [`AsyncMongomockClient`][optimade.server.entry_collections.mongo.AsyncMongomockClient]
+    for mongomock).
+
+    Queries behave as for [`MongoCollection`][optimade.server.entry_collections.mongo.MongoCollection],
+    but are awaited by the routes instead of blocking a thread. Inserting data and creating
+    indexes still use the synchronous client.
+
+    """
+
+    def __init__(
+        self,
+        name: str,
+        resource_cls: type[EntryResource],
+        resource_mapper: type[BaseResourceMapper],
+        database: str = CONFIG.mongo_database,
+    ):
+        """Initialize the AsyncMongoCollection for the given parameters.
+
+        Parameters:
+            name: The name of the collection.
+            resource_cls: The type of entry resource that is stored by the collection.
+            resource_mapper: A resource mapper object that handles aliases and
+                format changes between deserialization and response.
+            database: The name of the underlying MongoDB database to connect to.
+
+        """
+        super().__init__(name, resource_cls, resource_mapper, database=database)
+        self.async_collection = _async_client()[database][name]
+
+    async def length(self) -> int:
+        """Returns the total number of entries in the collection."""
+        return await self.async_collection.estimated_document_count()
+
+    async def count(self, **kwargs: Any) -> int | None:
+        """Returns the number of entries matching the query specified
+        by the keyword arguments, or `None` if the count timed out.
+
+        Parameters:
+            **kwargs: Query parameters as keyword arguments. The keys
+                'filter', 'skip', 'limit', 'hint' and 'maxTimeMS' will be passed
+                to the `count_documents` method of the asynchronous collection.
+
+        """
+        for k in list(kwargs.keys()):
+            if k not in ("filter", "skip", "limit", "hint", "maxTimeMS"):
+                del kwargs[k]
+        if "filter" not in kwargs:
+            return await self.async_collection.estimated_document_count()
+        else:
+            if "maxTimeMS" not in kwargs:
+                kwargs["maxTimeMS"] = 1000 * CONFIG.mongo_count_timeout
+            try:
+                return await self.async_collection.count_documents(**kwargs)
+            except ExecutionTimeout:
+                return None
+
+    async def _run_db_query(
+        self, criteria: dict[str, Any], single_entry: bool = False
+    ) -> tuple[list[dict[str, Any]], int | None, bool]:
+        """Run the query on the backend and collect the results.
+
+        Arguments:
+            criteria: A dictionary representation of the query parameters.
+            single_entry: Whether or not the caller is expecting a single entry response.
+
+        Returns:
+            The list of entries from the database (without any re-mapping), the total number of
+            entries matching the query and a boolean for whether or not there is more data available.
+
+        """
+        criteria, find_criteria, first_page = self._prepare_db_query(
+            criteria, single_entry
+        )
+
+        async def find() -> list[dict[str, Any]]:
+            with timed("query"):
+                return await self.async_collection.find(**find_criteria).to_list(None)
+
+        data_returned = None
+        if single_entry:
+            results = await find()
+        else:
+            results, data_returned = await asyncio.gather(
+                find(),
+                self._count_matches(
+                    self._count_criteria(criteria), first_page=first_page
+                ),
+            )
+
+        return self._collect_results(results, criteria, data_returned, single_entry)
+
+    async def _iter_db_query(
+        self, criteria: dict[str, Any], summary: dict[str, Any]
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Asynchronous version of `MongoCollection._iter_db_query`."""
+        criteria, find_criteria, first_page = self._prepare_db_query(criteria, False)
+        count: asyncio.Future | None = None
+        if criteria.get("limit") or criteria.get("skip"):
+            count = asyncio.ensure_future(
+                self._count_matches(
+                    self._count_criteria(criteria), first_page=first_page
+                )
+            )
+
+        probe_limit = criteria.get("limit") if criteria.get("probe") else None
+        nresults = 0
+        try:
+            async for doc in self.async_collection.find(**find_criteria):
+                nresults += 1
+                if probe_limit and nresults > probe_limit:
+                    break
+                yield self._stringify_cursor_id(doc, criteria)
+        except BaseException:
+            if count is not None:
+                count.cancel()
+            raise
+
+        data_returned = await count if count is not None else nresults
+        summary["more_data_available"] = self._more_data_available(
+            nresults, criteria, data_returned
+        )
+        summary["data_returned"] = self._at_least_found(
+            data_returned, criteria, nresults
+        )
+
+    async def _run_ids_query(
+        self, ids: list[str], fields: set[str]
+    ) -> list[dict[str, Any]]:
+        """Asynchronous version of `MongoCollection._run_ids_query`."""
+        find_criteria = self._ids_find_criteria(ids, fields)
+        with timed("query"):
+            results = await self.async_collection.find(**find_criteria).to_list(None)
+        return self._stringify_ids(results, find_criteria)
+
+    async def _count_matches(
+        self, criteria: dict[str, Any], first_page: bool = True
+    ) -> int | None:
+        """Asynchronous version of `MongoCollection._count_matches`."""
+        key, data_returned, count_mode = self._plan_count(criteria, first_page)
+        if count_mode == "background":
+            self._count_in_background(key, criteria)
+        elif count_mode is not None:
+            with timed("count"):
+                if count_mode == "estimate":
+                    data_returned = await self._estimate_count(criteria)
+                else:
+                    data_returned = await self.count(**criteria)
+            if data_returned is not None and count_mode != "exact":
+                self._count_cache.put(key, data_returned)
+        return data_returned
+
+    async def _estimate_count(self, criteria: dict[str, Any]) -> int | None:
+        """Asynchronous version of `MongoCollection._estimate_count`."""
+        total = await self.data_available_async()
+        if not criteria.get("filter") or total <= CONFIG.count_estimate_sample_size:
+            return await self.count(**criteria)
+        cursor = self.async_collection.aggregate(
+            [
+                {"$sample": {"size": CONFIG.count_estimate_sample_size}},
+                {"$match": criteria["filter"]},
+                {"$count": "matches"},
+            ]
+        )
+        if asyncio.iscoroutine(cursor):
+            # `pymongo.AsyncCollection.aggregate` is a coroutine, unlike in `motor`
+            cursor = await cursor
+        sampled = await cursor.to_list(None)
+        matches = sampled[0]["matches"] if sampled else 0
+        return round(total * matches / CONFIG.count_estimate_sample_size)
+
+    def _count_in_background(self, key: str, criteria: dict[str, Any]) -> None:
+        """Starts a task on the running event loop to count the entries matching the
+        query criteria, unless one is already running, and caches its result once
+        it is done.
+
+        """
+
+        async def _count_and_store(generation: int) -> None:
+            try:
+                data_returned = await self.count(**criteria)
+            except Exception as exc:
+                LOGGER.warning("Background count failed: %r", exc)
+                data_returned = None
+            with self._count_lock:
+                self._pending_counts.pop(key, None)
+                # Discard counts started before data was inserted
+                if data_returned is not None and generation == self._count_generation:
+                    self._count_cache.put(key, data_returned)
+
+        with self._count_lock:
+            if key not in self._pending_counts:
+                self._pending_counts[key] = asyncio.get_running_loop().create_task(
+                    _count_and_store(self._count_generation)
+                )
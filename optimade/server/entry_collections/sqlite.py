@@ -0,0 +1,384 @@
+"""An embedded database backend storing the entries in [SQLite](https://www.sqlite.org/),
+which is part of the Python standard library, such that the server runs fully
+locally without any database server.
+
+Each collection is stored in two tables: `<name>`, with one row per entry holding
+its ID and JSON document, and `<name>_values`, a normalized table with one row
+per (nested) value of every entry, which filters compiled by the
+[`SQLTransformer`][optimade.filtertransformers.sql.SQLTransformer] are run against.
+
+"""
+
+import json
+import sqlite3
+import threading
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from optimade.filtertransformers.sql import SQLQuery, SQLTransformer, sql_timestamp
+from optimade.models import EntryResource
+from optimade.server.config import CONFIG
+from optimade.server.entry_collections import EntryCollection, PaginationMechanism
+from optimade.server.entry_collections.entry_collections import timed
+from optimade.server.mappers import BaseResourceMapper
+
+__all__ = ("SQLiteCollection",)
+
+
+def _quote(identifier: str) -> str:
+    """Quote an SQL identifier."""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    return str(value)
+
+
+def _object_hook(obj: dict[str, Any]) -> Any:
+    if len(obj) == 1 and "$date" in obj:
+        return datetime.fromisoformat(obj["$date"])
+    return obj
+
+
+def _loads(document: str) -> dict[str, Any]:
+    # Only documents with timestamps need the (slower) object hook
+    if '"$date"' in document:
+        return json.loads(document, object_hook=_object_hook)
+    return json.loads(document)
+
+
+def _values(
+    value: Any, field: str = "", position: int | None = None
+) -> Iterator[tuple[str, int | None, str, float | None, str | None]]:
+    """Flatten a document into the rows `(field, position, kind, number, text)`
+    of the values table.
+
+    As for MongoDB, the values in a list of objects are stored under the field of
+    the list, e.g., `species.name`, such that they can be queried as a list.
+    Lists directly in lists are not flattened any further.
+
+    """
+    if value is None:
+        return
+    if isinstance(value, dict):
+        if field:
+            yield field, position, "object", None, None
+        for key, item in value.items():
+            yield from _values(item, f"{field}.{key}" if field else key, position)
+    elif isinstance(value, list):
+        yield field, position, "array", len(value), None
+        for ind, item in enumerate(value):
+            if isinstance(item, list):
+                yield field, ind if position is None else position, "object", None, None
+            else:
+                yield from _values(item, field, ind if position is None else position)
+    elif isinstance(value, bool):
+        yield field, position, "bool", int(value), None
+    elif isinstance(value, int | float):
+        yield field, position, "number", value, None
+    elif isinstance(value, str):
+        yield field, position, "string", None, value
+    elif isinstance(value, datetime):
+        yield field, position, "date", None, sql_timestamp(value)
+    else:
+        yield field, position, "object", None, None
+
+
+class SQLiteCollection(EntryCollection):
+    """Collection of [`EntryResource`][optimade.models.entries.EntryResource]s
+    stored in an SQLite database.
+
+    Only offset-based pagination is supported.
+
+    """
+
+    pagination_mechanism = PaginationMechanism("page_offset")
+    page_above_supported = False
+
+    def __init__(
+        self,
+        name: str,
+        resource_cls: type[EntryResource],
+        resource_mapper: type[BaseResourceMapper],
+        database: str | Path | None = None,
+    ):
+        """Initialize the SQLiteCollection for the given parameters, creating its
+        tables if they do not exist yet.
+
+        Parameters:
+            name: The name of the collection.
+            resource_cls: The type of entry resource that is stored by the collection.
+            resource_mapper: A resource mapper object that handles aliases and
+                format changes between deserialization and response.
+            database: The SQLite database file, by default the `sqlite_database`
+                of the configuration.
+
+        """
+        self.name = name
+        self._entries_table = _quote(name)
+        self._values_table = _quote(f"{name}_values")
+        super().__init__(
+            resource_cls=resource_cls,
+            resource_mapper=resource_mapper,
+            transformer=SQLTransformer(
+                mapper=resource_mapper, values_table=self._values_table
+            ),
+        )
+
+        database = CONFIG.sqlite_database if database is None else database
+        self._connection = sqlite3.connect(str(database), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {self._entries_table} "
+                "(entry INTEGER PRIMARY KEY, id TEXT, document TEXT NOT NULL)"
+            )
+            # Clustered by field, such that all values of a field are read together
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {self._values_table} "
+                "(field TEXT NOT NULL, entry INTEGER NOT NULL, seq INTEGER NOT NULL, "
+                "position INTEGER, kind TEXT NOT NULL, number REAL, text TEXT, "
+                "PRIMARY KEY (field, entry, seq)) WITHOUT ROWID"
+            )
+
+    def _execute(self, sql: str, params: Iterable[Any] = ()) -> list[tuple]:
+        with self._lock:
+            return self._connection.execute(sql, list(params)).fetchall()
+
+    def __len__(self) -> int:
+        """Returns the total number of entries in the collection."""
+        return self._execute(f"SELECT COUNT(*) FROM {self._entries_table}")[0][0]
+
+    def insert(self, data: list[EntryResource | dict]) -> None:
+        """Add the given entries to the collection.
+
+        Entries with the ID of an existing entry are skipped once the unique index
+        on the ID has been created by `create_default_index`.
+
+        Warning:
+            No validation is performed on the incoming data, this data
+            should have been mapped to the appropriate format before
+            insertion.
+
+        Arguments:
+            data: The entries to add to the collection.
+
+        """
+        id_field = self.resource_mapper.get_backend_field("id")
+        data = self._with_length_fields(data)
+        with self._lock, self._connection:
+            for document in data:
+                document = dict(document)
+                cursor = self._connection.execute(
+                    f"INSERT OR IGNORE INTO {self._entries_table} (id, document) VALUES (?, ?)",
+                    (
+                        document.get(id_field),
+                        json.dumps(document, default=_json_default),
+                    ),
+                )
+                if not cursor.rowcount:
+                    continue
+                self._connection.executemany(
+                    f"INSERT INTO {self._values_table} "
+                    "(entry, seq, field, position, kind, number, text) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        (cursor.lastrowid, seq, *row)
+                        for seq, row in enumerate(_values(document))
+                    ),
+                )
+        self._data_available_cache.invalidate()
+
+    def count(self, **kwargs: Any) -> int | None:
+        """Returns the number of entries matching the query specified
+        by the keyword arguments.
+
+        Parameters:
+            **kwargs: Query parameters as keyword arguments. The keys
+                'filter', 'skip' and 'limit' are used as for MongoDB.
+
+        """
+        where, params = self._where(kwargs.get("filter"))
+        nresults = self._execute(
+            f"SELECT COUNT(*) FROM {self._entries_table} AS entries WHERE {where}",
+            params,
+        )[0][0]
+        nresults = max(nresults - kwargs.get("skip", 0), 0)
+        if kwargs.get("limit"):
+            nresults = min(nresults, kwargs["limit"])
+        return nresults
+
+    def create_index(self, field: str, unique: bool = False) -> None:
+        """Create an index on the values of the given field, as stored in the
+        collection.
+
+        Arguments:
+            field: The field to index (i.e., if different from the OPTIMADE field,
+                the mapper should be used to convert between the two).
+            unique: Not used, the values table holds several values per entry.
+
+        """
+        # Partial indexes cannot be parameterized, so the field is quoted as a literal
+        literal = "'" + field.replace("'", "''") + "'"
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {_quote(f'{self.name}_values_{field}')} "
+                f"ON {self._values_table} (kind, number, text, entry) "
+                f"WHERE field = {literal}"
+            )
+
+    def create_default_index(self) -> None:
+        """Create the default indexes of the collection: a unique index on the IDs
+        of the entries, and indexes on the numbers and strings of every field.
+
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS {_quote(f'{self.name}_id')} "
+                f"ON {self._entries_table} (id)"
+            )
+            for column in ("number", "text"):
+                self._connection.execute(
+                    "CREATE INDEX IF NOT EXISTS "
+                    f"{_quote(f'{self.name}_values_{column}')} "
+                    f"ON {self._values_table} (field, kind, {column}, entry)"
+                )
+
+    @staticmethod
+    def _where(filter_: SQLQuery | None) -> tuple[str, list[Any]]:
+        if not filter_:
+            return "1", []
+        return filter_.sql, filter_.params
+
+    def _order_by(self, sort_spec: Iterable[tuple[str, int]]) -> tuple[str, list[Any]]:
+        """Return the `ORDER BY` clause for the sort specification.
+
+        As for MongoDB, entries are sorted by the lowest value of a list in
+        ascending order and by its highest value in descending order, and entries
+        with an unknown value come first in ascending order. Ties are broken by
+        insertion order.
+
+        """
+        keys, params = [], []
+        for field, direction in sort_spec:
+            keys.append(
+                f"(SELECT {'MIN' if direction == 1 else 'MAX'}(COALESCE(number, text)) "
+                f"FROM {self._values_table} WHERE field = ? AND entry = entries.entry "
+                "AND kind NOT IN ('array', 'object')) "
+                f"{'ASC' if direction == 1 else 'DESC'}"
+            )
+            params.append(field)
+        keys.append("entries.entry")
+        return ", ".join(keys), params
+
+    @staticmethod
+    def _project(
+        documents: Iterable[str], projection: Iterable[str] | None
+    ) -> list[dict[str, Any]]:
+        """Decode the documents, with only the top-level fields of the projection."""
+        top_level = (
+            None
+            if projection is None
+            else {field.split(".")[0] for field in projection}
+        )
+        results = []
+        for document in documents:
+            result = _loads(document)
+            if top_level is not None:
+                result = {
+                    key: value for key, value in result.items() if key in top_level
+                }
+            results.append(result)
+        return results
+
+    def _run_db_query(
+        self, criteria: dict[str, Any], single_entry: bool = False
+    ) -> tuple[list[dict[str, Any]], int | None, bool]:
+        """Run the query on the SQLite database and collect the results.
+
+        Arguments:
+            criteria: A dictionary representation of the query parameters.
+            single_entry: Whether or not the caller is expecting a single entry response.
+
+        Returns:
+            The list of entries from the collection (without any re-mapping), the total number of
+            entries matching the query and a boolean for whether or not there is more data available.
+
+        """
+        where, params = self._where(criteria.get("filter"))
+        skip = criteria.get("skip", 0)
+        limit = criteria.get("limit", 0)
+
+        with timed("query"):
+            rows = self._execute(*self._select(criteria))
+            results = self._project(
+                (row[0] for row in rows), criteria.get("projection")
+            )
+
+        if single_entry:
+            # SingleEntryQueryParams, e.g., /structures/{entry_id}
+            return results, len(results), False
+
+        with timed("count"):
+            data_returned = self._execute(
+                f"SELECT COUNT(*) FROM {self._entries_table} AS entries WHERE {where}",
+                params,
+            )[0][0]
+        more_data_available = bool(limit) and skip + len(results) < data_returned
+        return results, data_returned, more_data_available
+
+    def _select(self, criteria: dict[str, Any]) -> tuple[str, list[Any]]:
+        """Build the statement selecting the requested page of documents.
+
+        Returns:
+            The SQL statement and its parameters.
+
+        """
+        where, params = self._where(criteria.get("filter"))
+        order_by, order_params = self._order_by(criteria.get("sort") or ())
+        return (
+            f"SELECT document FROM {self._entries_table} AS entries "
+            f"WHERE {where} ORDER BY {order_by} LIMIT ? OFFSET ?",
+            [
+                *params,
+                *order_params,
+                criteria.get("limit", 0) or -1,
+                criteria.get("skip", 0),
+            ],
+        )
+
+    def explain(self, criteria: dict[str, Any]) -> list[dict[str, Any]]:
+        """Return the plan of SQLite for selecting the requested page of
+        documents, as given by `EXPLAIN QUERY PLAN`.
+
+        Arguments:
+            criteria: A dictionary representation of the query parameters.
+
+        Returns:
+            The steps of the query plan.
+
+        """
+        sql, params = self._select(criteria)
+        return [
+            {"id": id_, "parent": parent, "detail": detail}
+            for id_, parent, _, detail in self._execute(
+                f"EXPLAIN QUERY PLAN {sql}", params
+            )
+        ]
+
+    def _run_ids_query(self, ids: list[str], fields: set[str]) -> list[dict[str, Any]]:
+        """Look up the entries with the given IDs in the entries table."""
+        with timed("query"):
+            rows = self._execute(
+                f"SELECT document FROM {self._entries_table} "
+                f"WHERE id IN ({', '.join('?' * len(ids))}) ORDER BY entry",
+                ids,
+            )
+            return self._project(
+                (row[0] for row in rows),
+                [self.resource_mapper.get_backend_field(field) for field in fields],
+            )
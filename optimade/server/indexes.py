@@ -0,0 +1,421 @@
+"""Index management for the MongoDB backend.
+
+The [`IndexAdvisor`][optimade.server.indexes.IndexAdvisor] of a collection derives
+a set of candidate indexes from the schema of its entry type, and records the
+fields and operators of the filters that are actually run, to recommend compound
+indexes for the most common queries.
+The resulting index plan can be printed with the `optimade-index-plan` command.
+
+"""
+
+import re
+import threading
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from optimade.models import DataType
+from optimade.models.utils import SupportLevel
+from optimade.server.mappers import BaseResourceMapper
+
+__all__ = ("IndexAdvisor", "IndexSpec", "is_list_field", "query_operators")
+
+EQUALITY_OPERATORS = ("$eq", "$in", "$all")
+"""The MongoDB operators that select values equal to the given values."""
+
+RANGE_OPERATORS = ("$gt", "$gte", "$lt", "$lte")
+"""The MongoDB operators that select a range of values."""
+
+_POSITION = re.compile(r"\.\d+(?=\.|$)")
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    """The specification of a (compound) index.
+
+    Attributes:
+        keys: The indexed backend fields, with their direction (1 or -1), or the
+            type of a special index, e.g., `"text"` or `"hashed"`, for the existing
+            indexes of the database.
+        unique: Whether the index is unique.
+        multikey: Whether any of the fields is a list, such that there is an index
+            key for every element of the list.
+        reason: Why the index is planned.
+        queries: The number of recorded queries that the index was recommended for.
+
+    """
+
+    keys: tuple[tuple[str, int | str], ...]
+    unique: bool = False
+    multikey: bool = field(default=False, compare=False)
+    reason: str = field(default="", compare=False)
+    queries: int = field(default=0, compare=False)
+
+    @property
+    def name(self) -> str:
+        """The default MongoDB name of the index, e.g., `nelements_1_id_1`."""
+        return "_".join(f"{key}_{direction}" for key, direction in self.keys)
+
+    def covers(self, other: "IndexSpec") -> bool:
+        """Whether this index can serve every query that `other` can, i.e., whether
+        the keys of `other` are a prefix of its keys."""
+        return self.keys[: len(other.keys)] == other.keys and (
+            self.unique or not other.unique
+        )
+
+    def __str__(self) -> str:
+        flags = [flag for flag in ("unique", "multikey") if getattr(self, flag)]
+        return self.name + (f" ({', '.join(flags)})" if flags else "")
+
+
+def is_list_field(
+    resource_mapper: type[BaseResourceMapper], backend_field: str
+) -> bool:
+    """Whether a backend field is (in) a list, according to the schema of the
+    entry type of the mapper."""
+    if backend_field.startswith("relationships."):
+        return True
+    optimade_field = resource_mapper.get_optimade_field(backend_field)
+    properties = resource_mapper.ENTRY_RESOURCE_ATTRIBUTES
+    parts = optimade_field.split(".")
+    return any(
+        properties.get(".".join(parts[:ind]), {}).get("type") == DataType.LIST
+        for ind in range(1, len(parts) + 1)
+    )
+
+
+def query_operators(query: dict[str, Any]) -> Iterator[tuple[str, str]]:
+    """Iterate over the pairs of backend field and operator in a MongoDB query,
+    e.g., `("nelements", "$lt")`.
+
+    Positions in fields, e.g., `elements.3` as used for `LENGTH` filters, are
+    removed, and comparisons to a plain value are reported as `$eq`.
+
+    """
+    for key, value in query.items():
+        if key in ("$and", "$or", "$nor"):
+            for subquery in value:
+                yield from query_operators(subquery)
+        elif not key.startswith("$"):
+            field_ = _POSITION.sub("", key)
+            if (
+                isinstance(value, dict)
+                and value
+                and all(operator.startswith("$") for operator in value)
+            ):
+                for operator in value:
+                    yield field_, operator
+            else:
+                yield field_, "$eq"
+
+
+class _QueryShape:
+    """The fields compared for equality and for ranges in (a branch of) a query."""
+
+    def __init__(self) -> None:
+        self.equality: set[str] = set()
+        self.range: set[str] = set()
+
+    def add(self, query: dict[str, Any], branches: list["_QueryShape"]) -> None:
+        for key, value in query.items():
+            if key == "$and":
+                for subquery in value:
+                    self.add(subquery, branches)
+            elif key == "$or":
+                # Every branch of an `$or` is planned as a separate query
+                for subquery in value:
+                    branch = _QueryShape()
+                    branch.add(subquery, branches)
+                    branches.append(branch)
+            elif not key.startswith("$"):
+                self._add_field(_POSITION.sub("", key), value)
+
+    def _add_field(self, field_: str, value: Any) -> None:
+        if not (isinstance(value, dict) and value):
+            self.equality.add(field_)
+            return
+        for operator, operand in value.items():
+            if operator in EQUALITY_OPERATORS:
+                self.equality.add(field_)
+            elif operator in RANGE_OPERATORS or (
+                # Anchored regular expressions, i.e., `STARTS WITH`, scan a range
+                operator == "$regex" and str(operand).startswith("^")
+            ):
+                self.range.add(field_)
+
+    def merged(self, other: "_QueryShape") -> "_QueryShape":
+        shape = _QueryShape()
+        shape.equality = self.equality | other.equality
+        shape.range = self.range | other.range
+        return shape
+
+    def key(
+        self, sort: Iterable[tuple[str, int]]
+    ) -> tuple[tuple[str, ...], tuple[tuple[str, int], ...], tuple[str, ...]]:
+        return (
+            tuple(sorted(self.equality)),
+            tuple(sort),
+            tuple(sorted(self.range - self.equality)),
+        )
+
+
+class IndexAdvisor:
+    """Derives the candidate indexes of a collection from its schema, and records
+    the queries run on the collection to recommend compound indexes for them.
+
+    Attributes:
+        resource_mapper: The mapper of the collection.
+        max_shapes: The maximum number of distinct query shapes to record.
+        operators: The number of times each pair of backend field and operator was
+            seen in a filter.
+
+    """
+
+    def __init__(
+        self, resource_mapper: type[BaseResourceMapper], max_shapes: int = 1000
+    ):
+        self.resource_mapper = resource_mapper
+        self.max_shapes = max_shapes
+        self.operators: Counter[tuple[str, str]] = Counter()
+        self._shapes: Counter[tuple] = Counter()
+        self._lock = threading.Lock()
+
+    def _is_list(self, backend_field: str) -> bool:
+        """Whether the field is (in) a list, according to the schema."""
+        return is_list_field(self.resource_mapper, backend_field)
+
+    def _index(
+        self, fields: Iterable[tuple[str, int]], reason: str, queries: int = 0
+    ) -> IndexSpec:
+        keys: list[tuple[str, int]] = []
+        multikey = False
+        for key in fields:
+            if key[0] in (existing for existing, _ in keys):
+                continue
+            if self._is_list(key[0]):
+                # MongoDB cannot index more than one list field in a compound index
+                if multikey:
+                    continue
+                multikey = True
+            keys.append(key)
+        return IndexSpec(tuple(keys), multikey=multikey, reason=reason, queries=queries)
+
+    def candidate_indexes(self) -> list[IndexSpec]:
+        """Derive the candidate indexes of the collection from its schema:
+
+        - a unique index on the ID of the entries;
+        - an index on every property that must be queryable, which is a multikey
+            index for lists, e.g., `elements`, and is followed by the ID for sortable
+            properties, as used for value-based pagination;
+        - an index on the fields holding the length of lists (`LENGTH_ALIASES`),
+            e.g., `nelements` and `nsites`, for range queries.
+
+        """
+        mapper = self.resource_mapper
+        id_field = mapper.get_backend_field("id")
+        indexes = [IndexSpec(((id_field, 1),), unique=True, reason="unique entry IDs")]
+
+        for name, prop in mapper.ENTRY_RESOURCE_ATTRIBUTES.items():
+            if (
+                name == "id"
+                or prop.get("queryable") != SupportLevel.MUST
+                or prop.get("type") == DataType.DICTIONARY
+            ):
+                continue
+            backend_field = mapper.get_backend_field(name)
+            if prop.get("type") != DataType.LIST and prop.get("sortable"):
+                indexes.append(
+                    self._index(
+                        ((backend_field, 1), (id_field, 1)),
+                        f"queryable and sortable property {name!r}",
+                    )
+                )
+            else:
+                indexes.append(
+                    self._index(((backend_field, 1),), f"queryable property {name!r}")
+                )
+
+        for list_field, length_field in mapper.all_length_aliases():
+            indexes.append(
+                self._index(
+                    ((mapper.get_backend_field(length_field), 1),),
+                    f"LENGTH of {list_field!r}",
+                )
+            )
+
+        return _deduplicate(indexes)
+
+    def record(
+        self, filter_: dict[str, Any] | None, sort: Iterable[tuple[str, int]] | None
+    ) -> None:
+        """Record the fields and operators of a (transformed) MongoDB filter, and
+        its sort fields."""
+        filter_ = filter_ or {}
+        sort = tuple(sort or ())
+        shape = _QueryShape()
+        branches: list[_QueryShape] = []
+        shape.add(filter_, branches)
+        shapes = [shape.merged(branch) for branch in branches] or [shape]
+
+        with self._lock:
+            self.operators.update(query_operators(filter_))
+            for shape in shapes:
+                key = shape.key(sort)
+                if not any(key) or (
+                    key not in self._shapes and len(self._shapes) >= self.max_shapes
+                ):
+                    continue
+                self._shapes[key] += 1
+
+    def recommended_indexes(self, min_queries: int = 1) -> list[IndexSpec]:
+        """Recommend an index for every recorded query shape that was seen at least
+        `min_queries` times, following the equality-sort-range rule: fields compared
+        for equality come first, followed by the sort fields and the fields compared
+        with ranges.
+
+        The indexes are ordered by the number of queries they were recommended for.
+
+        """
+        with self._lock:
+            shapes = self._shapes.most_common()
+        indexes = []
+        for (equality, sort, range_), count in shapes:
+            if count < min_queries:
+                continue
+            indexes.append(
+                self._index(
+                    [(field_, 1) for field_ in equality]
+                    + list(sort)
+                    + [(field_, 1) for field_ in range_],
+                    "recorded queries",
+                    queries=count,
+                )
+            )
+        return _deduplicate(indexes)
+
+    def plan(
+        self, existing: Iterable[IndexSpec], min_queries: int = 1
+    ) -> list[tuple[IndexSpec, bool]]:
+        """Combine the candidate and recommended indexes into an index plan.
+
+        Parameters:
+            existing: The indexes that already exist in the database.
+            min_queries: The minimum number of recorded queries for an index to be
+                recommended.
+
+        Returns:
+            The planned indexes, each with whether it is covered by an existing index.
+
+        """
+        existing = list(existing)
+        return [
+            (index, any(other.covers(index) for other in existing))
+            for index in _deduplicate(
+                self.candidate_indexes() + self.recommended_indexes(min_queries)
+            )
+        ]
+
+
+def _deduplicate(indexes: list[IndexSpec]) -> list[IndexSpec]:
+    """Remove the indexes covered by another index, keeping the order."""
+    result: list[IndexSpec] = []
+    for ind, index in enumerate(indexes):
+        if any(
+            other.covers(index) and (other.keys != index.keys or other_ind < ind)
+            for other_ind, other in enumerate(indexes)
+            if other_ind != ind
+        ):
+            continue
+        result.append(index)
+    return result
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Print the index plan of the entry collections of the configured server."""
+    import argparse
+    import json
+
+    from optimade.server.entry_collections.mongo import (
+        AsyncMongoCollection,
+        MongoCollection,
+    )
+    from optimade.server.query_params import EntryListingQueryParams
+    from optimade.server.routers import ENTRY_COLLECTIONS
+
+    parser = argparse.ArgumentParser(
+        prog="optimade-index-plan",
+        description=(
+            "Print the index plan of the MongoDB collections of the OPTIMADE server, "
+            "as configured by the OPTIMADE_CONFIG_FILE, derived from the schema "
+            "of each entry type and from the given example queries."
+        ),
+    )
+    parser.add_argument(
+        "--entry-type",
+        action="append",
+        choices=sorted(ENTRY_COLLECTIONS),
+        help="An entry type to plan the indexes for (default: all).",
+    )
+    parser.add_argument(
+        "--filter",
+        action="append",
+        default=[],
+        help="An example filter to recommend an index for, can be given several times.",
+    )
+    parser.add_argument(
+        "--sort",
+        default=None,
+        help=(
+            "The sort of the example filters; pass a descending sort with an equals "
+            "sign, e.g., `--sort=-nsites`."
+        ),
+    )
+    parser.add_argument(
+        "--create",
+        action="store_true",
+        help="Create the missing indexes of the plan.",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the plan as JSON.")
+    args = parser.parse_args(argv)
+
+    plans: dict[str, list[dict[str, Any]]] = {}
+    for entry_type in args.entry_type or sorted(ENTRY_COLLECTIONS):
+        collection = ENTRY_COLLECTIONS[entry_type]
+        if not isinstance(collection, MongoCollection | AsyncMongoCollection):
+            parser.exit(
+                1,
+                f"Index plans are only supported for MongoDB, not for {type(collection).__name__}.\n",
+            )
+        for filter_ in args.filter:
+            collection.handle_query_params(
+                EntryListingQueryParams(filter=filter_, sort=args.sort)
+            )
+        plan = collection.index_plan()
+        if args.create:
+            collection.create_indexes([index for index, exists in plan if not exists])
+        plans[entry_type] = [
+            {
+                "keys": [list(key) for key in index.keys],
+                "unique": index.unique,
+                "multikey": index.multikey,
+                "reason": index.reason,
+                "queries": index.queries,
+                "exists": exists or args.create,
+            }
+            for index, exists in plan
+        ]
+
+        if not args.json:
+            print(f"{entry_type}:")
+            for index, exists in plan:
+                status = "exists" if exists else "created" if args.create else "missing"
+                queries = (
+                    f", {index.queries} {'query' if index.queries == 1 else 'queries'}"
+                    if index.queries
+                    else ""
+                )
+                print(f"  [{status}] {index}: {index.reason}{queries}")
+
+    if args.json:
+        print(json.dumps(plans, indent=2))
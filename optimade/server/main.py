@@ -15,12 +15,16 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 with warnings.catch_warnings(record=True) as w:
-    from optimade.server.config import CONFIG, DEFAULT_CONFIG_FILE_PATH
+    from optimade.server.config import (
+        CONFIG,
+        DEFAULT_CONFIG_FILE_PATH,
+        SupportedBackend,
+    )
 
     config_warnings = w
 
 from optimade import __api_version__, __version__
-from optimade.server.entry_collections import EntryCollection
+from optimade.server.entry_collections import BaseEntryCollection
 from optimade.server.exception_handlers import OPTIMADE_EXCEPTIONS
 from optimade.server.logger import LOGGER
 from optimade.server.middleware import OPTIMADE_MIDDLEWARE
@@ -32,7 +36,7 @@ from optimade.server.routers import (
     structures,
     versions,
 )
-from optimade.server.routers.utils import BASE_URL_PREFIXES, JSONAPIResponse
+from optimade.server.routers.utils import BASE_URL_PREFIXES, json_response_class
 
 if config_warnings:
     LOGGER.warn(
@@ -72,13 +76,16 @@ This specification is generated using [`optimade-python-tools`](https://github.c
     docs_url=f"{BASE_URL_PREFIXES['major']}/extensions/docs",
     redoc_url=f"{BASE_URL_PREFIXES['major']}/extensions/redoc",
     openapi_url=f"{BASE_URL_PREFIXES['major']}/extensions/openapi.json",
-    default_response_class=JSONAPIResponse,
+    default_response_class=json_response_class(),
     separate_input_output_schemas=False,
     lifespan=lifespan,
 )
 
 
-if CONFIG.insert_test_data or CONFIG.insert_from_jsonl:
+# The JSONL backend serves its file as-is, so no data is inserted
+if (
+    CONFIG.insert_test_data or CONFIG.insert_from_jsonl
+) and CONFIG.database_backend is not SupportedBackend.JSONL:
     from optimade.utils import insert_from_jsonl
 
     def _insert_test_data(endpoint: str | None = None):
@@ -89,7 +96,7 @@ if CONFIG.insert_test_data or CONFIG.insert_from_jsonl:
         from optimade.server.routers import ENTRY_COLLECTIONS
         from optimade.server.routers.utils import get_providers
 
-        def load_entries(endpoint_name: str, endpoint_collection: EntryCollection):
+        def load_entries(endpoint_name: str, endpoint_collection: BaseEntryCollection):
             LOGGER.debug("Loading test %s...", endpoint_name)
 
             endpoint_collection.insert(getattr(data, endpoint_name, []))
@@ -123,7 +130,13 @@ if CONFIG.insert_test_data or CONFIG.insert_from_jsonl:
                 f"Requested JSONL file does not exist: {jsonl_path}. Please specify an absolute group."
             )
 
-        insert_from_jsonl(jsonl_path, create_default_index=CONFIG.create_default_index)
+        insert_from_jsonl(
+            jsonl_path,
+            create_default_index=CONFIG.create_default_index,
+            batch_size=CONFIG.insert_batch_size,
+            decode_processes=CONFIG.insert_decode_processes,
+            insert_workers=CONFIG.insert_workers,
+        )
 
         LOGGER.debug("Inserted data from JSONL file: %s", jsonl_path)
         if CONFIG.insert_test_data:
@@ -142,14 +155,21 @@ for middleware in OPTIMADE_MIDDLEWARE:
 for exception, handler in OPTIMADE_EXCEPTIONS:
     app.add_exception_handler(exception, handler)
 
+# The endpoints served under every base URL
+ENDPOINTS: tuple = (info, links, references, structures, landing)
+if CONFIG.explain_endpoint:
+    from optimade.server.routers import explain
+
+    ENDPOINTS += (explain,)
+
 # Add various endpoints to unversioned URL
-for endpoint in (info, links, references, structures, landing, versions):
+for endpoint in (*ENDPOINTS, versions):
     app.include_router(endpoint.router)
 
 
 def add_major_version_base_url(app: FastAPI):
     """Add mandatory vMajor endpoints, i.e. all except versions."""
-    for endpoint in (info, links, references, structures, landing):
+    for endpoint in ENDPOINTS:
         app.include_router(endpoint.router, prefix=BASE_URL_PREFIXES["major"])
 
 
@@ -161,5 +181,5 @@ def add_optional_versioned_base_urls(app: FastAPI):
     ```
     """
     for version in ("minor", "patch"):
-        for endpoint in (info, links, references, structures, landing):
+        for endpoint in ENDPOINTS:
             app.include_router(endpoint.router, prefix=BASE_URL_PREFIXES[version])
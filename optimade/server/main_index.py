@@ -24,7 +24,7 @@ from optimade.server.exception_handlers import OPTIMADE_EXCEPTIONS
 from optimade.server.logger import LOGGER
 from optimade.server.middleware import OPTIMADE_MIDDLEWARE
 from optimade.server.routers import index_info, links, versions
-from optimade.server.routers.utils import BASE_URL_PREFIXES, JSONAPIResponse
+from optimade.server.routers.utils import BASE_URL_PREFIXES, json_response_class
 
 if config_warnings:
     LOGGER.warn(
@@ -67,7 +67,7 @@ This specification is generated using [`optimade-python-tools`](https://github.c
     docs_url=f"{BASE_URL_PREFIXES['major']}/extensions/docs",
     redoc_url=f"{BASE_URL_PREFIXES['major']}/extensions/redoc",
     openapi_url=f"{BASE_URL_PREFIXES['major']}/extensions/openapi.json",
-    default_response_class=JSONAPIResponse,
+    default_response_class=json_response_class(),
     separate_input_output_schemas=False,
     lifespan=lifespan,
 )
@@ -101,7 +101,7 @@ if CONFIG.insert_test_data and CONFIG.index_links_path.exists():
         )
         providers = get_providers(add_mongo_id=True)
         for doc in providers:
-            links_coll.collection.replace_one(  # type: ignore[attr-defined]
+            links_coll.collection.replace_one(  # type: ignore[union-attr]
                 filter={"_id": ObjectId(doc["_id"]["$oid"])},
                 replacement=bson.json_util.loads(bson.json_util.dumps(doc)),
                 upsert=True,
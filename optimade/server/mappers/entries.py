@@ -4,6 +4,7 @@ from functools import lru_cache
 from typing import Any
 
 from optimade.models.entries import EntryResource
+from optimade.models.optimade_json import DataType
 
 # A number that approximately tracks the number of types with mappers
 # so that the global caches can be set to the correct size.
@@ -182,10 +183,61 @@ class BaseResourceMapper:
         """
         from optimade.server.config import CONFIG
 
-        return cls.LENGTH_ALIASES + tuple(
-            CONFIG.length_aliases.get(cls.ENDPOINT, {}).items()
+        return (
+            cls.LENGTH_ALIASES
+            + tuple(CONFIG.length_aliases.get(cls.ENDPOINT, {}).items())
+            + cls.length_fields()
+        )
+
+    @classmethod
+    @lru_cache(maxsize=NUM_ENTRY_TYPES)
+    def length_fields(cls) -> tuple[tuple[str, str], ...]:
+        """Returns the length aliases of the fields that are materialized at ingest
+        if `materialize_length_fields` is set in the server config, i.e.,
+        `(field, "n<field>")` for every list property of the entry resource class
+        that has no other length alias.
+
+        Returns:
+            A tuple of length alias tuples.
+
+        """
+        from optimade.server.config import CONFIG
+
+        if not CONFIG.materialize_length_fields:
+            return ()
+
+        aliased = {
+            field
+            for field, _ in cls.LENGTH_ALIASES
+            + tuple(CONFIG.length_aliases.get(cls.ENDPOINT, {}).items())
+        }
+        return tuple(
+            (field, f"n{field}")
+            for field, definition in cls.ENTRY_RESOURCE_ATTRIBUTES.items()
+            if definition.get("type") == DataType.LIST
+            and field not in aliased
+            and cls.get_backend_field(field) not in aliased
         )
 
+    @classmethod
+    def add_length_fields(cls, doc: dict) -> dict:
+        """Add the length of the list properties of a document in the backend
+        format to the fields given by
+        [`length_fields()`][optimade.server.mappers.entries.BaseResourceMapper.length_fields].
+
+        Parameters:
+            doc: A resource object in the backend format, modified in place.
+
+        Returns:
+            The same resource object.
+
+        """
+        for field, length_field in cls.length_fields():
+            value = doc.get(cls.get_backend_field(field))
+            if isinstance(value, list):
+                doc[cls.get_backend_field(length_field)] = len(value)
+        return doc
+
     @classmethod
     @lru_cache(maxsize=128)
     def length_alias_for(cls, field: str) -> str | None:
@@ -320,6 +372,26 @@ class BaseResourceMapper:
         """
         return cls.TOP_LEVEL_NON_ATTRIBUTES_FIELDS
 
+    @classmethod
+    @lru_cache(maxsize=NUM_ENTRY_TYPES)
+    def _map_back_plan(
+        cls,
+    ) -> tuple[frozenset[str], tuple[tuple[str, str], ...], frozenset[str]]:
+        """Compile the aliases of this entry type into the plan used by
+        [`map_back`][optimade.server.mappers.entries.BaseResourceMapper.map_back].
+
+        Returns:
+            The set of backend fields that are renamed, the (backend field, OPTIMADE field)
+            renames in order of precedence, and the top-level (non-attribute) fields.
+
+        """
+        aliases = tuple(cls.all_aliases())
+        return (
+            frozenset(real for _, real in aliases),
+            tuple((real, alias) for alias, real in aliases),
+            frozenset(cls.TOP_LEVEL_NON_ATTRIBUTES_FIELDS),
+        )
+
     @classmethod
     def map_back(cls, doc: dict) -> dict:
         """Map properties from MongoDB to OPTIMADE.
@@ -337,32 +409,51 @@ class BaseResourceMapper:
             A resource object in OPTIMADE format.
 
         """
-        mapping = ((real, alias) for alias, real in cls.all_aliases())
-        newdoc = {}
-        reals = {real for _, real in cls.all_aliases()}
-        for key in doc:
-            if key not in reals:
-                newdoc[key] = doc[key]
-        for real, alias in mapping:
-            if real in doc:
-                newdoc[alias] = doc[real]
-
-        if "attributes" in newdoc:
-            raise Exception("Will overwrite doc field!")
-        attributes = newdoc.copy()
-
-        for field in cls.TOP_LEVEL_NON_ATTRIBUTES_FIELDS:
-            value = attributes.pop(field, None)
-            if value is not None:
-                newdoc[field] = value
-        for field in list(newdoc.keys()):
-            if field not in cls.TOP_LEVEL_NON_ATTRIBUTES_FIELDS:
-                del newdoc[field]
-
-        newdoc["type"] = cls.ENDPOINT
-        newdoc["attributes"] = attributes
-
-        return newdoc
+        return cls._map_back_docs((doc,))[0]
+
+    @classmethod
+    def map_back_many(cls, docs: Iterable[dict]) -> list[dict]:
+        """Map a page of documents from MongoDB to OPTIMADE in one pass, see
+        [`map_back`][optimade.server.mappers.entries.BaseResourceMapper.map_back].
+
+        Subclasses that override `map_back` have it called for each document instead.
+
+        Parameters:
+            docs: Resource objects in MongoDB format.
+
+        Returns:
+            The resource objects in OPTIMADE format.
+
+        """
+        if cls.map_back.__func__ is not BaseResourceMapper.map_back.__func__:  # type: ignore[attr-defined]
+            return [cls.map_back(doc) for doc in docs]
+        return cls._map_back_docs(docs)
+
+    @classmethod
+    def _map_back_docs(cls, docs: Iterable[dict]) -> list[dict]:
+        reals, renames, top_level_fields = cls._map_back_plan()
+        endpoint = cls.ENDPOINT
+
+        results = []
+        for doc in docs:
+            attributes = {key: value for key, value in doc.items() if key not in reals}
+            for real, alias in renames:
+                if real in doc:
+                    attributes[alias] = doc[real]
+
+            if "attributes" in attributes:
+                raise Exception("Will overwrite doc field!")
+
+            newdoc = {
+                field: attributes.pop(field)
+                for field in top_level_fields
+                if field in attributes
+            }
+            newdoc["type"] = endpoint
+            newdoc["attributes"] = attributes
+            results.append(newdoc)
+
+        return results
 
     @classmethod
     def deserialize(
@@ -375,4 +466,4 @@ class BaseResourceMapper:
         if isinstance(results, dict):
             return cls.ENTRY_RESOURCE_CLASS(**cls.map_back(results))
 
-        return [cls.ENTRY_RESOURCE_CLASS(**cls.map_back(doc)) for doc in results]
+        return [cls.ENTRY_RESOURCE_CLASS(**doc) for doc in cls.map_back_many(results)]
@@ -4,6 +4,10 @@ Custom ASGI app middleware.
 These middleware are based on [Starlette](https://www.starlette.io)'s `BaseHTTPMiddleware`.
 See the specific Starlette [documentation page](https://www.starlette.io/middleware/) for more
 information on it's middleware implementation.
+
+Each of them also has a pure ASGI counterpart with the same semantics, collected in
+[`OPTIMADE_ASGI_MIDDLEWARE`][optimade.server.middleware.OPTIMADE_ASGI_MIDDLEWARE], which
+avoids the extra task and response body stream that `BaseHTTPMiddleware` adds per request.
 """
 
 import json
@@ -14,14 +18,21 @@ from collections.abc import Generator, Iterable
 from typing import TextIO
 
 from starlette.datastructures import URL as StarletteURL
+from starlette.datastructures import MutableHeaders
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import RedirectResponse, StreamingResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from optimade.exceptions import BadRequest, VersionNotSupported
 from optimade.models import Warnings
 from optimade.server.config import CONFIG
-from optimade.server.routers.utils import BASE_URL_PREFIXES, get_base_url
+from optimade.server.routers.utils import (
+    BASE_URL_PREFIXES,
+    RESPONSE_WARNINGS,
+    ResponseWarnings,
+    get_base_url,
+)
 from optimade.warnings import (
     FieldValueNotRecognized,
     LocalOptimadeWarning,
@@ -216,11 +227,26 @@ class HandleApiHint(BaseHTTPMiddleware):
         base_url = get_base_url(url)
         return bool(re.findall(r"(/v[0-9]+(\.[0-9]+){0,2})", url[len(base_url) :]))
 
-    async def dispatch(self, request: Request, call_next):
+    @classmethod
+    def get_redirect_response(cls, request: Request) -> RedirectResponse | None:
+        """Handle the `api_hint` query parameter of the request, if any.
+
+        Parameters:
+            request: The incoming request.
+
+        Raises:
+            VersionNotSupported: If the requested major version is newer than the
+                supported major version of the implementation.
+
+        Returns:
+            A redirect to the versioned base URL deduced from the `api_hint`
+            query parameter, or `None` if the request should be handled as is.
+
+        """
         parsed_query = urllib.parse.parse_qs(request.url.query, keep_blank_values=True)
 
         if "api_hint" in parsed_query:
-            if self.is_versioned_base_url(str(request.url)):
+            if cls.is_versioned_base_url(str(request.url)):
                 warnings.warn(
                     QueryParamNotUsed(
                         detail=(
@@ -236,7 +262,7 @@ class HandleApiHint(BaseHTTPMiddleware):
             else:
                 from optimade.server.routers.utils import get_base_url
 
-                version_path = self.handle_api_hint(parsed_query["api_hint"])
+                version_path = cls.handle_api_hint(parsed_query["api_hint"])
 
                 if version_path:
                     base_url = get_base_url(request.url)
@@ -265,52 +291,39 @@ class HandleApiHint(BaseHTTPMiddleware):
                     # scope["path"] = path
                     # request = Request(scope=scope, receive=request.receive, send=request._send)
 
-        response = await call_next(request)
-        return response
+        return None
 
+    async def dispatch(self, request: Request, call_next):
+        redirect = self.get_redirect_response(request)
+        if redirect is not None:
+            return redirect
 
-class AddWarnings(BaseHTTPMiddleware):
-    """
-    Add [`OptimadeWarning`][optimade.warnings.OptimadeWarning]s to the response.
-
-    All sub-classes of [`OptimadeWarning`][optimade.warnings.OptimadeWarning]
-    will also be added to the response's
-    [`meta.warnings`][optimade.models.optimade_json.ResponseMeta.warnings] list.
-
-    By overriding the `warnings.showwarning()` function with the
-    [`showwarning` method][optimade.server.middleware.AddWarnings.showwarning],
-    all usages of `warnings.warn()` will result in the regular printing of the
-    warning message to `stderr`, but also its addition to an in-memory list of
-    warnings.
-    This middleware will, after the URL request has been handled, add the list of
-    accumulated warnings to the JSON response under the
-    [`meta.warnings`][optimade.models.optimade_json.ResponseMeta.warnings] field.
-
-    To make sure the last part happens correctly and a Starlette `StreamingResponse`
-    is returned, as is expected from a `BaseHTTPMiddleware` sub-class, one is
-    instantiated with the updated `Content-Length` header, as well as making sure
-    the response's body content is actually streamable, by breaking it down into
-    chunks of the original response's chunk size.
-
-    !!! warning "Important"
-        It is **recommended** to add this middleware as the _last one_ to your application.
+        response = await call_next(request)
+        return response
 
-        This is to ensure it is invoked _first_, updating `warnings.showwarning()` and
-        catching all warnings that should be added to the response.
 
-        This can be achieved by applying `AddWarnings` _after_ all
-        other middleware with the `.add_middleware()` method, or by
-        initialising the app with a middleware list in which `AddWarnings`
-        appears _first_. More information can be found in the docstring of
-        [`OPTIMADE_MIDDLEWARE`][optimade.server.middleware.OPTIMADE_MIDDLEWARE].
+class _WarningsCollector:
+    """Mixin collecting the [`OptimadeWarning`][optimade.warnings.OptimadeWarning]s
+    emitted while handling a request, shared by
+    [`AddWarnings`][optimade.server.middleware.AddWarnings] and
+    [`AddWarningsASGI`][optimade.server.middleware.AddWarningsASGI].
 
     Attributes:
         _warnings (List[Warnings]): List of [`Warnings`][optimade.models.optimade_json.Warnings]
-            added through usages of `warnings.warn()` via [`showwarning`][optimade.server.middleware.AddWarnings.showwarning].
+            added through usages of `warnings.warn()` via [`showwarning`][optimade.server.middleware.AddWarnings.showwarning]
+            for the current request.
 
     """
 
-    _warnings: list[Warnings]
+    @property
+    def _warnings(self) -> ResponseWarnings:
+        collected_warnings = RESPONSE_WARNINGS.get()
+        # Outside of a request, warnings are only shown, not collected
+        return ResponseWarnings() if collected_warnings is None else collected_warnings
+
+    @_warnings.setter
+    def _warnings(self, value: list[dict]) -> None:
+        RESPONSE_WARNINGS.set(ResponseWarnings(value))
 
     def showwarning(
         self,
@@ -402,7 +415,7 @@ class AddWarnings(BaseHTTPMiddleware):
         else:
             new_warning = Warnings(title=title, detail=detail)
 
-        # Add new warning to self._warnings
+        # Add new warning to the warnings of the current request
         self._warnings.append(new_warning.model_dump(exclude_unset=True))
 
         # Show warning message as normal in sys.stderr
@@ -410,6 +423,46 @@ class AddWarnings(BaseHTTPMiddleware):
             warnings.WarningMessage(message, category, filename, lineno, file, line)
         )
 
+
+class AddWarnings(_WarningsCollector, BaseHTTPMiddleware):
+    """
+    Add [`OptimadeWarning`][optimade.warnings.OptimadeWarning]s to the response.
+
+    All sub-classes of [`OptimadeWarning`][optimade.warnings.OptimadeWarning]
+    will also be added to the response's
+    [`meta.warnings`][optimade.models.optimade_json.ResponseMeta.warnings] list.
+
+    By overriding the `warnings.showwarning()` function with the
+    [`showwarning` method][optimade.server.middleware.AddWarnings.showwarning],
+    all usages of `warnings.warn()` will result in the regular printing of the
+    warning message to `stderr`, but also its addition to a request-scoped list of
+    warnings, held in the
+    [`RESPONSE_WARNINGS`][optimade.server.routers.utils.RESPONSE_WARNINGS] context variable.
+    The accumulated warnings are written into the response's `meta` when it is
+    created by [`meta_values`][optimade.server.routers.utils.meta_values], i.e.,
+    before serialization, such that the response can be passed through untouched.
+
+    Streamed responses (see `CONFIG.stream_responses`), which write `meta` after
+    all other content, are always passed through.
+    Otherwise, only if a warning is emitted _after_ `meta` was created, the response body is
+    read, the warnings are added, and a Starlette `StreamingResponse` is returned
+    with the updated `Content-Length` header, breaking the body back down into
+    chunks of the original response's chunk size.
+
+    !!! warning "Important"
+        It is **recommended** to add this middleware as the _last one_ to your application.
+
+        This is to ensure it is invoked _first_, updating `warnings.showwarning()` and
+        catching all warnings that should be added to the response.
+
+        This can be achieved by applying `AddWarnings` _after_ all
+        other middleware with the `.add_middleware()` method, or by
+        initialising the app with a middleware list in which `AddWarnings`
+        appears _first_. More information can be found in the docstring of
+        [`OPTIMADE_MIDDLEWARE`][optimade.server.middleware.OPTIMADE_MIDDLEWARE].
+
+    """
+
     @staticmethod
     def chunk_it_up(content: str | bytes, chunk_size: int) -> Generator:
         """Return generator for string in chunks of size `chunk_size`.
@@ -427,37 +480,50 @@ class AddWarnings(BaseHTTPMiddleware):
         return (content[i : chunk_size + i] for i in range(0, len(content), chunk_size))
 
     async def dispatch(self, request: Request, call_next):
-        self._warnings = []
+        collected_warnings = ResponseWarnings()
+        token = RESPONSE_WARNINGS.set(collected_warnings)
+        try:
+            warnings.simplefilter(action="default", category=OptimadeWarning)
+            warnings.showwarning = self.showwarning
 
-        warnings.simplefilter(action="default", category=OptimadeWarning)
-        warnings.showwarning = self.showwarning
+            response = await call_next(request)
+        finally:
+            RESPONSE_WARNINGS.reset(token)
 
-        response = await call_next(request)
+        if (
+            collected_warnings.streamed
+            or len(collected_warnings) <= collected_warnings.reported
+        ):
+            return response
 
+        # Some warnings were emitted after the response `meta` was created
         status = response.status_code
         headers = response.headers
         media_type = response.media_type
         background = response.background
         charset = response.charset
 
-        body = b""
+        chunks = []
         chunk_size = 0
         async for chunk in response.body_iterator:
             chunk_size = chunk_size or len(chunk)
             if not isinstance(chunk, bytes):
                 chunk = chunk.encode(charset)
-            body += chunk
-        body_str = body.decode(charset)
+            chunks.append(chunk)
+        body = b"".join(chunks)
 
-        if self._warnings:
-            response = json.loads(body_str)
-            response.get("meta", {})["warnings"] = self._warnings
-            body_str = json.dumps(response)
+        try:
+            content = json.loads(body)
+        except ValueError:
+            content = None
+        if isinstance(content, dict) and isinstance(content.get("meta"), dict):
+            content["meta"]["warnings"] = list(collected_warnings)
+            body = json.dumps(content).encode(charset)
             if "content-length" in headers:
-                headers["content-length"] = str(len(body_str))
+                headers["content-length"] = str(len(body))
 
         response = StreamingResponse(
-            content=self.chunk_it_up(body_str, chunk_size),
+            content=self.chunk_it_up(body, chunk_size),
             status_code=status,
             headers=headers,
             media_type=media_type,
@@ -512,3 +578,145 @@ app = FastAPI(
 ```
 
 """
+
+
+class _ASGIMiddleware:
+    """Base class for the pure ASGI versions of the OPTIMADE middleware.
+
+    Only HTTP requests are handled by the `handle` method, all other
+    ASGI scopes are passed through to the wrapped application.
+
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        await self.handle(scope, receive, send)
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.app(scope, receive, send)
+
+
+class EnsureQueryParamIntegrityASGI(_ASGIMiddleware):
+    """Pure ASGI version of
+    [`EnsureQueryParamIntegrity`][optimade.server.middleware.EnsureQueryParamIntegrity]."""
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        url_query = scope.get("query_string", b"").decode("latin-1")
+        if url_query:
+            EnsureQueryParamIntegrity.check_url(url_query)
+        await self.app(scope, receive, send)
+
+
+class CheckWronglyVersionedBaseUrlsASGI(_ASGIMiddleware):
+    """Pure ASGI version of
+    [`CheckWronglyVersionedBaseUrls`][optimade.server.middleware.CheckWronglyVersionedBaseUrls]."""
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        url = Request(scope).url
+        if url.path:
+            CheckWronglyVersionedBaseUrls.check_url(url)
+        await self.app(scope, receive, send)
+
+
+class HandleApiHintASGI(_ASGIMiddleware):
+    """Pure ASGI version of
+    [`HandleApiHint`][optimade.server.middleware.HandleApiHint]."""
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        redirect = HandleApiHint.get_redirect_response(Request(scope, receive))
+        if redirect is not None:
+            await redirect(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+
+class AddWarningsASGI(_WarningsCollector, _ASGIMiddleware):
+    """Pure ASGI version of
+    [`AddWarnings`][optimade.server.middleware.AddWarnings].
+
+    The response messages are passed on as they are sent by the application,
+    unless a warning was emitted after the response `meta` was created,
+    in which case the response body is collected to add the warnings to it.
+    Streamed responses are always passed on as they are sent.
+
+    """
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        collected_warnings = ResponseWarnings()
+        token = RESPONSE_WARNINGS.set(collected_warnings)
+
+        start_message: Message | None = None
+        buffering = False
+        chunks: list[bytes] = []
+
+        async def send_with_warnings(message: Message) -> None:
+            nonlocal start_message, buffering
+
+            if message["type"] == "http.response.start":
+                # The body has been rendered at this point, so any warnings
+                # that should be added to it have been emitted, unless it is streamed
+                buffering = (
+                    not collected_warnings.streamed
+                    and len(collected_warnings) > collected_warnings.reported
+                )
+                if not buffering:
+                    await send(message)
+                    return
+                start_message = message
+                return
+
+            if not buffering or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            try:
+                content = json.loads(body)
+            except ValueError:
+                content = None
+            if isinstance(content, dict) and isinstance(content.get("meta"), dict):
+                content["meta"]["warnings"] = list(collected_warnings)
+                body = json.dumps(content).encode("utf-8")
+                headers = MutableHeaders(scope=start_message)
+                if "content-length" in headers:
+                    headers["content-length"] = str(len(body))
+
+            await send(start_message)  # type: ignore[arg-type]
+            await send({"type": "http.response.body", "body": body})
+
+        try:
+            warnings.simplefilter(action="default", category=OptimadeWarning)
+            warnings.showwarning = self.showwarning
+
+            await self.app(scope, receive, send_with_warnings)
+        finally:
+            RESPONSE_WARNINGS.reset(token)
+
+
+OPTIMADE_ASGI_MIDDLEWARE: Iterable[type[_ASGIMiddleware]] = (
+    EnsureQueryParamIntegrityASGI,
+    CheckWronglyVersionedBaseUrlsASGI,
+    HandleApiHintASGI,
+    AddWarningsASGI,
+)
+"""A drop-in alternative to
+[`OPTIMADE_MIDDLEWARE`][optimade.server.middleware.OPTIMADE_MIDDLEWARE]
+made up of pure ASGI middleware, with the same semantics and order.
+
+```python
+from fastapi import FastAPI
+app = FastAPI()
+for middleware in OPTIMADE_ASGI_MIDDLEWARE:
+    app.add_middleware(middleware)
+```
+
+"""
@@ -0,0 +1,168 @@
+"""The `/extensions/explain` endpoint, served if `explain_endpoint` is set in the
+server config, to find out why a given filter is slow.
+
+For an entry listing query, it returns the parse tree of the filter, the query
+passed to the backend, the query plan of the database and the time spent in each
+phase of handling the query.
+
+"""
+
+import json
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+
+from optimade.exceptions import BadRequest
+from optimade.server.entry_collections import AsyncEntryCollection, EntryCollection
+from optimade.server.entry_collections.entry_collections import (
+    record_query_timings,
+    timed,
+)
+from optimade.server.query_params import EntryListingQueryParams
+from optimade.server.routers.utils import (
+    _data_available,
+    _data_available_async,
+    _dumps,
+    _entries_response,
+)
+from optimade.server.schemas import ERROR_RESPONSES
+
+try:
+    from bson import json_util
+except ImportError:
+    json_util = None
+
+router = APIRouter(redirect_slashes=True)
+
+
+@router.get(
+    "/extensions/explain",
+    tags=["Extensions"],
+    response_class=JSONResponse,
+    responses=ERROR_RESPONSES,
+)
+async def get_explain(
+    request: Request,
+    params: Annotated[EntryListingQueryParams, Depends()],
+    entry_type: Annotated[
+        str,
+        Query(description="The entry type to explain the query for."),
+    ] = "structures",
+) -> JSONResponse:
+    """Explain and profile an entry listing query, see
+    [`explain_query`][optimade.server.routers.explain.explain_query]."""
+    from optimade.server.routers import ENTRY_COLLECTIONS
+
+    if entry_type not in ENTRY_COLLECTIONS:
+        raise BadRequest(
+            detail=f"Unknown entry type {entry_type!r}, expected one of {sorted(ENTRY_COLLECTIONS)}."
+        )
+
+    return JSONResponse(
+        await explain_query(ENTRY_COLLECTIONS[entry_type], request, params)
+    )
+
+
+async def explain_query(
+    collection: EntryCollection | AsyncEntryCollection,
+    request: Request,
+    params: EntryListingQueryParams,
+) -> dict[str, Any]:
+    """Run an entry listing query as the entry listing endpoints do, recording the
+    duration of each phase, and collect how the query was run by the backend.
+
+    The recorded phases are `parse` and `transform` (the filter is always parsed
+    and transformed again, regardless of the filter cache), `query` and `count`
+    (as recorded by the backend), `data_available`, `map_back` (mapping the
+    results back to OPTIMADE entries) and `serialize` (building, validating and
+    serializing the response).
+    The query plan of the backend
+    (see [`explain`][optimade.server.entry_collections.entry_collections.EntryCollection.explain])
+    is retrieved after the query has been run, so as not to warm up its caches.
+
+    Parameters:
+        collection: The collection to query.
+        request: The incoming request.
+        params: The query parameters of the entry listing.
+
+    Returns:
+        The explanation of the query, with the durations in milliseconds.
+
+    """
+    with record_query_timings() as timings:
+        tree = None
+        with timed("parse"):
+            if params.filter:
+                tree = collection.parser.parse(params.filter)
+        with timed("transform"):
+            if tree is not None:
+                collection.transformer.transform(tree)
+
+        criteria = collection.handle_query_params(params)
+        response_fields = criteria.pop("fields")
+
+        if isinstance(collection, AsyncEntryCollection):
+            (
+                raw_results,
+                data_returned,
+                more_data_available,
+            ) = await collection._run_db_query(criteria)
+            data_available = await _data_available_async(collection)
+        else:
+            raw_results, data_returned, more_data_available = await run_in_threadpool(
+                collection._run_db_query, criteria
+            )
+            data_available = await run_in_threadpool(_data_available, collection)
+
+        with timed("map_back"):
+            found = collection._process_results(
+                raw_results,
+                data_returned,
+                more_data_available,
+                response_fields,
+                False,
+            )
+        with timed("serialize"):
+            _dumps(
+                _entries_response(
+                    collection, request, params, found, [], data_available, timings
+                )
+            )
+
+    plan = await run_in_threadpool(collection.explain, criteria)
+
+    return _jsonable(
+        {
+            "filter": params.filter,
+            "sort": params.sort,
+            "page_limit": params.page_limit,
+            "parse_tree": tree.pretty() if tree is not None else None,
+            "query": criteria,
+            "plan": plan,
+            "data_returned": data_returned,
+            "timings": {
+                phase: round(1000 * duration, 3) for phase, duration in timings.items()
+            },
+        }
+    )
+
+
+def _jsonable(content: Any) -> Any:
+    """Convert the query and the query plan to JSON, with BSON types in MongoDB
+    extended JSON and the queries of other backends in their own format."""
+
+    def default(value: Any) -> Any:
+        if hasattr(value, "to_dict"):
+            return value.to_dict()
+        if isinstance(value, set):
+            return sorted(value)
+        if json_util is not None:
+            try:
+                return json_util.default(value)
+            except TypeError:
+                pass
+        return repr(value)
+
+    return json.loads(json.dumps(content, default=default))
@@ -40,9 +40,12 @@ def get_info(request: Request) -> InfoResponse:
                         "version": __api_version__,
                     }
                 ],
-                formats=["json"],
+                formats=["json", "jsonl"],
                 available_endpoints=["info", "links"] + list(ENTRY_INFO_SCHEMAS.keys()),
-                entry_types_by_format={"json": list(ENTRY_INFO_SCHEMAS.keys())},
+                entry_types_by_format={
+                    "json": list(ENTRY_INFO_SCHEMAS.keys()),
+                    "jsonl": list(ENTRY_INFO_SCHEMAS.keys()),
+                },
                 is_index=False,
             ),
         )
@@ -88,7 +91,7 @@ def get_entry_info(request: Request, entry: str) -> EntryInfoResponse:
             schema, queryable_properties, entry_type=entry
         )
 
-        output_fields_by_format = {"json": list(properties)}
+        output_fields_by_format = {"json": list(properties), "jsonl": list(properties)}
 
         return EntryInfoResource(
             formats=list(output_fields_by_format),
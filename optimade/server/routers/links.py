@@ -1,13 +1,13 @@
 from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Request, Response
 
 from optimade.models import LinksResource, LinksResponse
 from optimade.server.config import CONFIG
 from optimade.server.entry_collections import create_collection
 from optimade.server.mappers import LinksMapper
 from optimade.server.query_params import EntryListingQueryParams
-from optimade.server.routers.utils import get_entries
+from optimade.server.routers.utils import get_entries_async, response_model
 from optimade.server.schemas import ERROR_RESPONSES
 
 router = APIRouter(redirect_slashes=True)
@@ -21,12 +21,14 @@ links_coll = create_collection(
 
 @router.get(
     "/links",
-    response_model=LinksResponse if CONFIG.validate_api_response else dict,
+    response_model=response_model(LinksResponse),
     response_model_exclude_unset=True,
     tags=["Links"],
     responses=ERROR_RESPONSES,
 )
-def get_links(
+async def get_links(
     request: Request, params: Annotated[EntryListingQueryParams, Depends()]
-) -> dict[str, Any]:
-    return get_entries(collection=links_coll, request=request, params=params)
+) -> dict[str, Any] | Response:
+    return await get_entries_async(
+        collection=links_coll, request=request, params=params
+    )
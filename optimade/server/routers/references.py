@@ -1,6 +1,6 @@
 from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Request, Response
 
 from optimade.models import (
     ReferenceResource,
@@ -11,7 +11,11 @@ from optimade.server.config import CONFIG
 from optimade.server.entry_collections import create_collection
 from optimade.server.mappers import ReferenceMapper
 from optimade.server.query_params import EntryListingQueryParams, SingleEntryQueryParams
-from optimade.server.routers.utils import get_entries, get_single_entry
+from optimade.server.routers.utils import (
+    get_entries_async,
+    get_single_entry_async,
+    response_model,
+)
 from optimade.server.schemas import ERROR_RESPONSES
 
 router = APIRouter(redirect_slashes=True)
@@ -25,17 +29,15 @@ references_coll = create_collection(
 
 @router.get(
     "/references",
-    response_model=ReferenceResponseMany
-    if CONFIG.validate_api_response
-    else dict[str, Any],
+    response_model=response_model(ReferenceResponseMany),
     response_model_exclude_unset=True,
     tags=["References"],
     responses=ERROR_RESPONSES,
 )
-def get_references(
+async def get_references(
     request: Request, params: Annotated[EntryListingQueryParams, Depends()]
-) -> dict[str, Any]:
-    return get_entries(
+) -> dict[str, Any] | Response:
+    return await get_entries_async(
         collection=references_coll,
         request=request,
         params=params,
@@ -44,19 +46,17 @@ def get_references(
 
 @router.get(
     "/references/{entry_id:path}",
-    response_model=ReferenceResponseOne
-    if CONFIG.validate_api_response
-    else dict[str, Any],
+    response_model=response_model(ReferenceResponseOne),
     response_model_exclude_unset=True,
     tags=["References"],
     responses=ERROR_RESPONSES,
 )
-def get_single_reference(
+async def get_single_reference(
     request: Request,
     entry_id: str,
     params: Annotated[SingleEntryQueryParams, Depends()],
-) -> dict[str, Any]:
-    return get_single_entry(
+) -> dict[str, Any] | Response:
+    return await get_single_entry_async(
         collection=references_coll,
         entry_id=entry_id,
         request=request,
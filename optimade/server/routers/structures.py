@@ -1,6 +1,6 @@
 from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Request, Response
 
 from optimade.models import (
     StructureResource,
@@ -11,7 +11,11 @@ from optimade.server.config import CONFIG
 from optimade.server.entry_collections import create_collection
 from optimade.server.mappers import StructureMapper
 from optimade.server.query_params import EntryListingQueryParams, SingleEntryQueryParams
-from optimade.server.routers.utils import get_entries, get_single_entry
+from optimade.server.routers.utils import (
+    get_entries_async,
+    get_single_entry_async,
+    response_model,
+)
 from optimade.server.schemas import ERROR_RESPONSES
 
 router = APIRouter(redirect_slashes=True)
@@ -25,17 +29,15 @@ structures_coll = create_collection(
 
 @router.get(
     "/structures",
-    response_model=StructureResponseMany
-    if CONFIG.validate_api_response
-    else dict[str, Any],
+    response_model=response_model(StructureResponseMany),
     response_model_exclude_unset=True,
     tags=["Structures"],
     responses=ERROR_RESPONSES,
 )
-def get_structures(
+async def get_structures(
     request: Request, params: Annotated[EntryListingQueryParams, Depends()]
-) -> dict[str, Any]:
-    return get_entries(
+) -> dict[str, Any] | Response:
+    return await get_entries_async(
         collection=structures_coll,
         request=request,
         params=params,
@@ -44,19 +46,17 @@ def get_structures(
 
 @router.get(
     "/structures/{entry_id:path}",
-    response_model=StructureResponseOne
-    if CONFIG.validate_api_response
-    else dict[str, Any],
+    response_model=response_model(StructureResponseOne),
     response_model_exclude_unset=True,
     tags=["Structures"],
     responses=ERROR_RESPONSES,
 )
-def get_single_structure(
+async def get_single_structure(
     request: Request,
     entry_id: str,
     params: Annotated[SingleEntryQueryParams, Depends()],
-) -> dict[str, Any]:
-    return get_single_entry(
+) -> dict[str, Any] | Response:
+    return await get_single_entry_async(
         collection=structures_coll,
         entry_id=entry_id,
         request=request,
@@ -1,28 +1,81 @@
+import asyncio
+import random
 import re
+import threading
+import time
 import urllib.parse
+import warnings
+from collections.abc import AsyncIterator, Iterable, Iterator, Mapping
+from contextvars import ContextVar
 from datetime import datetime
 from typing import Any
 
 from fastapi import Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, ValidationError
+from pydantic_core import to_json
+from starlette.concurrency import run_in_threadpool
 from starlette.datastructures import URL as StarletteURL
 
 from optimade import __api_version__
 from optimade.exceptions import BadRequest, InternalServerError
-from optimade.models import EntryResource, ResponseMeta, ToplevelLinks
+from optimade.models import (
+    EntryResource,
+    EntryResponseMany,
+    EntryResponseOne,
+    LinksResponse,
+    ReferenceResponseMany,
+    ReferenceResponseOne,
+    ResponseMeta,
+    StructureResponseMany,
+    StructureResponseOne,
+    ToplevelLinks,
+)
 from optimade.server.config import CONFIG
-from optimade.server.entry_collections import EntryCollection
+from optimade.server.entry_collections import (
+    AsyncEntryCollection,
+    BaseEntryCollection,
+    EntryCollection,
+)
+from optimade.server.entry_collections.entry_collections import (
+    EntryStream,
+    QueryCache,
+    record_query_timings,
+    submit_query,
+    timed,
+)
+from optimade.server.logger import LOGGER
 from optimade.server.query_params import EntryListingQueryParams, SingleEntryQueryParams
 from optimade.utils import PROVIDER_LIST_URLS, get_providers, mongo_id_for_database
+from optimade.warnings import TooManyValues
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
 
 __all__ = (
     "BASE_URL_PREFIXES",
+    "JSONAPIResponse",
+    "ORJSONAPIResponse",
+    "json_response_class",
+    "RESPONSE_VALIDATION_STATS",
+    "ResponseValidationStats",
+    "response_model",
+    "RESPONSE_WARNINGS",
+    "ResponseWarnings",
     "meta_values",
     "handle_response_fields",
     "get_included_relationships",
+    "get_included_relationships_async",
     "get_base_url",
     "get_entries",
+    "get_entries_async",
+    "stream_entries",
+    "stream_entries_jsonl",
+    "JSONL_MEDIA_TYPE",
     "get_single_entry",
+    "get_single_entry_async",
     "mongo_id_for_database",
     "get_providers",
     "PROVIDER_LIST_URLS",
@@ -37,6 +90,35 @@ BASE_URL_PREFIXES = {
 }
 
 
+class ResponseWarnings(list):
+    """The OPTIMADE warnings (as JSON-serializable dictionaries) collected while
+    handling a single request, see
+    [`AddWarnings`][optimade.server.middleware.AddWarnings].
+
+    Attributes:
+        reported: The number of warnings that have already been written into the
+            `meta.warnings` of the response by [`meta_values`][optimade.server.routers.utils.meta_values].
+        streamed: Whether the response is streamed, writing `meta.warnings` only
+            after all other content, such that no warnings can be missed.
+
+    """
+
+    reported: int = 0
+    streamed: bool = False
+
+
+RESPONSE_WARNINGS: ContextVar[ResponseWarnings | None] = ContextVar(
+    "optimade_response_warnings", default=None
+)
+"""Request-scoped warnings to be added to the response, managed by
+[`AddWarnings`][optimade.server.middleware.AddWarnings]."""
+
+
+JSONL_MEDIA_TYPE = "application/jsonl"
+"""The MIME type of OPTIMADE JSON Lines responses, see
+[`stream_entries_jsonl`][optimade.server.routers.utils.stream_entries_jsonl]."""
+
+
 class JSONAPIResponse(JSONResponse):
     """This class simply patches `fastapi.responses.JSONResponse` to use the
     JSON:API 'application/vnd.api+json' MIME type.
@@ -46,6 +128,174 @@ class JSONAPIResponse(JSONResponse):
     media_type = "application/vnd.api+json"
 
 
+class ORJSONAPIResponse(JSONAPIResponse):
+    """A [`JSONAPIResponse`][optimade.server.routers.utils.JSONAPIResponse] that is
+    serialized with [`orjson`](https://github.com/ijl/orjson).
+
+    The content does not need to be converted to JSON-compatible types first:
+    `datetime` objects are serialized natively (in the same format as pydantic),
+    and pydantic models through their JSON-mode `model_dump`.
+
+    """
+
+    def render(self, content: Any) -> bytes:
+        return _orjson_dumps(content)
+
+
+def _orjson_dumps(content: Any) -> bytes:
+    return orjson.dumps(
+        content,
+        default=_orjson_default,
+        option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+    )
+
+
+def _orjson_default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json", exclude_unset=True, by_alias=True)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_response_class() -> type[JSONAPIResponse]:
+    """Return the JSON:API response class for the configured `response_serializer`.
+
+    Raises:
+        RuntimeError: If `orjson` is configured but not installed.
+
+    """
+    if CONFIG.response_serializer == "orjson":
+        if orjson is None:
+            raise RuntimeError(
+                "The 'orjson' response serializer requires the `orjson` package, "
+                "please install it with `pip install optimade[orjson]`."
+            )
+        return ORJSONAPIResponse
+    return JSONAPIResponse
+
+
+class ResponseValidationStats:
+    """Thread-safe counters of the responses handled in the `sampled` and
+    `first_per_shape` modes of `CONFIG.response_validation`, which are
+    validated in-process rather than by FastAPI.
+
+    Attributes:
+        validated: The number of responses whose entries passed validation.
+        failed: The number of responses whose entries failed validation.
+        skipped: The number of responses that were not validated.
+        seconds: The total time spent validating responses.
+
+    """
+
+    def __init__(self):
+        self.validated = 0
+        self.failed = 0
+        self.skipped = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, outcome: str, seconds: float = 0.0) -> None:
+        """Count a response as `validated`, `failed` or `skipped`."""
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+            self.seconds += seconds
+
+    def clear(self) -> None:
+        """Reset all counters."""
+        with self._lock:
+            self.validated = self.failed = self.skipped = 0
+            self.seconds = 0.0
+
+    def info(self) -> dict[str, int | float]:
+        """Return the counters as a dictionary, e.g., to export them as metrics."""
+        return {
+            "validated": self.validated,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "seconds": self.seconds,
+        }
+
+
+RESPONSE_VALIDATION_STATS = ResponseValidationStats()
+"""The outcomes of the in-process response validation, see
+[`ResponseValidationStats`][optimade.server.routers.utils.ResponseValidationStats]."""
+
+_VALIDATED_SHAPES = QueryCache(maxsize=1024)
+
+ENTRY_RESPONSE_MODELS: dict[
+    str, tuple[type[EntryResponseMany], type[EntryResponseOne]]
+] = {
+    "links": (LinksResponse, EntryResponseOne),
+    "references": (ReferenceResponseMany, ReferenceResponseOne),
+    "structures": (StructureResponseMany, StructureResponseOne),
+}
+"""The response models of the entry listing and single entry endpoints, by entry type,
+used for the in-process response validation."""
+
+
+def response_model(model: type[BaseModel]) -> Any:
+    """Return the response model for an entry endpoint: `model` if FastAPI should
+    validate every response against it, or a plain dictionary otherwise,
+    see `CONFIG.validate_api_response` and `CONFIG.response_validation`."""
+    return model if _validates_every_response() else dict[str, Any]
+
+
+def _validates_every_response() -> bool:
+    return bool(CONFIG.validate_api_response) and CONFIG.response_validation == "always"
+
+
+def _streams_responses() -> bool:
+    # Streamed responses cannot be validated by FastAPI
+    return CONFIG.stream_responses and not _validates_every_response()
+
+
+def _validate_response(
+    collection: BaseEntryCollection, request: Request, content: dict[str, Any]
+) -> None:
+    """Validate a sampled response, or the first response for a query shape,
+    against its response model, according to `CONFIG.response_validation`.
+
+    Raises:
+        ValidationError: If the response is not valid, as the full response
+            validation by FastAPI would.
+
+    """
+    if not CONFIG.validate_api_response or CONFIG.response_validation == "always":
+        return
+
+    single_entry = not isinstance(content["data"], list)
+    shape = None
+    if CONFIG.response_validation == "sampled":
+        if random.random() >= CONFIG.response_validation_sample_rate:
+            RESPONSE_VALIDATION_STATS.record("skipped")
+            return
+    else:
+        query = request.query_params
+        shape = (
+            collection.resource_mapper.ENDPOINT,
+            single_entry,
+            tuple(sorted(query)),
+            query.get("response_fields"),
+            query.get("include"),
+        )
+        if _VALIDATED_SHAPES.get(shape):
+            RESPONSE_VALIDATION_STATS.record("skipped")
+            return
+
+    many, one = ENTRY_RESPONSE_MODELS.get(
+        collection.resource_mapper.ENDPOINT, (EntryResponseMany, EntryResponseOne)
+    )
+    start = time.perf_counter()
+    try:
+        (one if single_entry else many).model_validate(content)
+    except ValidationError as exc:
+        RESPONSE_VALIDATION_STATS.record("failed", time.perf_counter() - start)
+        LOGGER.error("Invalid response to %s: %s", request.url, exc)
+        raise
+    RESPONSE_VALIDATION_STATS.record("validated", time.perf_counter() - start)
+    if shape is not None:
+        _VALIDATED_SHAPES.put(shape, True)
+
+
 def meta_values(
     url: urllib.parse.ParseResult | urllib.parse.SplitResult | StarletteURL | str,
     data_returned: int | None,
@@ -54,7 +304,12 @@ def meta_values(
     schema: str | None = None,
     **kwargs,
 ) -> ResponseMeta:
-    """Helper to initialize the meta values"""
+    """Helper to initialize the meta values.
+
+    Any OPTIMADE warnings emitted so far while handling the request are added
+    to `meta.warnings`, unless these are passed explicitly.
+
+    """
     from optimade.models import ResponseMetaQuery
 
     if isinstance(url, str):
@@ -69,6 +324,11 @@ def meta_values(
     if schema is None:
         schema = CONFIG.schema_url if not CONFIG.is_index else CONFIG.index_schema_url
 
+    collected_warnings = RESPONSE_WARNINGS.get()
+    if collected_warnings and "warnings" not in kwargs:
+        kwargs["warnings"] = list(collected_warnings)
+        collected_warnings.reported = len(collected_warnings)
+
     return ResponseMeta(
         query=ResponseMetaQuery(representation=f"{url_path}?{url.query}"),
         api_version=__api_version__,
@@ -85,57 +345,72 @@ def meta_values(
 
 def handle_response_fields(
     results: list[EntryResource] | EntryResource | list[dict] | dict,
-    exclude_fields: set[str],
     include_fields: set[str],
+    *args: set[str],
+    exclude_fields: set[str] | None = None,
 ) -> list[dict[str, Any]]:
     """Handle query parameter `response_fields`.
 
     It is assumed that all fields are under `attributes`.
     This is due to all other top-level fields are REQUIRED in the response.
 
+    The `attributes` of each entry are rebuilt from the requested fields in a
+    single pass, such that the cost does not depend on the number of excluded fields.
+    The given results are left intact: a new dictionary is returned for each entry,
+    sharing the values of its fields.
+
     Parameters:
-        exclude_fields: Fields under `attributes` to be excluded from the response.
-        include_fields: Fields under `attributes` that were requested that should be
-            set to null if missing in the entry.
+        include_fields: Fields under `attributes` that were requested, which are the
+            only ones returned, set to null if missing in the entry.
+        exclude_fields: Deprecated and unused, as only the `include_fields` are
+            returned. For backwards compatibility, the fields may still be passed as
+            `handle_response_fields(results, exclude_fields, include_fields)`.
 
     Returns:
         List of resulting resources as dictionaries after pruning according to
         the `response_fields` OPTIMADE URL query parameter.
 
     """
+    if args or exclude_fields is not None:
+        warnings.warn(
+            "The `exclude_fields` argument of `handle_response_fields(...)` is deprecated "
+            "and unused, please only pass `include_fields`.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        if args:
+            include_fields = args[-1]
+
     if not isinstance(results, list):
         results = [results]
 
+    fields = sorted(include_fields)
     new_results = []
-    while results:
-        new_entry = results.pop(0)
-        try:
-            new_entry = new_entry.model_dump(exclude_unset=True, by_alias=True)  # type: ignore[union-attr]
-        except AttributeError:
-            pass
-
-        # Remove fields excluded by their omission in `response_fields`
-        for field in exclude_fields:
-            if field in new_entry["attributes"]:
-                del new_entry["attributes"][field]
-
-        # Include missing fields that were requested in `response_fields`
-        for field in include_fields:
-            if field not in new_entry["attributes"]:
-                new_entry["attributes"][field] = None
+    for entry in results:
+        if isinstance(entry, dict):
+            attributes = entry["attributes"]
+        else:
+            entry = entry.model_dump(exclude_unset=True, by_alias=True)
+            attributes = entry["attributes"]
 
-        new_results.append(new_entry)
+        new_results.append(
+            {**entry, "attributes": {field: attributes.get(field) for field in fields}}
+        )
 
     return new_results
 
 
 def get_included_relationships(
     results: EntryResource | list[EntryResource] | dict | list[dict],
-    ENTRY_COLLECTIONS: dict[str, EntryCollection],
+    ENTRY_COLLECTIONS: Mapping[str, EntryCollection | AsyncEntryCollection],
     include_param: list[str],
-) -> list[EntryResource | dict[str, Any]]:
-    """Filters the included relationships and makes the appropriate compound request
-    to include them in the response.
+) -> list[dict[str, Any]]:
+    """Filters the included relationships and looks them up by ID in their
+    collections to include them in the response.
+
+    At most `CONFIG.page_limit_max` related resources are included, in the order in
+    which they are referenced; a `TooManyValues` warning is emitted if more were
+    referenced.
 
     Parameters:
         results: list of returned documents.
@@ -149,6 +424,102 @@ def get_included_relationships(
             of resource objects for that entry type.
 
     """
+    return _find_included(
+        ENTRY_COLLECTIONS, _included_ids(results, ENTRY_COLLECTIONS, include_param)
+    )
+
+
+async def get_included_relationships_async(
+    results: EntryResource | list[EntryResource] | dict | list[dict],
+    ENTRY_COLLECTIONS: Mapping[str, EntryCollection | AsyncEntryCollection],
+    include_param: list[str],
+) -> list[dict[str, Any]]:
+    """Asynchronous version of
+    [`get_included_relationships`][optimade.server.routers.utils.get_included_relationships],
+    awaiting the queries of [`AsyncEntryCollection`][optimade.server.entry_collections.entry_collections.AsyncEntryCollection]s
+    and running those of other collections in the thread pool.
+
+    """
+    return await _find_included_async(
+        ENTRY_COLLECTIONS, _included_ids(results, ENTRY_COLLECTIONS, include_param)
+    )
+
+
+def _find_included(
+    ENTRY_COLLECTIONS: Mapping[str, EntryCollection | AsyncEntryCollection],
+    included_ids: Mapping[str, Iterable[str]],
+) -> list[dict[str, Any]]:
+    """Look up the related resources to include in the response by ID, per entry type.
+
+    Raises:
+        TypeError: If one of the collections is an
+            [`AsyncEntryCollection`][optimade.server.entry_collections.entry_collections.AsyncEntryCollection],
+            which can only be queried by
+            [`_find_included_async`][optimade.server.routers.utils._find_included_async].
+
+    """
+    included: list[dict[str, Any]] = []
+    for entry_type, ids in _limit_included_ids(included_ids).items():
+        collection = ENTRY_COLLECTIONS[entry_type]
+        if isinstance(collection, AsyncEntryCollection):
+            raise TypeError(
+                f"The {entry_type!r} collection is asynchronous, so its entries can "
+                "only be included by the `async` routes."
+            )
+        included.extend(collection.find_by_ids(ids))
+    return included
+
+
+async def _find_included_async(
+    ENTRY_COLLECTIONS: Mapping[str, EntryCollection | AsyncEntryCollection],
+    included_ids: Mapping[str, Iterable[str]],
+) -> list[dict[str, Any]]:
+    """Asynchronous version of `_find_included`, awaiting the queries of
+    `AsyncEntryCollection`s and running those of other collections in the thread pool."""
+    included: list[dict[str, Any]] = []
+    for entry_type, ids in _limit_included_ids(included_ids).items():
+        collection = ENTRY_COLLECTIONS[entry_type]
+        if isinstance(collection, AsyncEntryCollection):
+            included.extend(await collection.find_by_ids(ids))
+        else:
+            included.extend(await run_in_threadpool(collection.find_by_ids, ids))
+    return included
+
+
+def _limit_included_ids(
+    included_ids: Mapping[str, Iterable[str]],
+) -> dict[str, list[str]]:
+    """Limit the related resources to include in a response to
+    `CONFIG.page_limit_max`, such that `included` is bounded like `data`,
+    warning if some of them are left out."""
+    limited: dict[str, list[str]] = {}
+    nreferenced = 0
+    for entry_type, ids in included_ids.items():
+        ids = list(ids)
+        if nreferenced < CONFIG.page_limit_max:
+            limited[entry_type] = ids[: CONFIG.page_limit_max - nreferenced]
+        nreferenced += len(ids)
+
+    if nreferenced > CONFIG.page_limit_max:
+        warnings.warn(
+            TooManyValues(
+                detail=(
+                    f"Only {CONFIG.page_limit_max} of the {nreferenced} related "
+                    "resources referenced by the returned entries are included in the "
+                    "response."
+                )
+            )
+        )
+    return limited
+
+
+def _included_ids(
+    results: EntryResource | list[EntryResource] | dict | list[dict],
+    ENTRY_COLLECTIONS: Mapping[str, EntryCollection | AsyncEntryCollection],
+    include_param: list[str],
+) -> dict[str, list[str]]:
+    """Collect the IDs of the related resources to include in the response,
+    per entry type."""
     from collections import defaultdict
 
     if not isinstance(results, list):
@@ -190,31 +561,10 @@ def get_included_relationships(
                     if ref["id"] not in endpoint_includes[entry_type]:
                         endpoint_includes[entry_type][ref["id"]] = ref
 
-    included: dict[
-        str,
-        list[EntryResource] | list[dict[str, Any]],
-    ] = {}
-    for entry_type in endpoint_includes:
-        compound_filter = " OR ".join(
-            [f'id="{ref_id}"' for ref_id in endpoint_includes[entry_type]]
-        )
-        params = EntryListingQueryParams(
-            filter=compound_filter,
-            response_format="json",
-            response_fields="",
-            sort="",
-            page_limit=0,
-            page_offset=0,
-        )
-
-        # still need to handle pagination
-        ref_results, _, _, _, _ = ENTRY_COLLECTIONS[entry_type].find(params)
-        if ref_results is None:
-            ref_results = []
-        included[entry_type] = ref_results  # type: ignore[assignment]
-
-    # flatten dict by endpoint to list
-    return [obj for endp in included.values() for obj in endp]
+    return {
+        entry_type: list(refs_by_id)
+        for entry_type, refs_by_id in endpoint_includes.items()
+    }
 
 
 def get_base_url(
@@ -242,105 +592,523 @@ def get_entries(
     collection: EntryCollection,
     request: Request,
     params: EntryListingQueryParams,
+) -> dict[str, Any] | Response:
+    """Generalized /{entry} endpoint getter
+
+    If `CONFIG.stream_responses` applies, a `StreamingResponse` is returned, see
+    [`stream_entries`][optimade.server.routers.utils.stream_entries], as for
+    `response_format=jsonl`, see
+    [`stream_entries_jsonl`][optimade.server.routers.utils.stream_entries_jsonl].
+
+    """
+    from optimade.server.routers import ENTRY_COLLECTIONS
+
+    if params.response_format == "jsonl":
+        return stream_entries_jsonl(collection, request, params)
+    if _streams_responses():
+        return stream_entries(collection, request, params)
+
+    with record_query_timings() as timings:
+        params.check_params(request.query_params)
+        # The size of the collection is independent of the query, so run it concurrently
+        data_available = submit_query(_data_available, collection)
+        found = collection.find(params)
+
+        included = []
+        if found[0] is not None:
+            included = get_included_relationships(
+                found[0], ENTRY_COLLECTIONS, _include_param(params)
+            )
+
+        return _entries_response(
+            collection,
+            request,
+            params,
+            found,
+            included,
+            data_available.result(),
+            timings,
+        )
+
+
+async def get_entries_async(
+    collection: EntryCollection | AsyncEntryCollection,
+    request: Request,
+    params: EntryListingQueryParams,
+) -> dict[str, Any] | Response:
+    """Generalized /{entry} endpoint getter for `async` routes.
+
+    The query of an [`AsyncEntryCollection`][optimade.server.entry_collections.entry_collections.AsyncEntryCollection]
+    is awaited, while [`get_entries`][optimade.server.routers.utils.get_entries] is run
+    in the thread pool for other collections.
+
+    If the response is not validated by FastAPI (see
+    [`response_model`][optimade.server.routers.utils.response_model]) and a
+    `response_serializer` other than `json` is configured, the response is
+    returned already serialized, or streamed if `CONFIG.stream_responses` is set.
+
+    """
+    from optimade.server.routers import ENTRY_COLLECTIONS
+
+    if not isinstance(collection, AsyncEntryCollection):
+        return _encode_response(
+            await run_in_threadpool(get_entries, collection, request, params)
+        )
+
+    if params.response_format == "jsonl":
+        return stream_entries_jsonl(collection, request, params)
+    if _streams_responses():
+        return stream_entries(collection, request, params)
+
+    with record_query_timings() as timings:
+        params.check_params(request.query_params)
+        found, data_available = await asyncio.gather(
+            collection.find(params), _data_available_async(collection)
+        )
+
+        included = []
+        if found[0] is not None:
+            included = await get_included_relationships_async(
+                found[0], ENTRY_COLLECTIONS, _include_param(params)
+            )
+
+        return _encode_response(
+            _entries_response(
+                collection, request, params, found, included, data_available, timings
+            )
+        )
+
+
+def get_single_entry(
+    collection: EntryCollection,
+    entry_id: str,
+    request: Request,
+    params: SingleEntryQueryParams,
 ) -> dict[str, Any]:
-    """Generalized /{entry} endpoint getter"""
     from optimade.server.routers import ENTRY_COLLECTIONS
 
-    params.check_params(request.query_params)
-    (
-        results,
-        data_returned,
-        more_data_available,
-        fields,
-        include_fields,
-    ) = collection.find(params)
+    with record_query_timings() as timings:
+        params.check_params(request.query_params)
+        params.filter = f'id="{entry_id}"'  # type: ignore[attr-defined]
+        data_available = submit_query(_data_available, collection)
+        found = collection.find(params)
+
+        included = []
+        entry = _check_single_entry(found)
+        if entry is not None:
+            included = get_included_relationships(
+                entry, ENTRY_COLLECTIONS, _include_param(params)
+            )
+
+        return _single_entry_response(
+            collection, request, found, included, data_available.result(), timings
+        )
+
+
+async def get_single_entry_async(
+    collection: EntryCollection | AsyncEntryCollection,
+    entry_id: str,
+    request: Request,
+    params: SingleEntryQueryParams,
+) -> dict[str, Any] | Response:
+    """Generalized /{entry}/{entry_id} endpoint getter for `async` routes, see
+    [`get_entries_async`][optimade.server.routers.utils.get_entries_async]."""
+    from optimade.server.routers import ENTRY_COLLECTIONS
+
+    if not isinstance(collection, AsyncEntryCollection):
+        return _encode_response(
+            await run_in_threadpool(
+                get_single_entry, collection, entry_id, request, params
+            )
+        )
+
+    with record_query_timings() as timings:
+        params.check_params(request.query_params)
+        params.filter = f'id="{entry_id}"'  # type: ignore[attr-defined]
+        found, data_available = await asyncio.gather(
+            collection.find(params), _data_available_async(collection)
+        )
+
+        included = []
+        entry = _check_single_entry(found)
+        if entry is not None:
+            included = await get_included_relationships_async(
+                entry, ENTRY_COLLECTIONS, _include_param(params)
+            )
+
+        return _encode_response(
+            _single_entry_response(
+                collection, request, found, included, data_available, timings
+            )
+        )
+
+
+def _encode_response(content: dict[str, Any] | Response) -> dict[str, Any] | Response:
+    """Serialize the response content directly if it is not validated against the
+    response model by FastAPI, and a faster `response_serializer` is configured."""
+    if (
+        isinstance(content, Response)
+        or _validates_every_response()
+        or CONFIG.response_serializer == "json"
+    ):
+        return content
+    return json_response_class()(content)
+
+
+def stream_entries(
+    collection: EntryCollection | AsyncEntryCollection,
+    request: Request,
+    params: EntryListingQueryParams,
+) -> StreamingResponse:
+    """Stream the response of an entry listing, see `CONFIG.stream_responses`.
+
+    The entries are written one batch at a time while they are fetched from the
+    backend with
+    [`find_stream`][optimade.server.entry_collections.entry_collections.EntryCollection.find_stream],
+    followed by `included`, `links` and `meta`, which depend on all entries.
+    The query parameters are checked before the response is started, such that
+    bad requests are still answered with the appropriate error.
+
+    """
+    from optimade.server.routers import ENTRY_COLLECTIONS
+
+    with record_query_timings() as timings:
+        params.check_params(request.query_params)
+        include_param = _include_param(params)
+        # Check the requested relationship types up front
+        _included_ids([], ENTRY_COLLECTIONS, include_param)
+        stream = collection.find_stream(params)
+
+    _mark_streamed()
+    body: Iterator[bytes] | AsyncIterator[bytes]
+    if isinstance(collection, AsyncEntryCollection):
+        body = _stream_entries_async(
+            collection, request, params, stream, include_param, timings
+        )
+    else:
+        body = _stream_entries(
+            collection, request, params, stream, include_param, timings
+        )
+    return StreamingResponse(body, media_type=JSONAPIResponse.media_type)
+
+
+def stream_entries_jsonl(
+    collection: EntryCollection | AsyncEntryCollection,
+    request: Request,
+    params: EntryListingQueryParams,
+) -> StreamingResponse:
+    """Stream all entries matching the query as OPTIMADE JSON Lines, i.e., the
+    response of an entry listing for `response_format=jsonl`.
+
+    This is the format read by [`insert_from_jsonl`][optimade.utils.insert_from_jsonl]:
+    an `x-optimade` header line, followed by one entry per line, such that a whole
+    database can be mirrored with a single request.
+    The entries are written as they are read from the backend cursor, without a page
+    limit, and only as fast as the client consumes them.
+    Related resources are not included.
+
+    """
+    with record_query_timings():
+        params.check_params(request.query_params)
+        stream = collection.find_stream(params)
+
+    _mark_streamed()
+    body: Iterator[bytes] | AsyncIterator[bytes]
+    if isinstance(collection, AsyncEntryCollection):
+        body = _stream_jsonl_async(stream)
+    else:
+        body = _stream_jsonl(stream)
+    return StreamingResponse(body, media_type=JSONL_MEDIA_TYPE)
+
+
+def _mark_streamed() -> None:
+    collected_warnings = RESPONSE_WARNINGS.get()
+    if collected_warnings is not None:
+        collected_warnings.streamed = True
+
+
+def _stream_jsonl(stream: EntryStream) -> Iterator[bytes]:
+    yield _jsonl_header()
+    for batch in stream:
+        yield _jsonl_batch(stream, batch)
+
+
+async def _stream_jsonl_async(stream: EntryStream) -> AsyncIterator[bytes]:
+    yield _jsonl_header()
+    async for batch in stream:
+        yield _jsonl_batch(stream, batch)
+
+
+def _jsonl_header() -> bytes:
+    return _dumps({"x-optimade": {"meta": {"api_version": __api_version__}}}) + b"\n"
+
+
+def _jsonl_batch(stream: EntryStream, batch: list[dict[str, Any]]) -> bytes:
+    if stream.exclude_fields or stream.include_fields:
+        batch = handle_response_fields(batch, stream.include_fields)
+    return b"".join(_dumps(entry) + b"\n" for entry in batch)
+
+
+def _stream_entries(
+    collection: EntryCollection,
+    request: Request,
+    params: EntryListingQueryParams,
+    stream: EntryStream,
+    include_param: list[str],
+    timings: dict[str, float],
+) -> Iterator[bytes]:
+    from optimade.server.routers import ENTRY_COLLECTIONS
+
+    included_ids: dict[str, dict[str, None]] = {}
+    batches = iter(stream)
+    yield b'{"data":['
+    while True:
+        # The body is iterated over in the thread pool, step by step, so the
+        # timings are recorded per step rather than across `yield`s
+        with record_query_timings(timings):
+            batch = next(batches, None)
+        if batch is None:
+            break
+        yield _stream_batch(stream, batch, include_param, included_ids)
+
+    with record_query_timings(timings):
+        data_available = _data_available(collection)
+        included = _find_included(ENTRY_COLLECTIONS, included_ids)
+    yield _stream_tail(
+        request, params, collection, stream, included, data_available, timings
+    )
+
+
+async def _stream_entries_async(
+    collection: AsyncEntryCollection,
+    request: Request,
+    params: EntryListingQueryParams,
+    stream: EntryStream,
+    include_param: list[str],
+    timings: dict[str, float],
+) -> AsyncIterator[bytes]:
+    from optimade.server.routers import ENTRY_COLLECTIONS
+
+    included_ids: dict[str, dict[str, None]] = {}
+    batches = aiter(stream)
+    yield b'{"data":['
+    while True:
+        with record_query_timings(timings):
+            batch = await anext(batches, None)
+        if batch is None:
+            break
+        yield _stream_batch(stream, batch, include_param, included_ids)
+
+    with record_query_timings(timings):
+        data_available = await _data_available_async(collection)
+        included = await _find_included_async(ENTRY_COLLECTIONS, included_ids)
+    yield _stream_tail(
+        request, params, collection, stream, included, data_available, timings
+    )
+
+
+def _stream_batch(
+    stream: EntryStream,
+    batch: list[dict[str, Any]],
+    include_param: list[str],
+    included_ids: dict[str, dict[str, None]],
+) -> bytes:
+    """Serialize a batch of streamed entries, collecting the IDs of their related
+    resources to include."""
+    from optimade.server.routers import ENTRY_COLLECTIONS
+
+    for entry_type, ids in _included_ids(
+        batch, ENTRY_COLLECTIONS, include_param
+    ).items():
+        included_ids.setdefault(entry_type, {}).update(dict.fromkeys(ids))
+
+    if stream.exclude_fields or stream.include_fields:
+        # Pruned copies, as `stream.last` still holds the sort values for the next link
+        batch = handle_response_fields(batch, stream.include_fields)
+
+    chunk = b",".join(_dumps(entry) for entry in batch)
+    # Separate the batch from the previous one, if any
+    return chunk if stream.nreturned == len(batch) else b"," + chunk
+
+
+def _stream_tail(
+    request: Request,
+    params: EntryListingQueryParams,
+    collection: BaseEntryCollection,
+    stream: EntryStream,
+    included: list[dict[str, Any]],
+    data_available: int,
+    timings: dict[str, float],
+) -> bytes:
+    """Serialize the end of a streamed response, once all entries have been written."""
+    next_query = None
+    if stream.more_data_available:
+        next_query = (
+            collection._next_query_params(params, stream.nreturned, stream.last)
+            if stream.last is not None
+            else {}
+        )
+    meta = meta_values(
+        url=request.url,
+        data_returned=stream.data_returned,
+        data_available=data_available,
+        more_data_available=stream.more_data_available,
+        schema=CONFIG.schema_url if not CONFIG.is_index else CONFIG.index_schema_url,
+        **_timings_meta(request, timings),
+    )
+    return b"".join(
+        (
+            b'],"included":',
+            _dumps(included),
+            b',"links":',
+            _dumps(_toplevel_links(request, next_query)),
+            b',"meta":',
+            _dumps(meta),
+            b"}",
+        )
+    )
+
+
+def _dumps(content: Any) -> bytes:
+    """Serialize part of a streamed response with the configured `response_serializer`."""
+    if CONFIG.response_serializer == "orjson" and orjson is not None:
+        return _orjson_dumps(content)
+    if isinstance(content, BaseModel):
+        return content.model_dump_json(exclude_unset=True, by_alias=True).encode()
+    return to_json(content)
+
+
+def _toplevel_links(
+    request: Request, next_query: dict[str, list[str]] | None
+) -> ToplevelLinks:
+    """Build the top-level links of an entry listing, with the `next` link deduced
+    from the current request and the pagination parameters of the next page, if any."""
+    if next_query is None:
+        return ToplevelLinks(next=None)
+
+    query = urllib.parse.parse_qs(request.url.query)
+    query.update(next_query)
+
+    urlencoded = urllib.parse.urlencode(query, doseq=True)
+    base_url = get_base_url(request.url)
+
+    return ToplevelLinks(next=f"{base_url}{request.url.path}?{urlencoded}")
+
+
+def _data_available(collection: EntryCollection) -> int:
+    with timed("data_available"):
+        return collection.data_available
 
+
+async def _data_available_async(collection: AsyncEntryCollection) -> int:
+    with timed("data_available"):
+        return await collection.data_available_async()
+
+
+def _timings_meta(request: Request, timings: dict[str, float]) -> dict[str, Any]:
+    """Log the durations of the query phases and return them as (provider-specific)
+    extra `meta` fields in debug mode."""
+    timings_ms = {
+        phase: round(1000 * duration, 3) for phase, duration in timings.items()
+    }
+    LOGGER.debug("Query timings (ms) for %s: %s", request.url, timings_ms)
+    if not CONFIG.debug or not timings_ms:
+        return {}
+    return {f"_{CONFIG.provider.prefix}_query_timings": timings_ms}
+
+
+def _include_param(
+    params: EntryListingQueryParams | SingleEntryQueryParams,
+) -> list[str]:
     include = []
     if getattr(params, "include", False):
         include.extend(params.include.split(","))
+    return include
 
-    included = []
-    if results is not None:
-        included = get_included_relationships(results, ENTRY_COLLECTIONS, include)
 
+def _check_single_entry(
+    found: tuple,
+) -> dict[str, Any] | list[dict[str, Any]] | None:
+    """Check the single entry found by `EntryCollection.find` and return it."""
+    results, _, more_data_available, _, _ = found
     if more_data_available:
-        # Deduce the `next` link from the current request
-        query = urllib.parse.parse_qs(request.url.query)
-        query.update(collection.get_next_query_params(params, results))
+        raise InternalServerError(
+            detail=f"more_data_available MUST be False for single entry response, however it is {more_data_available}",
+        )
+    return results
 
-        urlencoded = urllib.parse.urlencode(query, doseq=True)
-        base_url = get_base_url(request.url)
 
-        links = ToplevelLinks(next=f"{base_url}{request.url.path}?{urlencoded}")
-    else:
-        links = ToplevelLinks(next=None)
+def _entries_response(
+    collection: BaseEntryCollection,
+    request: Request,
+    params: EntryListingQueryParams,
+    found: tuple,
+    included: list,
+    data_available: int,
+    timings: dict[str, float],
+) -> dict[str, Any]:
+    """Build the response for an entry listing from the output of `EntryCollection.find`."""
+    results, data_returned, more_data_available, fields, include_fields = found
+
+    links = _toplevel_links(
+        request,
+        collection.get_next_query_params(params, results)
+        if more_data_available
+        else None,
+    )
 
     if results is not None and (fields or include_fields):
-        results = handle_response_fields(results, fields, include_fields)  # type: ignore[assignment]
+        results = handle_response_fields(results, include_fields)  # type: ignore[assignment]
 
-    return {
+    content = {
         "links": links,
         "data": results if results else [],
         "meta": meta_values(
             url=request.url,
             data_returned=data_returned,
-            data_available=len(collection),
+            data_available=data_available,
             more_data_available=more_data_available,
             schema=CONFIG.schema_url
             if not CONFIG.is_index
             else CONFIG.index_schema_url,
+            **_timings_meta(request, timings),
         ),
         "included": included,
     }
+    _validate_response(collection, request, content)
+    return content
 
 
-def get_single_entry(
-    collection: EntryCollection,
-    entry_id: str,
+def _single_entry_response(
+    collection: BaseEntryCollection,
     request: Request,
-    params: SingleEntryQueryParams,
+    found: tuple,
+    included: list,
+    data_available: int,
+    timings: dict[str, float],
 ) -> dict[str, Any]:
-    from optimade.server.routers import ENTRY_COLLECTIONS
-
-    params.check_params(request.query_params)
-    params.filter = f'id="{entry_id}"'  # type: ignore[attr-defined]
-    (
-        results,
-        data_returned,
-        more_data_available,
-        fields,
-        include_fields,
-    ) = collection.find(params)
-
-    if more_data_available:
-        raise InternalServerError(
-            detail=f"more_data_available MUST be False for single entry response, however it is {more_data_available}",
-        )
-
-    include = []
-    if getattr(params, "include", False):
-        include.extend(params.include.split(","))
-
-    included = []
-    if results is not None:
-        included = get_included_relationships(results, ENTRY_COLLECTIONS, include)
+    """Build the response for a single entry from the output of `EntryCollection.find`."""
+    results, data_returned, more_data_available, fields, include_fields = found
 
     links = ToplevelLinks(next=None)
 
     if results is not None and (fields or include_fields):
-        results = handle_response_fields(results, fields, include_fields)[0]  # type: ignore[assignment]
+        results = handle_response_fields(results, include_fields)[0]  # type: ignore[assignment]
 
-    return {
+    content = {
         "links": links,
         "data": results if results else None,
         "meta": meta_values(
             url=request.url,
             data_returned=data_returned,
-            data_available=len(collection),
+            data_available=data_available,
             more_data_available=more_data_available,
             schema=CONFIG.schema_url
             if not CONFIG.is_index
             else CONFIG.index_schema_url,
+            **_timings_meta(request, timings),
         ),
         "included": included,
     }
+    _validate_response(collection, request, content)
+    return content
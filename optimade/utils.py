@@ -7,7 +7,7 @@ import contextlib
 import json
 from collections.abc import Container, Iterable
 from pathlib import Path
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
 from requests.exceptions import SSLError
 
@@ -24,24 +24,53 @@ PROVIDER_LIST_URLS = (
 )
 
 
-def insert_from_jsonl(jsonl_path: Path, create_default_index: bool = False) -> None:
+def insert_from_jsonl(
+    jsonl_path: Path,
+    create_default_index: bool = False,
+    batch_size: int = 1000,
+    decode_processes: int | None = None,
+    insert_workers: int = 4,
+    chunk_size: int = 8 * 1024**2,
+    progress_interval: float = 10.0,
+) -> None:
     """Insert OPTIMADE JSON lines data into the database.
 
+    The file is ingested in a pipeline: it is read in chunks of lines, which are
+    decoded by a pool of processes, and the decoded entries are inserted in batches
+    by a bounded number of concurrent writers. Reading only runs ahead of the
+    writers by a few chunks, such that memory use is bounded.
+    Progress and throughput are logged every `progress_interval` seconds.
+    The entries are added with the `insert` method of the entry collections, which
+    also stores any derived fields, e.g., the length fields of list properties if
+    `materialize_length_fields` is set in the server config.
+
     Arguments:
         jsonl_path: Path to the JSON lines file.
         create_default_index: Whether to create a default index on the `id` field.
+        batch_size: The number of entries of an entry type to insert at once.
+        decode_processes: The number of processes decoding the file, by default one
+            per CPU. With 0, or for files smaller than `chunk_size`, the file is
+            decoded in the calling process.
+        insert_workers: The maximum number of batches inserted concurrently.
+        chunk_size: The approximate number of bytes decoded per task.
+        progress_interval: The interval between progress reports, in seconds.
 
     """
-    from collections import defaultdict
-
-    import bson.json_util
+    import os
+    import threading
+    import time
+    from collections import defaultdict, deque
+    from concurrent.futures import (
+        FIRST_COMPLETED,
+        Future,
+        ProcessPoolExecutor,
+        ThreadPoolExecutor,
+        wait,
+    )
 
     from optimade.server.logger import LOGGER
     from optimade.server.routers import ENTRY_COLLECTIONS
 
-    batch = defaultdict(list)
-    batch_size: int = 1000
-
     # Attempt to treat path as absolute, otherwise join with root directory
     if not jsonl_path.is_file():
         _jsonl_path = Path(__file__).parent.joinpath(jsonl_path)
@@ -59,60 +88,199 @@ def insert_from_jsonl(jsonl_path: Path, create_default_index: bool = False) -> N
             except NotImplementedError:
                 pass
 
+    total_bytes = jsonl_path.stat().st_size
+    if decode_processes is None:
+        decode_processes = os.cpu_count() or 1
+    if total_bytes <= chunk_size:
+        decode_processes = 0
+
+    batch: dict[str, list[dict]] = defaultdict(list)
+    pending_inserts: set[Future] = set()
+    inserted_lock = threading.Lock()
+    bytes_read: int = 0
+    inserted_rows: int = 0
     bad_rows: int = 0
     good_rows: int = 0
-    with open(jsonl_path) as handle:
+    start = last_report = time.monotonic()
+
+    def count_inserted(nrows: int, future: Future) -> None:
+        nonlocal inserted_rows
+        if future.exception() is None:
+            with inserted_lock:
+                inserted_rows += nrows
+
+    def submit_insert(entry_type: str, entries: list[dict]) -> None:
+        nonlocal pending_inserts
+        # Wait for a writer to be free, such that decoding cannot run ahead of the database
+        while len(pending_inserts) >= insert_workers:
+            done, pending_inserts = wait(pending_inserts, return_when=FIRST_COMPLETED)
+            for future in done:
+                future.result()
+        future = writers.submit(ENTRY_COLLECTIONS[entry_type].insert, entries)
+        future.add_done_callback(lambda future: count_inserted(len(entries), future))
+        pending_inserts.add(future)
+
+    def handle_decoded(decoded: tuple[dict[str, list[dict]], int, list[str]]) -> None:
+        nonlocal bad_rows, good_rows, last_report
+        entries_by_type, nrows, messages = decoded
+        for message in messages:
+            LOGGER.warning(message)
+        bad_rows += len(messages)
+        good_rows += nrows
+
+        for entry_type, entries in entries_by_type.items():
+            batch[entry_type].extend(entries)
+            while len(batch[entry_type]) >= batch_size:
+                submit_insert(entry_type, batch[entry_type][:batch_size])
+                batch[entry_type] = batch[entry_type][batch_size:]
+
+        now = time.monotonic()
+        if now - last_report >= progress_interval:
+            last_report = now
+            LOGGER.info(
+                "Inserted %d rows from the JSONL file (%.0f%% read, %.0f rows/s)",
+                inserted_rows,
+                100 * bytes_read / max(total_bytes, 1),
+                inserted_rows / (now - start),
+            )
+
+    with (
+        open(jsonl_path, "rb") as handle,
+        ThreadPoolExecutor(
+            max_workers=insert_workers, thread_name_prefix="optimade-insert"
+        ) as writers,
+    ):
         header = handle.readline()
+        bytes_read += len(header)
         header_jsonl = json.loads(header)
         assert header_jsonl.get(
             "x-optimade"
         ), "No x-optimade header, not sure if this is a JSONL file"
 
-        for line_no, json_str in enumerate(handle):
-            try:
-                if json_str.strip():
-                    entry = bson.json_util.loads(json_str)
+        decoders = (
+            ProcessPoolExecutor(max_workers=decode_processes)
+            if decode_processes
+            else None
+        )
+        max_pending = 2 * (decode_processes or 0)
+        try:
+            pending_chunks: deque[Future] = deque()
+            line_no = 0
+            while lines := handle.readlines(chunk_size):
+                bytes_read += sum(len(line) for line in lines)
+                if decoders is None:
+                    handle_decoded(_decode_jsonl_lines(lines, line_no))
                 else:
-                    LOGGER.warning("Could not read any data from L%s", line_no)
-                    bad_rows += 1
-                    continue
-            except json.JSONDecodeError:
-                from optimade.server.logger import LOGGER
-
-                LOGGER.warning("Could not read entry L%s JSON: '%s'", line_no, json_str)
-                bad_rows += 1
-                continue
-            try:
-                id = entry.get("id", None)
-                _type = entry.get("type", None)
-                if id is None or _type == "info":
-                    # assume this is an info endpoint for pre-1.2
-                    continue
-
-                inp_data = entry["attributes"]
-                inp_data["id"] = id
-                # Append the data to the batch
-                batch[_type].append(inp_data)
-            except Exception as exc:
-                LOGGER.warning(f"Error with entry at L{line_no} -- {entry} -- {exc}")
-                bad_rows += 1
-                continue
-
-            if len(batch[_type]) >= batch_size:
-                ENTRY_COLLECTIONS[_type].insert(batch[_type])
-                batch[_type] = []
+                    # Keep every process busy, while handling the chunks in order
+                    pending_chunks.append(
+                        decoders.submit(_decode_jsonl_lines, lines, line_no)
+                    )
+                    if len(pending_chunks) >= max_pending:
+                        handle_decoded(pending_chunks.popleft().result())
+                line_no += len(lines)
 
-            good_rows += 1
+            while pending_chunks:
+                handle_decoded(pending_chunks.popleft().result())
+        finally:
+            if decoders is not None:
+                decoders.shutdown(cancel_futures=True)
 
         # Insert any remaining data
-        for entry_type in batch:
-            ENTRY_COLLECTIONS[entry_type].insert(batch[entry_type])
-            batch[entry_type] = []
+        for entry_type, entries in batch.items():
+            if entries:
+                submit_insert(entry_type, entries)
+
+        for future in wait(pending_inserts).done:
+            future.result()
+
+    if bad_rows:
+        LOGGER.warning("Could not read %d rows from the JSONL file", bad_rows)
+
+    elapsed = time.monotonic() - start
+    LOGGER.info(
+        "Inserted %d rows from the JSONL file in %.1f s (%.0f rows/s)",
+        good_rows,
+        elapsed,
+        good_rows / elapsed if elapsed else good_rows,
+    )
+
+
+def jsonl_entry_document(entry: dict[str, Any]) -> dict[str, Any]:
+    """Convert an entry of an OPTIMADE JSONL file into the document stored by the
+    database backends, i.e., its attributes with its `id` and any relationships.
+
+    Arguments:
+        entry: The decoded entry, which is modified in-place.
+
+    Returns:
+        The document for the entry.
+
+    """
+    document = entry["attributes"]
+    document["id"] = entry["id"]
+    # Entries streamed with `response_format=jsonl` carry their
+    # relationships at the top level
+    if entry.get("relationships"):
+        document["relationships"] = entry["relationships"]
+    return document
+
+
+def _decode_jsonl_lines(
+    lines: list[bytes], first_line_no: int
+) -> tuple[dict[str, list[dict]], int, list[str]]:
+    """Decode a chunk of lines of an OPTIMADE JSONL file, see
+    [`insert_from_jsonl`][optimade.utils.insert_from_jsonl].
+
+    Arguments:
+        lines: The lines to decode.
+        first_line_no: The number of the first line, after the header.
+
+    Returns:
+        The entries to insert by entry type, the number of entries and the
+        warnings for the lines that could not be read.
+
+    """
+    from collections import defaultdict
+
+    import bson.json_util
+
+    entries: dict[str, list[dict]] = defaultdict(list)
+    good_rows: int = 0
+    messages: list[str] = []
+    for line_no, json_str in enumerate(lines, start=first_line_no):
+        try:
+            if json_str.strip():
+                # Only lines with MongoDB extended JSON (e.g., `{"$date": ...}`)
+                # need the much slower BSON decoder
+                entry = (
+                    bson.json_util.loads(json_str)
+                    if b'"$' in json_str
+                    else json.loads(json_str)
+                )
+            else:
+                messages.append(f"Could not read any data from L{line_no}")
+                continue
+        except json.JSONDecodeError:
+            messages.append(
+                f"Could not read entry L{line_no} JSON: '{json_str.decode(errors='replace')}'"
+            )
+            continue
+        try:
+            id = entry.get("id", None)
+            _type = entry.get("type", None)
+            if id is None or _type == "info":
+                # assume this is an info endpoint for pre-1.2
+                continue
+
+            # Append the data to the batch
+            entries[_type].append(jsonl_entry_document(entry))
+        except Exception as exc:
+            messages.append(f"Error with entry at L{line_no} -- {entry} -- {exc}")
+            continue
 
-        if bad_rows:
-            LOGGER.warning("Could not read %d rows from the JSONL file", bad_rows)
+        good_rows += 1
 
-        LOGGER.info("Inserted %d rows from the JSONL file", good_rows)
+    return dict(entries), good_rows, messages
 
 
 def mongo_id_for_database(database_id: str, database_type: str) -> str:
@@ -327,3 +327,238 @@ def swagger_validator(_, fname):
             print_error(f"Schema file {fname} did not pass validation.\n")
             print_error(json.dumps(response.json(), indent=2))
             sys.exit(1)
+
+
+@task(
+    help={
+        "duration": "Number of seconds to send requests for, per endpoint and middleware.",
+        "concurrency": "Number of concurrent client connections.",
+    }
+)
+def benchmark_middleware(_, duration=5.0, concurrency=8):
+    """Measure the requests per second served by uvicorn for the reference server
+    with the `BaseHTTPMiddleware`-based and the pure ASGI OPTIMADE middleware.
+
+    The client runs in the same process as the server, so the absolute numbers
+    are only meaningful relative to each other.
+
+    """
+    import asyncio
+    import copy
+    import socket
+    import threading
+    import time
+
+    import httpx
+    import uvicorn
+    from fastapi.middleware.cors import CORSMiddleware
+    from starlette.middleware import Middleware
+
+    from optimade.server.main import add_major_version_base_url, app
+    from optimade.server.middleware import (
+        OPTIMADE_ASGI_MIDDLEWARE,
+        OPTIMADE_MIDDLEWARE,
+    )
+
+    duration = float(duration)
+    concurrency = int(concurrency)
+    endpoints = ("/v1/info", "/v1/structures?page_limit=1")
+
+    add_major_version_base_url(app)
+
+    def with_middleware(middleware_stack):
+        variant = copy.copy(app)
+        variant.user_middleware = [Middleware(CORSMiddleware, allow_origins=["*"])]
+        for middleware in middleware_stack:
+            variant.user_middleware.insert(0, Middleware(middleware))
+        variant.middleware_stack = None
+        return variant
+
+    async def requests_per_second(url: str) -> float:
+        served = 0
+        limits = httpx.Limits(max_connections=concurrency)
+        async with httpx.AsyncClient(limits=limits) as client:
+
+            async def worker(deadline: float) -> None:
+                nonlocal served
+                while time.perf_counter() < deadline:
+                    response = await client.get(url)
+                    response.raise_for_status()
+                    served += 1
+
+            # Warm up, e.g., the filter and count caches
+            await worker(time.perf_counter() + min(1.0, duration / 5))
+            served = 0
+            start = time.perf_counter()
+            await asyncio.gather(
+                *(worker(start + duration) for _ in range(concurrency))
+            )
+            return served / (time.perf_counter() - start)
+
+    results: dict[str, dict[str, float]] = {}
+    for name, middleware_stack in (
+        ("BaseHTTPMiddleware", OPTIMADE_MIDDLEWARE),
+        ("pure ASGI", OPTIMADE_ASGI_MIDDLEWARE),
+    ):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+
+        server = uvicorn.Server(
+            uvicorn.Config(
+                with_middleware(middleware_stack),
+                host="127.0.0.1",
+                port=port,
+                lifespan="off",
+                log_level="warning",
+            )
+        )
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        while not server.started:
+            time.sleep(0.05)
+
+        try:
+            results[name] = {
+                endpoint: asyncio.run(
+                    requests_per_second(f"http://127.0.0.1:{port}{endpoint}")
+                )
+                for endpoint in endpoints
+            }
+        finally:
+            server.should_exit = True
+            thread.join()
+
+    print(f"{'endpoint':<32}" + "".join(f"{name:>20}" for name in results))
+    for endpoint in endpoints:
+        print(
+            f"{endpoint:<32}"
+            + "".join(f"{rps[endpoint]:>16.0f} rps" for rps in results.values())
+        )
+
+
+@task(
+    help={
+        "page_size": "Number of documents per page.",
+        "repeat": "Number of times to map the page, the best time is reported.",
+    }
+)
+def benchmark_map_back(_, page_size=1000, repeat=20):
+    """Measure the time taken to map a page of test structures back to OPTIMADE
+    format, one document at a time and as a whole page."""
+    import itertools
+    import timeit
+
+    from optimade.server.data import structures
+    from optimade.server.mappers import StructureMapper
+
+    page_size = int(page_size)
+    repeat = int(repeat)
+    page = list(itertools.islice(itertools.cycle(structures), page_size))
+
+    # Warm up the mapper caches
+    StructureMapper.map_back_many(page[:1])
+
+    timings = {
+        "map_back": lambda: [StructureMapper.map_back(doc) for doc in page],
+        "map_back_many": lambda: StructureMapper.map_back_many(page),
+    }
+    for name, func in timings.items():
+        best = min(timeit.repeat(func, number=1, repeat=repeat))
+        print(
+            f"{name:<16}{1000 * best:>10.2f} ms per {page_size} documents"
+            f"{1e6 * best / page_size:>10.2f} us per document"
+        )
+
+
+@task(
+    help={
+        "nclauses": "Comma-separated numbers of clauses of the flat OR filters.",
+        "depth": "Depth of the nested AND filter.",
+        "repeat": "Number of times to post-process each query, the best time is reported.",
+    }
+)
+def benchmark_filter_postprocessing(_, nclauses="100,1000,3000", depth=40, repeat=20):
+    """Measure the time taken by the MongoDB transformer to post-process
+    (see `MongoTransformer.postprocess`) large transformed filters: flat `OR`
+    filters on IDs, as built for included relationships, flat `OR` filters that
+    are rewritten by the post-processing rules, and a deeply nested `AND` filter."""
+    import timeit
+
+    from lark import Transformer
+
+    from optimade.filterparser import LarkParser
+    from optimade.filtertransformers.mongo import MongoTransformer
+    from optimade.server.mappers import StructureMapper
+
+    depth = int(depth)
+    repeat = int(repeat)
+    parser = LarkParser()
+    transformer = MongoTransformer(mapper=StructureMapper)
+
+    rewritten = (
+        'elements HAS ONLY "Si"',
+        "elements LENGTH 2",
+        "chemical_formula_anonymous IS UNKNOWN",
+        'last_modified > "2020-01-01T00:00:00Z"',
+    )
+    filters = {}
+    for size in map(int, nclauses.split(",")):
+        filters[f"flat OR on id, {size} clauses"] = " OR ".join(
+            f'id="mpf_{ind}"' for ind in range(size)
+        )
+        filters[f"flat OR rewritten, {size} clauses"] = " OR ".join(
+            rewritten[ind % len(rewritten)] for ind in range(size)
+        )
+    filters[f"nested AND, depth {depth}"] = (
+        "(".join(f"nelements > {ind} AND " for ind in range(depth))
+        + "elements LENGTH 2"
+        + ")" * (depth - 1)
+    )
+
+    for name, filter_ in filters.items():
+        # Post-process the raw output of the Lark transformer only
+        raw_query = Transformer.transform(transformer, parser.parse(filter_))
+        best = min(
+            timeit.repeat(
+                lambda: transformer.postprocess(raw_query), number=1, repeat=repeat
+            )
+        )
+        print(f"{name:<40}{1000 * best:>10.2f} ms")
+
+
+@task(
+    help={
+        "sizes": "Comma-separated numbers of entries per page.",
+        "repeat": "Number of times to prune each page, the best time is reported.",
+    }
+)
+def benchmark_response_fields(_, sizes="250,500,1000,2000", repeat=20):
+    """Measure the time taken to prune pages of test structures to a single requested
+    field with `handle_response_fields`, which should grow linearly with the number
+    of entries per page."""
+    import itertools
+    import timeit
+
+    from optimade.server.data import structures
+    from optimade.server.mappers import StructureMapper
+    from optimade.server.routers.utils import handle_response_fields
+
+    repeat = int(repeat)
+    include_fields = {"chemical_formula_reduced"}
+
+    for page_size in map(int, sizes.split(",")):
+        page = StructureMapper.map_back_many(
+            itertools.islice(itertools.cycle(structures), page_size)
+        )
+        best = min(
+            timeit.repeat(
+                lambda: handle_response_fields(page, include_fields),
+                number=1,
+                repeat=repeat,
+            )
+        )
+        print(
+            f"{page_size:>6} entries{1000 * best:>10.2f} ms"
+            f"{1e6 * best / page_size:>10.2f} us per entry"
+        )
@@ -625,6 +625,83 @@ class TestMongoTransformer:
             ):
                 transformer.transform(parser.parse(f'immutable_id {op} "abcdef"'))
 
+    def test_elements_bitmask(self, mapper):
+        from optimade.filtertransformers.mongo import (
+            MongoTransformer,
+            elements_bitmask_fields,
+        )
+
+        assert elements_bitmask_fields(["Si", "O", "Si"]) == {
+            "_elements_bitmask": ((1 << 7) | (1 << 13)).to_bytes(16, "little"),
+            "_elements_key": "O-Si",
+        }
+        assert elements_bitmask_fields(["Si", "Xx"]) == {}
+        assert elements_bitmask_fields(None) == {}
+
+        transformer = MongoTransformer(
+            mapper=mapper("StructureMapper"), elements_bitmask=True
+        )
+        parser = LarkParser(version=self.version, variant=self.variant)
+
+        def fallback(expr):
+            return {"$and": [{"_elements_key": {"$exists": False}}, {"elements": expr}]}
+
+        assert transformer.transform(parser.parse('elements HAS ALL "Si", "O"')) == {
+            "$or": [
+                {"_elements_bitmask": {"$bitsAllSet": [7, 13]}},
+                fallback({"$all": ["Si", "O"]}),
+            ]
+        }
+        assert transformer.transform(parser.parse('elements HAS ANY "Si", "O"')) == {
+            "$or": [
+                {"_elements_bitmask": {"$bitsAnySet": [7, 13]}},
+                fallback({"$in": ["Si", "O"]}),
+            ]
+        }
+        assert transformer.transform(parser.parse('elements HAS ONLY "Si", "O"')) == {
+            "$or": [
+                {"_elements_key": {"$in": ["O", "Si", "O-Si"]}},
+                {
+                    "$and": [
+                        {"_elements_key": {"$exists": False}},
+                        {
+                            "$and": [
+                                {
+                                    "elements": {
+                                        "$not": {"$elemMatch": {"$nin": ["Si", "O"]}}
+                                    }
+                                },
+                                {"elements.0": {"$exists": True}},
+                            ]
+                        },
+                    ]
+                },
+            ]
+        }
+
+        many = [
+            f'"{symbol}"' for symbol in ("H", "He", "Li", "Be", "B", "C", "N", "O", "F")
+        ]
+        query = transformer.transform(
+            parser.parse(f"elements HAS ONLY {', '.join(many)}")
+        )
+        bits_clear = query["$or"][0]["$and"][0]["_elements_bitmask"]["$bitsAllClear"]
+        assert bits_clear == list(range(9, 128))
+
+        # Unknown symbols and other fields are left untouched
+        assert transformer.transform(parser.parse('elements HAS ALL "Si", "Xx"')) == {
+            "elements": {"$all": ["Si", "Xx"]}
+        }
+        assert transformer.transform(parser.parse('NOT elements HAS ALL "Si"')) == {
+            "$and": [
+                {"elements": {"$not": {"$all": ["Si"]}}},
+                {"elements": {"$ne": None}},
+            ]
+        }
+        assert MongoTransformer(mapper=mapper("StructureMapper")).transform(
+            parser.parse('elements HAS ALL "Si", "O"')
+        ) == {"elements": {"$all": ["Si", "O"]}}
+
     def test_aliased_length_operator(self, mapper):
         from optimade.filtertransformers.mongo import MongoTransformer
 
@@ -902,3 +979,93 @@ class TestMongoTransformer:
         assert self.transform("nelements != 5") == self.transform("5 != nelements")
         assert self.transform("nelements > 5") == self.transform("5 < nelements")
         assert self.transform("nelements <= 5") == self.transform("5 >= nelements")
+
+    @pytest.mark.parametrize("nclauses", [10, 100, 1000])
+    def test_postprocessing_large_or_filter(self, nclauses):
+        """Test that large `OR` filters, as built for included relationships,
+        are post-processed without copying any unchanged part of the query."""
+        import copy
+        from unittest import mock
+
+        from lark import Transformer
+
+        from optimade.filtertransformers.mongo import MongoTransformer
+
+        transformer = MongoTransformer()
+        tree = LarkParser(version=self.version, variant=self.variant).parse(
+            " OR ".join(f'id="mpf_{ind}"' for ind in range(nclauses))
+        )
+        raw_query = Transformer.transform(transformer, tree)
+
+        with mock.patch("copy.deepcopy", side_effect=copy.deepcopy) as deepcopy:
+            query = transformer.postprocess(raw_query)
+            assert deepcopy.call_count == 0
+
+        assert query is raw_query
+        assert len(query["$or"]) == nclauses
+        assert query["$or"][-1] == {"id": {"$eq": f"mpf_{nclauses - 1}"}}
+
+    def test_rewrite_query(self):
+        """Test the single-pass rewrite engine directly."""
+        from optimade.filtertransformers.mongo import (
+            recursive_postprocessing,
+            rewrite_query,
+        )
+
+        def rename(prop, expr):
+            return {"b": expr} if prop == "a" else None
+
+        def expand(prop, expr):
+            if prop == "b":
+                return {"$and": [{"c": expr}, {"d": expr}]}
+            return None
+
+        def upper(prop, expr):
+            return {prop.upper(): expr} if prop in ("c", "d") else None
+
+        unchanged = {"e": {"$eq": 1}}
+        query = {"$or": [{"a": {"$eq": 1}}, unchanged], "$and": [{"f": 2}]}
+        rewritten = rewrite_query(query, (rename, expand, upper))
+        assert rewritten == {
+            "$or": [
+                {"$and": [{"C": {"$eq": 1}}, {"D": {"$eq": 1}}]},
+                {"e": {"$eq": 1}},
+            ],
+            "$and": [{"f": 2}],
+        }
+        assert rewritten["$or"][1] is unchanged
+        assert rewritten["$and"] is query["$and"]
+        assert query == {"$or": [{"a": {"$eq": 1}}, unchanged], "$and": [{"f": 2}]}
+
+        # Rules only see the output of earlier rules, not the other way around
+        assert rewrite_query({"b": 1}, (upper, expand)) == {
+            "$and": [{"c": 1}, {"d": 1}]
+        }
+
+        # Two disjunctions in the same dictionary must both hold
+        def or_null(prop, expr):
+            if prop in ("a", "b"):
+                return {"$or": [{prop: expr}, {prop: None}]}
+            return None
+
+        assert rewrite_query({"a": 1, "b": 2}, (or_null,)) == {
+            "$and": [
+                {"$or": [{"a": 1}, {"a": None}]},
+                {"$or": [{"b": 2}, {"b": None}]},
+            ]
+        }
+
+        def condition(prop, _):
+            return prop == "a"
+
+        def replacement(subdict, prop, expr):
+            subdict[prop]["$eq"] += 1
+            subdict["$and"] = [{"x": 1}]
+            return subdict
+
+        query = {"$and": [{"y": 2}], "a": {"$eq": 1}}
+        assert recursive_postprocessing(query, condition, replacement) == {
+            "$and": [{"y": 2}, {"x": 1}],
+            "a": {"$eq": 2},
+        }
+        assert query == {"$and": [{"y": 2}], "a": {"$eq": 1}}
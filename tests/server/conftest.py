@@ -269,3 +269,12 @@ def async_http_client():
     from .utils import AsyncHttpxTestClient
 
     return AsyncHttpxTestClient
+
+
+@pytest.fixture(scope="session")
+def run_query():
+    """Return a function that runs a query of an entry collection to completion if
+    the collection is asynchronous, see `tests.server.utils.run_query`."""
+    from .utils import run_query
+
+    return run_query
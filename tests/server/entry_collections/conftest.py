@@ -0,0 +1,30 @@
+from pathlib import Path
+
+import pytest
+
+TEST_DATA = Path(__file__).parent.parent.parent.parent.joinpath(
+    "optimade", "server", "data", "test_data.jsonl"
+)
+
+
+@pytest.fixture(scope="session")
+def test_data() -> Path:
+    """The path of the JSONL test data."""
+    return TEST_DATA
+
+
+@pytest.fixture
+def jsonl_file(test_data: Path, tmp_path: Path) -> Path:
+    """A copy of the JSONL test data, such that its index is written to `tmp_path`."""
+    path = tmp_path / test_data.name
+    path.write_bytes(test_data.read_bytes())
+    return path
+
+
+@pytest.fixture(scope="module")
+def structures() -> list[dict]:
+    """The structures of the JSONL test data."""
+    from optimade.utils import _decode_jsonl_lines
+
+    entries, _, _ = _decode_jsonl_lines(TEST_DATA.read_bytes().splitlines()[1:], 1)
+    return entries["structures"]
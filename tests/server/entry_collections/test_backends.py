@@ -0,0 +1,102 @@
+"""Test the in-process backends against MongoDB, with the same data"""
+
+import shutil
+
+import pytest
+
+BACKEND_FILTERS = [
+    "nelements>=2 AND nelements<4",
+    "NOT nelements=2",
+    "3 < nelements",
+    'elements HAS ALL "Si","O"',
+    'elements HAS ANY "Ag","Ni"',
+    'elements HAS ONLY "Si","O"',
+    "elements LENGTH > 2",
+    "structure_features LENGTH 0",
+    'chemical_formula_reduced STARTS WITH "Ag"',
+    'chemical_formula_reduced CONTAINS "O2"',
+    'chemical_formula_reduced ENDS "O3"',
+    'chemical_formula_reduced > "Ba"',
+    'last_modified < "2019-01-01T00:00:00Z"',
+    'id != "mpf_1"',
+    'references.id HAS ONLY "dijkstra1968"',
+    "NOT references.id IS KNOWN",
+    "NOT (nsites > 10 OR nelements = 1)",
+    'NOT (elements HAS "Ag" AND nsites < 20)',
+    'species.name HAS "Ag"',
+    'species_at_sites HAS "C"',
+]
+
+
+@pytest.fixture(scope="module")
+def mongo(structures):
+    """A MongoDB collection holding the structures of the JSONL test data."""
+    from optimade.models import StructureResource
+    from optimade.server.entry_collections.mongo import MongoCollection
+    from optimade.server.mappers import StructureMapper
+
+    collection = MongoCollection(
+        "backend_structures", StructureResource, StructureMapper
+    )
+    collection.collection.delete_many({})
+    collection.insert(structures)
+    yield collection
+    collection.collection.drop()
+
+
+@pytest.fixture(scope="module", params=["sqlite", "columnar", "jsonl"])
+def backend(request, structures, test_data, tmp_path_factory):
+    """Each in-process backend, holding the structures of the JSONL test data."""
+    from optimade.models import StructureResource
+    from optimade.server.mappers import StructureMapper
+
+    if request.param == "sqlite":
+        from optimade.server.entry_collections.sqlite import SQLiteCollection
+
+        collection = SQLiteCollection(
+            "structures", StructureResource, StructureMapper, database=":memory:"
+        )
+        collection.insert(structures)
+    elif request.param == "columnar":
+        pytest.importorskip("numpy")
+        from optimade.server.entry_collections.columnar import ColumnarCollection
+
+        collection = ColumnarCollection(
+            "structures", StructureResource, StructureMapper
+        )
+        collection.insert(structures)
+    else:
+        from optimade.server.entry_collections.jsonl import JSONLCollection
+
+        # Copy the data, such that its index is written to a temporary directory
+        path = tmp_path_factory.mktemp("jsonl") / test_data.name
+        shutil.copyfile(test_data, path)
+        collection = JSONLCollection(
+            "structures", StructureResource, StructureMapper, path=path
+        )
+
+    assert len(collection) == len(structures)
+    return collection
+
+
+@pytest.mark.parametrize("filter_", BACKEND_FILTERS)
+def test_backend_matches_mongo(backend, mongo, filter_):
+    """Test that filters give the same (sorted) results for each in-process backend
+    as for MongoDB."""
+    from optimade.server.query_params import EntryListingQueryParams
+
+    for sort in ("-nsites,id", "last_modified", "chemical_formula_reduced"):
+        params = EntryListingQueryParams(
+            filter=filter_,
+            sort=sort,
+            page_limit=5,
+            page_offset=2,
+            response_format="json",
+            response_fields="nsites",
+        )
+        results, data_returned, more_data_available, _, _ = backend.find(params)
+        expected = mongo.find(params)
+        assert [entry["id"] for entry in results or []] == [
+            entry["id"] for entry in expected[0] or []
+        ]
+        assert (data_returned, more_data_available) == expected[1:3]
@@ -0,0 +1,53 @@
+"""Test the in-memory columnar backend"""
+
+import pytest
+
+pytest.importorskip("numpy")
+
+
+def test_columns(structures):
+    """Test the column types and that insertions are visible to later queries."""
+    from optimade.models import StructureResource
+    from optimade.server.entry_collections.columnar import (
+        ColumnarCollection,
+        DateColumn,
+        ListColumn,
+        NumberColumn,
+        StringColumn,
+    )
+    from optimade.server.mappers import StructureMapper
+
+    collection = ColumnarCollection("structures", StructureResource, StructureMapper)
+    collection.insert(structures[:10])
+    collection.create_default_index()
+
+    table = collection._table
+    assert isinstance(table.column("nsites"), NumberColumn)
+    assert isinstance(table.column("last_modified"), DateColumn)
+    formulae = table.column(
+        StructureMapper.get_backend_field("chemical_formula_reduced")
+    )
+    assert isinstance(formulae, StringColumn)
+    assert formulae.categories == sorted(formulae.categories)
+    elements = table.column("elements")
+    assert isinstance(elements, ListColumn)
+    assert elements._bits() is not None
+
+    query = collection.transformer.transform(
+        collection.parser.parse('elements HAS ALL "Ag"')
+    )
+    assert query(table).sum() == sum(
+        "Ag" in structure["elements"] for structure in structures[:10]
+    )
+
+    # `NOT` only matches the entries for which the property is known
+    only = collection.transformer.transform(
+        collection.parser.parse('elements HAS ONLY "Ba","Ti","O"')
+    )
+    assert ((~only)(table) == elements.known & ~only(table)).all()
+
+    collection.insert(structures[10:])
+    assert collection.count(filter=query) == sum(
+        "Ag" in structure["elements"] for structure in structures
+    )
+    assert collection._table.column("nsites") is not table.column("nsites")
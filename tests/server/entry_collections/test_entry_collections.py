@@ -24,3 +24,427 @@ def test_get_attribute_fields():
             set(attributes_model.model_fields.keys())
             == ENTRY_COLLECTIONS[entry_name].get_attribute_fields()
         )
+
+
+def test_filter_cache():
+    """Test that compiled filters are cached, copied defensively and that
+    warnings are re-emitted on cache hits."""
+    import pytest
+
+    from optimade.server.routers import ENTRY_COLLECTIONS
+    from optimade.warnings import UnknownProviderProperty
+
+    collection = ENTRY_COLLECTIONS["structures"]
+    collection._filter_cache.clear()
+
+    query = collection.transform_filter('elements HAS "Si" AND nelements > 2')
+    assert collection._filter_cache.info()["misses"] == 1
+    assert collection._filter_cache.info()["currsize"] == 1
+
+    query["poisoned"] = True
+    cached_query = collection.transform_filter('elements HAS "Si" AND nelements > 2')
+    assert "poisoned" not in cached_query
+    assert collection._filter_cache.info()["hits"] == 1
+
+    for _ in range(2):
+        with pytest.warns(UnknownProviderProperty):
+            collection.transform_filter("_other_prefix_field = 1")
+    assert collection._filter_cache.info()["hits"] == 2
+
+    collection._filter_cache.clear()
+
+
+def test_filter_cache_concurrent_warnings():
+    """Test that the warnings of filters compiled concurrently are cached with
+    the filter that emitted them only."""
+    import warnings
+    from concurrent.futures import ThreadPoolExecutor
+
+    from optimade.server.routers import ENTRY_COLLECTIONS
+
+    collection = ENTRY_COLLECTIONS["structures"]
+    collection._filter_cache.clear()
+
+    filters = [
+        f"_other_prefix_field = {i}" if i % 2 else f"nelements > {i}"
+        for i in range(100)
+    ]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(collection.transform_filter, filters))
+
+    parser = collection.parser
+    for i, filter_ in enumerate(filters):
+        key = (parser.version, parser.variant, filter_, collection.resource_mapper)
+        _, emitted = collection._filter_cache.get(key)
+        assert len(emitted) == i % 2, filter_
+
+    collection._filter_cache.clear()
+
+
+def test_query_cache_eviction():
+    """Test that the least recently used entry is evicted from a full cache."""
+    from optimade.server.entry_collections.entry_collections import QueryCache
+
+    cache = QueryCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.info() == {"hits": 3, "misses": 1, "maxsize": 2, "currsize": 2}
+
+    disabled = QueryCache(maxsize=0)
+    disabled.put("a", 1)
+    assert len(disabled) == 0
+
+
+def test_query_cache_ttl(monkeypatch):
+    """Test that entries expire after the time-to-live and that invalidation
+    keeps the counters."""
+    from optimade.server.entry_collections import entry_collections
+
+    now = 100.0
+    monkeypatch.setattr(entry_collections.time, "monotonic", lambda: now)
+
+    cache = entry_collections.QueryCache(maxsize=2, ttl=10)
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    now += 11
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+    cache.put("a", 1)
+    cache.invalidate()
+    assert cache.get("a") is None
+    assert cache.info() == {"hits": 1, "misses": 2, "maxsize": 2, "currsize": 0}
+
+
+def test_count_modes(monkeypatch):
+    """Test that counts are cached, invalidated on insert and computed lazily
+    according to `count_mode`."""
+    import pytest
+
+    from optimade.models import StructureResource
+    from optimade.server.config import CONFIG, SupportedBackend
+    from optimade.server.mappers import StructureMapper
+
+    if CONFIG.database_backend not in (
+        SupportedBackend.MONGODB,
+        SupportedBackend.MONGOMOCK,
+    ):
+        pytest.skip("Count modes are only implemented for the MongoDB backends.")
+
+    from optimade.server.entry_collections.mongo import MongoCollection
+
+    collection = MongoCollection(
+        "count_modes", StructureResource, StructureMapper, database="optimade_count"
+    )
+    collection.collection.drop()
+    collection.insert([{"id": f"test_{i}", "nelements": i % 3} for i in range(10)])
+    criteria = {"filter": {"nelements": 1}, "limit": 2}
+
+    counted = []
+    count = collection.count
+
+    def tracked_count(**kwargs):
+        counted.append(kwargs)
+        return count(**kwargs)
+
+    monkeypatch.setattr(collection, "count", tracked_count)
+
+    try:
+        monkeypatch.setattr(CONFIG, "count_mode", "exact")
+        assert collection._run_db_query(criteria)[1:] == (3, True)
+        assert collection._run_db_query({**criteria, "skip": 2})[1:] == (3, False)
+        assert len(counted) == 2
+        assert len(collection._count_cache) == 0
+
+        monkeypatch.setattr(CONFIG, "count_mode", "first_page")
+        assert collection._run_db_query(criteria)[1:] == (3, True)
+        assert collection._run_db_query({**criteria, "skip": 2})[1:] == (3, False)
+        assert len(counted) == 3
+
+        collection.insert([{"id": "test_10", "nelements": 1}])
+        results, data_returned, more_data_available = collection._run_db_query(
+            {**criteria, "skip": 2}
+        )
+        assert (len(results), data_returned, more_data_available) == (2, None, False)
+        assert collection._run_db_query(criteria)[1:] == (4, True)
+        assert collection._run_db_query({**criteria, "skip": 2})[1:] == (4, False)
+        assert len(counted) == 4
+
+        collection._count_cache.invalidate()
+        monkeypatch.setattr(CONFIG, "count_mode", "background")
+        assert collection._run_db_query(criteria)[1:] == (None, True)
+        for future in list(collection._pending_counts.values()):
+            future.result()
+        assert collection._run_db_query(criteria)[1:] == (4, True)
+
+        collection._count_cache.invalidate()
+        monkeypatch.setattr(CONFIG, "count_mode", "estimate")
+        monkeypatch.setattr(CONFIG, "count_estimate_sample_size", 11)
+        assert collection._run_db_query(criteria)[1:] == (4, True)
+
+        # An estimate never reports fewer entries than were found
+        collection._count_cache.invalidate()
+        monkeypatch.setattr(collection, "_estimate_count", lambda criteria: 0)
+        assert collection._run_db_query(criteria)[1:] == (3, True)
+        assert collection._run_db_query({**criteria, "skip": 2})[1:] == (4, False)
+        summary: dict = {}
+        assert len(list(collection._iter_db_query(criteria, summary))) == 2
+        assert summary == {"data_returned": 3, "more_data_available": True}
+    finally:
+        collection.collection.drop()
+
+
+def test_elements_bitmask(monkeypatch):
+    """Test that the derived elements fields are stored on insert and used for
+    `HAS ONLY` filters, also for entries without them."""
+    import pytest
+
+    from optimade.models import StructureResource
+    from optimade.server.config import CONFIG, SupportedBackend
+    from optimade.server.mappers import StructureMapper
+
+    if CONFIG.database_backend not in (
+        SupportedBackend.MONGODB,
+        SupportedBackend.MONGOMOCK,
+    ):
+        pytest.skip(
+            "The elements bitmask is only implemented for the MongoDB backends."
+        )
+
+    from optimade.server.entry_collections.mongo import MongoCollection
+
+    monkeypatch.setattr(CONFIG, "elements_bitmask", True)
+    collection = MongoCollection(
+        "elements_bitmask", StructureResource, StructureMapper, database="optimade_bits"
+    )
+    collection.collection.drop()
+    collection.insert(
+        [
+            {"task_id": "si", "elements": ["Si"]},
+            {"task_id": "sio2", "elements": ["O", "Si"]},
+            {"task_id": "sic", "elements": ["C", "Si"]},
+            {"task_id": "unknown", "elements": ["O", "Xx"]},
+        ]
+    )
+    # An entry inserted without the derived fields, e.g., by another tool
+    collection.collection.insert_one({"task_id": "o", "elements": ["O"]})
+
+    try:
+        stored = collection.collection.find_one({"task_id": "sio2"})
+        assert stored["_elements_key"] == "O-Si"
+        assert len(stored["_elements_bitmask"]) == 16
+        assert "_elements_key" not in collection.collection.find_one(
+            {"task_id": "unknown"}
+        )
+
+        query = collection.transformer.transform(
+            collection.parser.parse('elements HAS ONLY "Si", "O"')
+        )
+        assert {entry["task_id"] for entry in collection.collection.find(query)} == {
+            "si",
+            "sio2",
+            "o",
+        }
+    finally:
+        collection.collection.drop()
+
+
+def test_materialized_length_fields(monkeypatch):
+    """Test that the length of list properties is stored on insert and used for
+    `LENGTH` filters."""
+    import pytest
+
+    from optimade.models import StructureResource
+    from optimade.server.config import CONFIG, SupportedBackend
+    from optimade.server.mappers import StructureMapper
+
+    if CONFIG.database_backend not in (
+        SupportedBackend.MONGODB,
+        SupportedBackend.MONGOMOCK,
+    ):
+        pytest.skip("This test uses the MongoDB backends.")
+
+    from optimade.server.entry_collections.mongo import MongoCollection
+
+    monkeypatch.setattr(CONFIG, "materialize_length_fields", True)
+
+    class MaterializedMapper(StructureMapper):
+        pass
+
+    collection = MongoCollection(
+        "length_fields", StructureResource, MaterializedMapper, database="optimade_len"
+    )
+    collection.collection.drop()
+    entries = [
+        {"task_id": f"test_{i}", "structure_features": ["disorder"] * i}
+        for i in range(1, 5)
+    ]
+    collection.insert(entries)
+
+    try:
+        assert "nstructure_features" not in entries[0]
+        assert (
+            collection.collection.find_one({"task_id": "test_3"})["nstructure_features"]
+            == 3
+        )
+
+        query = collection.transform_filter("structure_features LENGTH > 2")
+        assert query == {"nstructure_features": {"$gt": 2}}
+        assert {entry["task_id"] for entry in collection.collection.find(query)} == {
+            "test_3",
+            "test_4",
+        }
+    finally:
+        collection.collection.drop()
+
+
+def test_query_timings(client, monkeypatch, run_query):
+    """Test that the phases of a query are timed, and that running the backend
+    round-trips concurrently does not change the results."""
+    from optimade.server.config import CONFIG
+    from optimade.server.entry_collections.entry_collections import (
+        record_query_timings,
+    )
+    from optimade.server.query_params import EntryListingQueryParams
+    from optimade.server.routers import ENTRY_COLLECTIONS
+
+    collection = ENTRY_COLLECTIONS["structures"]
+    params = EntryListingQueryParams(
+        filter="nelements>=2", page_limit=3, sort="-nelements"
+    )
+
+    found = {}
+    for query_workers in (0, 2):
+        monkeypatch.setattr(CONFIG, "query_workers", query_workers)
+        with record_query_timings() as timings:
+            found[query_workers] = run_query(collection.find(params))
+        assert {"query_params", "query", "results"} <= set(timings)
+        assert all(duration >= 0 for duration in timings.values())
+
+    assert found[0] == found[2]
+    assert found[0][1] > 3 and found[0][2]
+
+    # Nothing is recorded outside of `record_query_timings`
+    run_query(collection.find(params))
+
+
+def test_data_available_cache(monkeypatch):
+    """Test that `data_available` is reused until it expires or data is inserted."""
+    import pytest
+
+    from optimade.models import StructureResource
+    from optimade.server.config import CONFIG, SupportedBackend
+    from optimade.server.mappers import StructureMapper
+
+    if CONFIG.database_backend not in (
+        SupportedBackend.MONGODB,
+        SupportedBackend.MONGOMOCK,
+    ):
+        pytest.skip("Inserting test data is only implemented for the MongoDB backends.")
+
+    from optimade.server.entry_collections.mongo import MongoCollection
+
+    collection = MongoCollection(
+        "data_available",
+        StructureResource,
+        StructureMapper,
+        database="optimade_data_available",
+    )
+    collection.collection.drop()
+    collection.insert([{"id": f"test_{i}"} for i in range(3)])
+
+    lengths = []
+    monkeypatch.setattr(
+        MongoCollection,
+        "__len__",
+        lambda self: lengths.append(1) or self.collection.estimated_document_count(),
+    )
+
+    try:
+        assert collection.data_available == 3
+        assert collection.data_available == 3
+        assert len(lengths) == 1
+
+        collection.insert([{"id": "test_3"}])
+        assert collection.data_available == 4
+        assert len(lengths) == 2
+
+        monkeypatch.setattr(collection._data_available_cache, "ttl", 0)
+        collection._data_available_cache.invalidate()
+        assert collection.data_available == 4
+        assert collection.data_available == 4
+        assert len(lengths) == 4
+    finally:
+        collection.collection.drop()
+
+
+def test_find_by_ids(client, run_query):
+    """Test that entries are looked up by ID in batches, in the requested order,
+    and that the result matches the generic lookup through the filter grammar."""
+    from optimade.server.entry_collections import AsyncEntryCollection, EntryCollection
+    from optimade.server.routers import ENTRY_COLLECTIONS
+
+    collection = ENTRY_COLLECTIONS["structures"]
+    ids = ["mpf_3", "mpf_1", "not_an_id", "mpf_2", "mpf_1", "mpf_23"]
+
+    results = run_query(collection.find_by_ids(ids, batch_size=2))
+    assert [entry["id"] for entry in results] == ["mpf_3", "mpf_1", "mpf_2", "mpf_23"]
+    assert results == run_query(collection.find_by_ids(ids))
+
+    base = (
+        AsyncEntryCollection
+        if isinstance(collection, AsyncEntryCollection)
+        else EntryCollection
+    )
+    generic = [
+        collection.resource_mapper.map_back(doc)
+        for doc in run_query(
+            base._run_ids_query(
+                collection, list(dict.fromkeys(ids)), collection.all_fields
+            )
+        )
+    ]
+    assert sorted(results, key=lambda entry: entry["id"]) == sorted(
+        generic, key=lambda entry: entry["id"]
+    )
+
+    entry = run_query(collection.find_by_ids(["mpf_1"], fields={"nelements"}))[0]
+    assert entry["attributes"]["nelements"] == results[1]["attributes"]["nelements"]
+    assert "elements" not in entry["attributes"]
+
+    assert run_query(collection.find_by_ids([])) == []
+
+
+def test_response_fields_projection(client):
+    """Test that only the requested, required and sort fields are fetched."""
+    from optimade.server.query_params import EntryListingQueryParams
+    from optimade.server.routers import ENTRY_COLLECTIONS
+
+    collection = ENTRY_COLLECTIONS["structures"]
+    mapper = collection.resource_mapper
+
+    criteria = collection.handle_query_params(
+        EntryListingQueryParams(
+            response_fields="chemical_formula_reduced", sort="-nelements"
+        )
+    )
+    expected = {"chemical_formula_reduced", "nelements"} | mapper.get_required_fields()
+    assert set(criteria["projection"]) - {"_id"} == {
+        mapper.get_backend_field(field) for field in expected
+    }
+
+    criteria = collection.handle_query_params(EntryListingQueryParams())
+    assert set(criteria["projection"]) - {"_id"} == {
+        mapper.get_backend_field(field) for field in collection.all_fields
+    }
+
+    assert collection._projection({"species"}, [("species.name", 1)]) == {
+        mapper.get_backend_field("species"): True
+    }
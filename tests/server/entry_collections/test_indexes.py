@@ -8,7 +8,7 @@ from optimade.server.config import CONFIG
     CONFIG.database_backend.value not in ("mongomock", "mongodb"),
     reason="Skipping index test when testing the elasticsearch backend.",
 )
-def test_indexes_are_created_where_appropriate(client):
+def test_indexes_are_created_where_appropriate(client, run_query):
     """Test that with the test config, default indices are made by
     supported backends. This is tested by checking that we cannot insert
     an entry with the same underlying ID as the test data, and that this
@@ -22,8 +22,8 @@ def test_indexes_are_created_where_appropriate(client):
 
     # get one structure with and try to reinsert it
     for _type in ENTRY_COLLECTIONS:
-        result, _, _, _, _ = ENTRY_COLLECTIONS[_type].find(
-            EntryListingQueryParams(page_limit=1)
+        result, _, _, _, _ = run_query(
+            ENTRY_COLLECTIONS[_type].find(EntryListingQueryParams(page_limit=1))
         )
         assert result is not None
         if isinstance(result, list):
@@ -0,0 +1,55 @@
+"""Test the read-only JSONL file backend"""
+
+import pytest
+
+
+def test_jsonl_index(jsonl_file):
+    """Test that the sidecar index is reused while the JSONL file is unchanged,
+    and that the collection is read-only."""
+    import datetime
+    import json
+    import os
+    import pickle
+
+    from optimade.models import ReferenceResource
+    from optimade.server.entry_collections.jsonl import (
+        MISSING,
+        JSONLCollection,
+        JSONLIndex,
+    )
+    from optimade.server.mappers import ReferenceMapper
+
+    index = JSONLIndex(jsonl_file)
+    assert index.index_path.exists()
+    index.ensure_columns(
+        "structures", ["nelements", "elements.0", "last_modified", "_exmpl_unknown"]
+    )
+
+    # The sidecar index only holds data, which is read back as it was written
+    assert json.loads(index.index_path.read_bytes().splitlines()[0])["version"]
+    reloaded = JSONLIndex(jsonl_file)
+    assert reloaded._offsets == index._offsets
+    assert reloaded._columns == index._columns
+    assert all(
+        value is MISSING
+        for value in reloaded._columns[("structures", "_exmpl_unknown")]
+    )
+    assert isinstance(
+        reloaded._columns[("structures", "last_modified")][0], datetime.datetime
+    )
+    assert reloaded.match("structures", {"elements.0": "Ag"}) == index.match(
+        "structures", {"elements.0": "Ag"}
+    )
+    assert pickle.loads(pickle.dumps(MISSING)) is MISSING
+
+    # Modifying the file invalidates the index
+    stat = jsonl_file.stat()
+    os.utime(jsonl_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert not JSONLIndex(jsonl_file)._columns
+
+    collection = JSONLCollection(
+        "references", ReferenceResource, ReferenceMapper, path=jsonl_file
+    )
+    assert len(collection) == 4
+    with pytest.raises(NotImplementedError):
+        collection.insert([{"id": "new"}])
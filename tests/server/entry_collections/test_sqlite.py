@@ -0,0 +1,67 @@
+"""Test the embedded SQLite backend"""
+
+import pytest
+
+
+def test_sqlite_database_file(structures, tmp_path):
+    """Test that the entries are stored in the database file, and that the default
+    index prevents inserting duplicate IDs."""
+    from optimade.models import StructureResource
+    from optimade.server.entry_collections.sqlite import SQLiteCollection
+    from optimade.server.mappers import StructureMapper
+
+    database = tmp_path / "optimade.sqlite"
+    collection = SQLiteCollection(
+        "structures", StructureResource, StructureMapper, database=database
+    )
+    collection.insert(structures[:5])
+    collection.create_default_index()
+    collection.create_index("nsites")
+    collection.insert(structures)
+    assert len(collection) == len(structures)
+
+    reopened = SQLiteCollection(
+        "structures", StructureResource, StructureMapper, database=database
+    )
+    assert len(reopened) == len(structures)
+    id_field = StructureMapper.get_backend_field("id")
+    assert reopened._run_ids_query(["mpf_1", "unknown"], {"id", "last_modified"}) == [
+        {
+            id_field: "mpf_1",
+            "last_modified": next(
+                structure["last_modified"]
+                for structure in structures
+                if structure[id_field] == "mpf_1"
+            ),
+        }
+    ]
+
+    # Values are always passed as parameters
+    query = reopened.transformer.transform(
+        reopened.parser.parse('id = "x\'; DROP TABLE structures; --"')
+    )
+    assert "DROP" not in query.sql
+    assert reopened.count(filter=query) == 0
+    assert len(reopened) == len(structures)
+
+
+def test_sqlite_page_above_not_supported(structures):
+    """Test that `page_above` is ignored with a warning by backends without
+    value-based pagination."""
+    from optimade.models import StructureResource
+    from optimade.server.entry_collections.sqlite import SQLiteCollection
+    from optimade.server.mappers import StructureMapper
+    from optimade.server.query_params import EntryListingQueryParams
+    from optimade.warnings import QueryParamNotUsed
+
+    collection = SQLiteCollection(
+        "structures", StructureResource, StructureMapper, database=":memory:"
+    )
+    collection.insert(structures)
+
+    with pytest.warns(QueryParamNotUsed, match="'page_above' is not supported"):
+        criteria = collection.handle_query_params(
+            EntryListingQueryParams(page_above="mpf_1", response_format="json")
+        )
+    assert "page_above" not in criteria
+    assert criteria.get("skip", 0) == 0
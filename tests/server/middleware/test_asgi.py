@@ -0,0 +1,161 @@
+"""Test the pure ASGI versions of the OPTIMADE middleware."""
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def asgi_app():
+    """The regular server app using the pure ASGI middleware."""
+    import copy
+
+    from fastapi.middleware.cors import CORSMiddleware
+    from starlette.middleware import Middleware
+
+    from optimade.server.main import app
+    from optimade.server.middleware import OPTIMADE_ASGI_MIDDLEWARE
+
+    asgi_app = copy.copy(app)
+    asgi_app.user_middleware = [Middleware(CORSMiddleware, allow_origins=["*"])]
+    for middleware in OPTIMADE_ASGI_MIDDLEWARE:
+        asgi_app.user_middleware.insert(0, Middleware(middleware))
+    asgi_app.middleware_stack = None
+
+    return asgi_app
+
+
+@pytest.mark.parametrize(
+    "request_url",
+    [
+        "/info",
+        "/structures?page_limit=1",
+        "/structures?filter=_other_prefix_field=1&unknown_param=1",
+        "/structures?response_fields=nelements,_exmpl_unknown",
+        "/structures?filter=nelements>2&page_limit=2&page_offset=1",
+        "/structures?filter",
+        "http://example.org/v0/info",
+        "http://example.org/info?api_hint=v1",
+        "http://example.org/info?api_hint=v2",
+        "http://example.org/v1/info?api_hint=v1",
+        "/structures/mpf_1",
+        "/structures/not_an_id",
+    ],
+)
+def test_asgi_middleware_equivalence(request_url, client, asgi_app, recwarn):
+    """Make sure the pure ASGI middleware give the same responses as the
+    `BaseHTTPMiddleware`-based ones."""
+    from starlette.testclient import TestClient
+
+    responses = []
+    url = request_url if request_url.startswith("http") else f"/v1{request_url}"
+    for app in (client.app, asgi_app):
+        raw_client = TestClient(
+            app,
+            base_url="http://example.org",
+            raise_server_exceptions=False,
+            follow_redirects=False,
+        )
+        responses.append(raw_client.get(url))
+
+    response, asgi_response = responses
+    assert response.status_code == asgi_response.status_code
+    assert response.headers.get("content-type") == asgi_response.headers.get(
+        "content-type"
+    )
+    assert response.headers.get("location") == asgi_response.headers.get("location")
+    if response.headers.get("content-type", "").endswith("json"):
+        content, asgi_content = response.json(), asgi_response.json()
+        for body in (content, asgi_content):
+            body.get("meta", {}).pop("time_stamp", None)
+        assert content == asgi_content
+        assert asgi_response.headers["content-length"] == str(
+            len(asgi_response.content)
+        )
+    else:
+        assert response.content == asgi_response.content
+
+
+def test_asgi_add_warnings_late_warning():
+    """Make sure warnings emitted after the response `meta` was created are
+    still added to the response by `AddWarningsASGI`."""
+    import json
+    import warnings
+
+    from starlette.responses import JSONResponse
+    from starlette.testclient import TestClient
+
+    from optimade.server.middleware import AddWarningsASGI
+    from optimade.server.routers.utils import meta_values
+    from optimade.warnings import OptimadeWarning
+
+    async def app(scope, receive, send):
+        warnings.warn(OptimadeWarning(detail="Early warning"))
+        meta = meta_values("/info", 1, 1, more_data_available=False)
+        warnings.warn(OptimadeWarning(detail="Late warning"))
+        response = JSONResponse(
+            {"meta": json.loads(meta.model_dump_json(exclude_unset=True))}
+        )
+        await response(scope, receive, send)
+
+    original_showwarning = warnings.showwarning
+    try:
+        with warnings.catch_warnings(record=True):
+            response = TestClient(AddWarningsASGI(app)).get("/info")
+    finally:
+        warnings.showwarning = original_showwarning
+
+    assert response.headers["content-length"] == str(len(response.content))
+    assert [warning["detail"] for warning in response.json()["meta"]["warnings"]] == [
+        "Early warning",
+        "Late warning",
+    ]
+
+
+def test_asgi_add_warnings_streamed():
+    """Make sure streamed responses are passed on chunk by chunk by `AddWarningsASGI`,
+    even if a warning was emitted after the response `meta` was created."""
+    import asyncio
+    import warnings
+
+    from starlette.responses import StreamingResponse
+
+    from optimade.server.middleware import AddWarningsASGI
+    from optimade.server.routers.utils import _mark_streamed
+    from optimade.warnings import OptimadeWarning
+
+    async def app(scope, receive, send):
+        _mark_streamed()
+        warnings.warn(OptimadeWarning(detail="Late warning"))
+        response = StreamingResponse(iter([b'{"data":[', b"1,2", b"]}"]))
+        await response(scope, receive, send)
+
+    disconnected = asyncio.Event()
+
+    async def receive():
+        # The client stays connected until the whole response has been sent
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/structures",
+        "query_string": b"",
+        "headers": [],
+    }
+    original_showwarning = warnings.showwarning
+    try:
+        with warnings.catch_warnings(record=True):
+            asyncio.run(AddWarningsASGI(app)(scope, receive, send))
+    finally:
+        warnings.showwarning = original_showwarning
+
+    assert [
+        message["body"]
+        for message in messages
+        if message["type"] == "http.response.body" and message.get("body")
+    ] == [b'{"data":[', b"1,2", b"]}"]
@@ -191,3 +191,161 @@ def test_default_pagination(check_response):
     if CONFIG.database_backend == SupportedBackend.ELASTIC:
         # Replace with `page_above` once default is changed
         assert "page_offset" in response["links"]["next"]
+
+
+@pytest.mark.skipif(
+    CONFIG.database_backend
+    not in (SupportedBackend.MONGODB, SupportedBackend.MONGOMOCK),
+    reason="Value-based pagination is only implemented for the MongoDB backends.",
+)
+@pytest.mark.parametrize("streamed", [False, True])
+@pytest.mark.parametrize(
+    "sort",
+    ["", "nelements", "-nelements", "-last_modified", "chemical_formula_reduced"],
+)
+def test_page_above_pagination(sort, streamed, client, get_good_response, monkeypatch):
+    """Walk through all structures by following `page_above` next links, with
+    buffered and streamed responses."""
+    from optimade.server.entry_collections import PaginationMechanism
+    from optimade.server.routers import ENTRY_COLLECTIONS
+
+    if streamed:
+        monkeypatch.setattr(CONFIG, "stream_responses", True)
+        monkeypatch.setattr(CONFIG, "response_validation", "sampled")
+
+    collection = ENTRY_COLLECTIONS["structures"]
+    total = len(collection)
+
+    original_mechanism = collection.pagination_mechanism
+    collection.pagination_mechanism = PaginationMechanism.ABOVE
+    try:
+        request = f"/structures?page_limit=4&response_fields=nelements,last_modified,chemical_formula_reduced{f'&sort={sort}' if sort else ''}"
+        entries = []
+        while request:
+            response = get_good_response(request)
+            assert response["meta"]["data_returned"] == total
+            entries.extend(response["data"])
+            request = response["links"].get("next")
+            if request:
+                assert "page_above=" in request
+                assert "page_offset" not in request
+    finally:
+        collection.pagination_mechanism = original_mechanism
+
+    ids = [entry["id"] for entry in entries]
+    assert len(ids) == total
+    assert len(set(ids)) == total
+
+    if sort:
+        field = sort.lstrip("-")
+        values = [entry["attributes"][field] for entry in entries]
+        assert values == sorted(values, reverse=sort.startswith("-"))
+    else:
+        assert ids == sorted(ids)
+
+
+@pytest.mark.skipif(
+    CONFIG.database_backend
+    not in (SupportedBackend.MONGODB, SupportedBackend.MONGOMOCK),
+    reason="Value-based pagination is only implemented for the MongoDB backends.",
+)
+@pytest.mark.parametrize("sort", ["elements", "-elements"])
+def test_page_above_list_sort_field(
+    sort, client, get_good_response, check_error_response
+):
+    """Walk through all structures sorted on a list field, for which the next links
+    fall back to `page_offset`, as the sort order of lists cannot be paginated by value."""
+    from optimade.server.entry_collections import PaginationMechanism
+    from optimade.server.routers import ENTRY_COLLECTIONS
+
+    collection = ENTRY_COLLECTIONS["structures"]
+    total = len(collection)
+
+    original_mechanism = collection.pagination_mechanism
+    collection.pagination_mechanism = PaginationMechanism.ABOVE
+    try:
+        request = f"/structures?page_limit=4&response_fields=elements&sort={sort}"
+        ids = []
+        while request:
+            response = get_good_response(request)
+            assert response["meta"]["data_returned"] == total
+            ids.extend(entry["id"] for entry in response["data"])
+            request = response["links"].get("next")
+            if request:
+                assert "page_above" not in request
+    finally:
+        collection.pagination_mechanism = original_mechanism
+
+    assert len(set(ids)) == len(ids) == total
+
+    check_error_response(
+        f"/structures?page_above=mpf_1&sort={sort}",
+        expected_status=400,
+        expected_title="Bad Request",
+        expected_detail="'page_above' is not supported when sorting on the list field(s) 'elements', please use 'page_offset'.",
+    )
+
+
+@pytest.mark.skipif(
+    CONFIG.database_backend
+    not in (SupportedBackend.MONGODB, SupportedBackend.MONGOMOCK),
+    reason="Value-based pagination is only implemented for the MongoDB backends.",
+)
+@pytest.mark.parametrize("streamed", [False, True])
+def test_page_above_sort_field_not_in_response_fields(
+    streamed, client, get_good_response, monkeypatch
+):
+    """Make sure `page_above` pagination works when the sort field is not one of
+    the requested `response_fields`, and so is only fetched to paginate, with
+    buffered and streamed responses."""
+    from optimade.server.entry_collections import PaginationMechanism
+    from optimade.server.routers import ENTRY_COLLECTIONS
+
+    if streamed:
+        monkeypatch.setattr(CONFIG, "stream_responses", True)
+        monkeypatch.setattr(CONFIG, "response_validation", "sampled")
+
+    collection = ENTRY_COLLECTIONS["structures"]
+    total = len(collection)
+
+    original_mechanism = collection.pagination_mechanism
+    collection.pagination_mechanism = PaginationMechanism.ABOVE
+    try:
+        request = "/structures?page_limit=5&response_fields=chemical_formula_reduced&sort=-nelements"
+        ids = []
+        while request:
+            response = get_good_response(request)
+            for entry in response["data"]:
+                assert set(entry["attributes"]) == {"chemical_formula_reduced"}
+                ids.append(entry["id"])
+            request = response["links"].get("next")
+            if request:
+                assert "page_above=" in request
+    finally:
+        collection.pagination_mechanism = original_mechanism
+
+    assert len(set(ids)) == len(ids) == total
+
+
+@pytest.mark.skipif(
+    CONFIG.database_backend
+    not in (SupportedBackend.MONGODB, SupportedBackend.MONGOMOCK),
+    reason="Value-based pagination is only implemented for the MongoDB backends.",
+)
+def test_page_above_id_value(check_response, check_error_response):
+    """A plain `id` value can be used for `page_above` when sorting by `id`."""
+    request = "/structures?page_above=mpf_551&page_limit=10"
+    response = check_response(
+        request,
+        expected_ids=["mpf_632"],
+        expected_as_is=True,
+    )
+    assert response["links"]["next"] is None
+
+    request = "/structures?page_above=mpf_1&sort=nelements"
+    check_error_response(
+        request,
+        expected_status=400,
+        expected_title="Bad Request",
+        expected_detail="Unable to interpret 'page_above' value 'mpf_1' for the requested sort.",
+    )
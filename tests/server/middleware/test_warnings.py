@@ -100,3 +100,65 @@ def test_empty_response_chunk_it_up(client_with_empty_extension_endpoint):
     response = client_with_empty_extension_endpoint.get("/extensions/test_empty_body")
     add_warning_middleware._warnings = []
     assert response.content == b""
+
+
+def test_response_without_late_warnings_passes_through(both_clients):
+    """Make sure responses are returned as-is when all warnings were added to
+    `meta` while creating the response, and rewritten only for late warnings."""
+    import asyncio
+    import json
+    import warnings
+
+    from starlette.requests import Request
+    from starlette.responses import StreamingResponse
+
+    from optimade.server.middleware import AddWarnings
+    from optimade.server.routers.utils import meta_values
+    from optimade.server.warnings import OptimadeWarning
+
+    add_warning_middleware = AddWarnings(both_clients.app)
+    request = Request({"type": "http", "method": "GET", "path": "/info", "headers": []})
+    original_showwarning = warnings.showwarning
+    responses = []
+
+    def make_call_next(late_warning: bool):
+        async def call_next(_):
+            warnings.warn(OptimadeWarning(detail="Early warning"))
+            meta = meta_values("/info", 1, 1, more_data_available=False)
+            if late_warning:
+                warnings.warn(OptimadeWarning(detail="Late warning"))
+            body = json.dumps(
+                {"meta": meta.model_dump(mode="json", exclude_unset=True)}
+            ).encode()
+            response = StreamingResponse(
+                iter([body]), headers={"content-length": str(len(body))}
+            )
+            responses.append(response)
+            return response
+
+        return call_next
+
+    async def dispatch(late_warning: bool) -> tuple[StreamingResponse, dict]:
+        response = await add_warning_middleware.dispatch(
+            request, make_call_next(late_warning)
+        )
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        assert response.headers["content-length"] == str(len(body))
+        return response, json.loads(body)["meta"]
+
+    try:
+        with warnings.catch_warnings(record=True):
+            response, meta = asyncio.run(dispatch(late_warning=False))
+            assert response is responses[-1]
+            assert [warning["detail"] for warning in meta["warnings"]] == [
+                "Early warning"
+            ]
+
+            response, meta = asyncio.run(dispatch(late_warning=True))
+            assert response is not responses[-1]
+            assert [warning["detail"] for warning in meta["warnings"]] == [
+                "Early warning",
+                "Late warning",
+            ]
+    finally:
+        warnings.showwarning = original_showwarning
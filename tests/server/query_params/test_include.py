@@ -75,3 +75,37 @@ def test_wrong_relationship_type(check_error_response):
             expected_title="Bad Request",
             expected_detail=error_detail,
         )
+
+
+def test_included_limit(client, monkeypatch):
+    """At most `page_limit_max` related resources are included, with a warning if
+    more are referenced."""
+    import asyncio
+
+    import pytest
+
+    from optimade.server.config import CONFIG
+    from optimade.server.routers import ENTRY_COLLECTIONS
+    from optimade.server.routers.utils import get_included_relationships_async
+    from optimade.warnings import TooManyValues
+
+    results = [
+        {"relationships": {"references": {"data": [{"id": ref_id}]}}}
+        for ref_id in ("dijkstra1968", "maddox1988", "dummy/2019")
+    ]
+
+    included = asyncio.run(
+        get_included_relationships_async(results, ENTRY_COLLECTIONS, ["references"])
+    )
+    assert [entry["id"] for entry in included] == [
+        "dijkstra1968",
+        "maddox1988",
+        "dummy/2019",
+    ]
+
+    monkeypatch.setattr(CONFIG, "page_limit_max", 2)
+    with pytest.warns(TooManyValues, match="Only 2 of the 3 related resources"):
+        included = asyncio.run(
+            get_included_relationships_async(results, ENTRY_COLLECTIONS, ["references"])
+        )
+    assert [entry["id"] for entry in included] == ["dijkstra1968", "maddox1988"]
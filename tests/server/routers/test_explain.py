@@ -0,0 +1,64 @@
+import pytest
+
+
+@pytest.fixture(scope="module")
+def explain_client():
+    """Return a TestClient for an app serving only the `/extensions/explain` endpoint,
+    which is not served by the reference server with the default config."""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from optimade.server.exception_handlers import OPTIMADE_EXCEPTIONS
+    from optimade.server.routers import explain
+
+    app = FastAPI()
+    app.include_router(explain.router)
+    for exception, handler in OPTIMADE_EXCEPTIONS:
+        app.add_exception_handler(exception, handler)
+    return TestClient(app, raise_server_exceptions=False)
+
+
+def test_explain(explain_client, run_query):
+    """Test that the parse tree, backend query and phase timings are reported."""
+    from optimade.server.routers import ENTRY_COLLECTIONS
+
+    response = explain_client.get(
+        "/extensions/explain",
+        params={
+            "filter": 'elements HAS "Si" AND nelements > 2',
+            "sort": "-nelements",
+            "page_limit": 3,
+        },
+    )
+    assert response.status_code == 200, response.json()
+    explanation = response.json()
+
+    assert explanation["filter"] == 'elements HAS "Si" AND nelements > 2'
+    assert explanation["sort"] == "-nelements"
+    assert explanation["page_limit"] == 3
+    assert explanation["parse_tree"].startswith("filter\n")
+    assert "property_first_comparison" in explanation["parse_tree"]
+    assert explanation["query"]["limit"] == 3
+    assert explanation["data_returned"] == run_query(
+        ENTRY_COLLECTIONS["structures"].count(
+            filter=ENTRY_COLLECTIONS["structures"].transform_filter(
+                'elements HAS "Si" AND nelements > 2'
+            )
+        )
+    )
+    assert {"parse", "transform", "query", "map_back", "serialize"} <= set(
+        explanation["timings"]
+    )
+    assert all(duration >= 0 for duration in explanation["timings"].values())
+
+
+def test_explain_errors(explain_client):
+    """Test that unknown entry types and invalid filters are bad requests."""
+    response = explain_client.get(
+        "/extensions/explain", params={"entry_type": "unknown"}
+    )
+    assert response.status_code == 400
+    assert "Unknown entry type" in response.json()["errors"][0]["detail"]
+
+    response = explain_client.get("/extensions/explain", params={"filter": "elements"})
+    assert response.status_code == 400
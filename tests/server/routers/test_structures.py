@@ -1,3 +1,5 @@
+import pytest
+
 from optimade.models import (
     ReferenceResource,
     StructureResponseMany,
@@ -220,3 +222,292 @@ class TestStructuresWithUnknownResponseFields(RegularEndpointTests):
         assert all(
             len(doc["attributes"]) == len(keys) for doc in self.json_response["data"]
         )
+
+
+def test_query_timings_in_debug_meta(client, monkeypatch):
+    """Make sure the durations of the query phases are added to `meta` in debug mode only."""
+    from optimade.server.config import CONFIG
+
+    timings_field = f"_{CONFIG.provider.prefix}_query_timings"
+    request = "/structures?filter=nelements>=2&page_limit=3"
+
+    monkeypatch.setattr(CONFIG, "debug", False)
+    assert timings_field not in client.get(request).json()["meta"]
+
+    monkeypatch.setattr(CONFIG, "debug", True)
+    for url in (request, "/structures/mpf_1"):
+        timings = client.get(url).json()["meta"][timings_field]
+        assert {"query", "data_available", "results"} <= set(timings)
+
+
+def test_orjson_response_serializer(client, monkeypatch):
+    """Make sure responses serialized directly with `orjson` are identical to the
+    validated responses serialized with the standard library."""
+    import datetime
+    import json
+    from contextlib import nullcontext
+
+    import pytest
+
+    pytest.importorskip("orjson")
+
+    from optimade.models import ToplevelLinks
+    from optimade.server.config import CONFIG
+    from optimade.server.routers.utils import (
+        JSONAPIResponse,
+        ORJSONAPIResponse,
+        json_response_class,
+    )
+    from optimade.server.warnings import UnknownProviderProperty
+
+    content = {
+        "links": ToplevelLinks(next=None),
+        "data": [
+            {
+                "aware": datetime.datetime(2020, 1, 2, 3, 4, 5, tzinfo=datetime.UTC),
+                "naive": datetime.datetime(2020, 1, 2, 3, 4, 5, 6),
+                "values": [0.1, 1e-30, 3],
+            }
+        ],
+    }
+    response = ORJSONAPIResponse(content)
+    assert response.media_type == JSONAPIResponse.media_type
+    assert json.loads(response.body) == {
+        "links": {"next": None},
+        "data": [
+            {
+                "aware": "2020-01-02T03:04:05Z",
+                "naive": "2020-01-02T03:04:05.000006",
+                "values": [0.1, 1e-30, 3],
+            }
+        ],
+    }
+
+    requests = (
+        "/structures?page_limit=3&sort=nelements",
+        "/structures?filter=nelements>=4&include=references",
+        "/structures/mpf_1?include=references",
+        "/structures?response_fields=_exmpl_unknown_field",
+    )
+
+    def get_responses() -> list[dict]:
+        responses = []
+        for request in requests:
+            with (
+                pytest.warns(UnknownProviderProperty)
+                if "unknown" in request
+                else nullcontext()
+            ):
+                response = client.get(request)
+            assert response.headers["content-type"] == JSONAPIResponse.media_type
+            responses.append(response.json())
+            responses[-1]["meta"].pop("time_stamp")
+        return responses
+
+    validated_responses = get_responses()
+
+    monkeypatch.setattr(CONFIG, "validate_api_response", False)
+    monkeypatch.setattr(CONFIG, "response_serializer", "orjson")
+    assert json_response_class() is ORJSONAPIResponse
+    assert get_responses() == validated_responses
+
+
+def test_response_validation_modes(client, monkeypatch):
+    """Make sure only sampled responses, or the first response per query shape,
+    are validated in the corresponding `response_validation` modes."""
+    from pydantic import model_validator
+
+    from optimade.models import StructureResponseMany, StructureResponseOne
+    from optimade.server.config import CONFIG
+    from optimade.server.routers.utils import (
+        ENTRY_RESPONSE_MODELS,
+        RESPONSE_VALIDATION_STATS,
+    )
+
+    class InvalidStructureResponse(StructureResponseMany):
+        @model_validator(mode="after")
+        def always_invalid(self):
+            raise ValueError("Invalid response")
+
+    monkeypatch.setattr(CONFIG, "validate_api_response", True)
+    RESPONSE_VALIDATION_STATS.clear()
+    try:
+        monkeypatch.setattr(CONFIG, "response_validation", "first_per_shape")
+        for request in (
+            "/structures?page_limit=3&response_fields=nelements",
+            "/structures?page_limit=5&response_fields=nelements",
+            "/structures?page_limit=3",
+            "/structures/mpf_1",
+            "/structures/mpf_2",
+        ):
+            client.get(request)
+        info = RESPONSE_VALIDATION_STATS.info()
+        assert (info["validated"], info["skipped"], info["failed"]) == (3, 2, 0)
+
+        monkeypatch.setattr(CONFIG, "response_validation", "sampled")
+        for rate, outcome in ((0, "skipped"), (1, "validated")):
+            monkeypatch.setattr(CONFIG, "response_validation_sample_rate", rate)
+            counted = RESPONSE_VALIDATION_STATS.info()[outcome]
+            client.get("/structures?page_limit=3&response_fields=nelements")
+            assert RESPONSE_VALIDATION_STATS.info()[outcome] == counted + 1
+
+        monkeypatch.setitem(
+            ENTRY_RESPONSE_MODELS,
+            "structures",
+            (InvalidStructureResponse, StructureResponseOne),
+        )
+        response = client.get("/structures?page_limit=3&response_fields=nelements")
+        assert response.status_code == 500
+        assert RESPONSE_VALIDATION_STATS.info()["failed"] == 1
+
+        monkeypatch.setattr(CONFIG, "response_validation", "always")
+        RESPONSE_VALIDATION_STATS.clear()
+        client.get("/structures?page_limit=3&response_fields=nelements")
+        assert sum(RESPONSE_VALIDATION_STATS.info().values()) == 0
+    finally:
+        RESPONSE_VALIDATION_STATS.clear()
+
+
+@pytest.mark.parametrize("async_collections", [False, True])
+def test_stream_responses(client, monkeypatch, async_collections):
+    """Make sure streamed entry listings give the same responses as the regular
+    ones, for both the synchronous and asynchronous database paths."""
+    from optimade.server.config import CONFIG, SupportedBackend
+
+    requests = (
+        "/structures?page_limit=3&sort=nelements",
+        "/structures?filter=nelements>=4&page_limit=2&page_offset=1",
+        "/structures?response_fields=nelements,_exmpl_unknown&page_limit=2",
+        "/structures?response_fields=nelements,chemical_formula_reduced&page_limit=5",
+        '/structures?filter=id="mpf_1" OR id="mpf_2"&include=references',
+        "/structures?page_limit=0",
+        "/structures?filter=nelements>100",
+        "/references?page_limit=2",
+    )
+    regular_responses = [client.get(request) for request in requests]
+
+    if async_collections:
+        if CONFIG.database_backend not in (
+            SupportedBackend.MONGODB,
+            SupportedBackend.MONGOMOCK,
+        ):
+            pytest.skip(
+                "The asynchronous database path is only implemented for MongoDB."
+            )
+
+        from optimade.server.entry_collections.mongo import AsyncMongoCollection
+        from optimade.server.routers import ENTRY_COLLECTIONS, references, structures
+
+        for router, name in ((structures, "structures"), (references, "references")):
+            sync_collection = ENTRY_COLLECTIONS[name]
+            async_collection = AsyncMongoCollection(
+                sync_collection.collection.name,
+                sync_collection.resource_cls,
+                sync_collection.resource_mapper,
+                database=sync_collection.collection.database.name,
+            )
+            monkeypatch.setattr(router, f"{name}_coll", async_collection)
+            monkeypatch.setitem(ENTRY_COLLECTIONS, name, async_collection)
+
+    monkeypatch.setattr(CONFIG, "stream_responses", True)
+    # Streamed responses are not validated, so they are only used if not every
+    # response would be validated
+    assert "content-length" in client.get(requests[0]).headers
+    monkeypatch.setattr(CONFIG, "validate_api_response", False)
+
+    streamed_responses = [client.get(request) for request in requests]
+    assert streamed_responses[4].json()["included"]
+    assert streamed_responses[2].json()["meta"]["warnings"]
+
+    for regular_response, streamed_response in zip(
+        regular_responses, streamed_responses
+    ):
+        assert "content-length" not in streamed_response.headers
+        assert (
+            streamed_response.headers["content-type"]
+            == regular_response.headers["content-type"]
+        )
+        regular, streamed = regular_response.json(), streamed_response.json()
+        for response in (regular, streamed):
+            response["meta"].pop("time_stamp")
+        assert streamed == regular
+
+    response = client.get("/structures?response_fields=unknown_field")
+    assert response.status_code == 400
+
+
+def test_jsonl_response_format(client):
+    """Make sure entry listings can be downloaded as OPTIMADE JSON Lines, in the
+    format read by `insert_from_jsonl`, without a page limit."""
+    import json
+
+    from optimade import __api_version__
+
+    response = client.get("/structures?response_format=jsonl&page_limit=2")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/jsonl"
+    header, *entries = [json.loads(line) for line in response.text.splitlines()]
+    assert header == {"x-optimade": {"meta": {"api_version": __api_version__}}}
+
+    listing = client.get("/structures?page_limit=100").json()
+    assert entries == listing["data"]
+    assert len(entries) == listing["meta"]["data_returned"] > 2
+
+    response = client.get(
+        "/structures?response_format=jsonl&filter=nelements>=4&response_fields=nelements"
+    )
+    entries = [json.loads(line) for line in response.text.splitlines()[1:]]
+    listing = client.get(
+        "/structures?filter=nelements>=4&response_fields=nelements&page_limit=100"
+    ).json()
+    assert entries == listing["data"]
+
+    response = client.get("/structures/mpf_1?response_format=jsonl")
+    assert response.status_code == 400
+    response = client.get("/structures?response_format=xml")
+    assert response.status_code == 400
+
+
+def test_async_collections(client, monkeypatch):
+    """Make sure the `async` routes give the same responses when the entry
+    collections are queried through the asynchronous database path."""
+    import pytest
+
+    from optimade.server.config import CONFIG, SupportedBackend
+
+    if CONFIG.database_backend not in (
+        SupportedBackend.MONGODB,
+        SupportedBackend.MONGOMOCK,
+    ):
+        pytest.skip("The asynchronous database path is only implemented for MongoDB.")
+
+    from optimade.server.entry_collections.mongo import AsyncMongoCollection
+    from optimade.server.routers import ENTRY_COLLECTIONS, references, structures
+
+    requests = (
+        "/structures?page_limit=3&sort=nelements",
+        "/structures?filter=nelements>=4&page_limit=2&page_offset=1",
+        "/structures?filter=_exmpl_unknown=1&response_fields=nelements,_exmpl_unknown",
+        "/structures/mpf_1?include=references",
+        "/structures?filter=id=mpf_1 OR id=mpf_2&include=references",
+    )
+    sync_responses = [client.get(request).json() for request in requests]
+
+    for router, name in ((structures, "structures"), (references, "references")):
+        sync_collection = ENTRY_COLLECTIONS[name]
+        async_collection = AsyncMongoCollection(
+            sync_collection.collection.name,
+            sync_collection.resource_cls,
+            sync_collection.resource_mapper,
+            database=sync_collection.collection.database.name,
+        )
+        monkeypatch.setattr(router, f"{name}_coll", async_collection)
+        monkeypatch.setitem(ENTRY_COLLECTIONS, name, async_collection)
+
+    async_responses = [client.get(request).json() for request in requests]
+    assert async_responses[3]["included"]
+
+    for sync_response, async_response in zip(sync_responses, async_responses):
+        for response in (sync_response, async_response):
+            response["meta"].pop("time_stamp")
+        assert async_response == sync_response
@@ -119,3 +119,80 @@ def test_get_providers_warning(caplog, top_dir):
             from optimade.server.data import providers
 
             assert providers == providers_cache
+
+
+def test_handle_response_fields_page():
+    """Make sure a full page (of `page_limit_max` entries) is pruned to the requested
+    fields, without modifying the list of results or its entries.
+
+    The time taken is measured by the `benchmark_response_fields` invoke task.
+
+    """
+    import copy
+    import itertools
+
+    from optimade.server.config import CONFIG
+    from optimade.server.data import structures
+    from optimade.server.mappers import StructureMapper
+    from optimade.server.routers.utils import handle_response_fields
+
+    page = StructureMapper.map_back_many(
+        itertools.islice(itertools.cycle(structures), CONFIG.page_limit_max)
+    )
+    original = copy.deepcopy(page)
+    include_fields = {"chemical_formula_reduced", "_exmpl_unknown"}
+
+    pruned = handle_response_fields(page, include_fields)
+
+    assert page == original
+    assert len(pruned) == CONFIG.page_limit_max
+    for entry in pruned:
+        assert entry["attributes"].keys() == include_fields
+        assert entry["attributes"]["_exmpl_unknown"] is None
+        assert entry["attributes"]["chemical_formula_reduced"]
+
+    # The unused `exclude_fields` can still be passed, with a warning
+    with pytest.warns(DeprecationWarning, match="exclude_fields"):
+        assert handle_response_fields(page, set(), include_fields) == pruned
+    with pytest.warns(DeprecationWarning, match="exclude_fields"):
+        assert (
+            handle_response_fields(page, include_fields, exclude_fields=set()) == pruned
+        )
+
+
+@pytest.mark.parametrize("decode_processes", [0, 2])
+def test_insert_from_jsonl(client, tmp_path, monkeypatch, caplog, decode_processes):
+    """Make sure a JSONL file, e.g., as streamed with `response_format=jsonl`, is
+    ingested in full by the pipelined `insert_from_jsonl`, with or without a
+    process pool, and that rows that cannot be read are reported."""
+    from optimade.server.entry_collections import create_collection
+    from optimade.server.routers import ENTRY_COLLECTIONS
+    from optimade.utils import insert_from_jsonl
+
+    structures = ENTRY_COLLECTIONS["structures"]
+    collection = create_collection(
+        name=f"structures_from_jsonl_{decode_processes}",
+        resource_cls=structures.resource_cls,
+        resource_mapper=structures.resource_mapper,
+    )
+    monkeypatch.setitem(ENTRY_COLLECTIONS, "structures", collection)
+
+    header, *entries = client.get("/structures?response_format=jsonl").text.splitlines()
+    jsonl_path = tmp_path / "structures.jsonl"
+    jsonl_path.write_text(
+        "\n".join(
+            [header, '{"type": "info", "id": "structures"}', *entries, "", "{bad"]
+        )
+        + "\n"
+    )
+
+    insert_from_jsonl(
+        jsonl_path,
+        batch_size=3,
+        decode_processes=decode_processes,
+        insert_workers=2,
+        chunk_size=1024,
+    )
+
+    assert len(collection) == len(entries)
+    assert "Could not read 2 rows from the JSONL file" in caplog.messages
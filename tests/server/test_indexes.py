@@ -0,0 +1,96 @@
+"""Tests for optimade.server.indexes"""
+
+
+def test_candidate_indexes() -> None:
+    """Test that the candidate indexes are derived from the schema and the length
+    aliases of the structures."""
+    from optimade.server.indexes import IndexAdvisor
+    from optimade.server.mappers import StructureMapper
+
+    id_field = StructureMapper.get_backend_field("id")
+    indexes = {
+        index.keys: index for index in IndexAdvisor(StructureMapper).candidate_indexes()
+    }
+
+    assert indexes[((id_field, 1),)].unique
+    assert indexes[(("elements", 1),)].multikey
+    assert indexes[(("nelements", 1), (id_field, 1))].reason
+    assert (("nsites", 1), (id_field, 1)) in indexes
+    # The index on `nelements` alone is covered by the compound index
+    assert (("nelements", 1),) not in indexes
+
+
+def test_recommended_indexes() -> None:
+    """Test that the recorded filters give compound indexes following the
+    equality-sort-range rule, with at most one list field."""
+    from optimade.filterparser import LarkParser
+    from optimade.filtertransformers.mongo import MongoTransformer
+    from optimade.server.indexes import IndexAdvisor, IndexSpec, query_operators
+    from optimade.server.mappers import StructureMapper
+
+    parser = LarkParser()
+    transformer = MongoTransformer(mapper=StructureMapper)
+    advisor = IndexAdvisor(StructureMapper)
+
+    query = transformer.transform(
+        parser.parse('elements HAS ALL "Si","O" AND nelements < 4')
+    )
+    assert set(query_operators(query)) == {("elements", "$all"), ("nelements", "$lt")}
+    for _ in range(2):
+        advisor.record(query, [("nsites", -1)])
+    advisor.record(
+        transformer.transform(
+            parser.parse(
+                'nsites = 4 AND elements HAS "Si" AND species_at_sites HAS "O"'
+            )
+        ),
+        None,
+    )
+
+    assert advisor.operators[("elements", "$all")] == 2
+    recommended = advisor.recommended_indexes()
+    assert recommended[0] == IndexSpec(
+        (("elements", 1), ("nsites", -1), ("nelements", 1))
+    )
+    assert recommended[0].multikey
+    assert recommended[0].queries == 2
+    # `species_at_sites` is a second list, which cannot be in the same index
+    assert recommended[1].keys == (("elements", 1), ("nsites", 1))
+    assert advisor.recommended_indexes(min_queries=2) == recommended[:1]
+
+
+def test_index_plan(monkeypatch) -> None:
+    """Test that the plan reports and creates the missing indexes of a collection."""
+    from optimade.models import StructureResource
+    from optimade.server.config import CONFIG
+    from optimade.server.entry_collections.mongo import MongoCollection
+    from optimade.server.indexes import main
+    from optimade.server.mappers import StructureMapper
+    from optimade.server.query_params import EntryListingQueryParams
+
+    collection = MongoCollection(
+        "index_plan_structures", StructureResource, StructureMapper
+    )
+    collection.collection.drop()
+    collection.find(
+        EntryListingQueryParams(filter="nsites > 2 AND nelements = 3", sort="nsites")
+    )
+
+    plan = collection.index_plan()
+    assert not any(exists for _, exists in plan)
+    assert any(index.keys == (("nelements", 1), ("nsites", 1)) for index, _ in plan)
+
+    monkeypatch.setattr(CONFIG, "create_advised_indexes", True)
+    collection.create_default_index()
+    assert all(exists for _, exists in collection.index_plan())
+
+    # Special indexes are reported with their type instead of a direction
+    collection.collection.create_index([("chemical_formula_reduced", "hashed")])
+    assert (("chemical_formula_reduced", "hashed"),) in {
+        index.keys for index in collection.existing_indexes()
+    }
+    assert all(exists for _, exists in collection.index_plan())
+    collection.collection.drop()
+
+    # The command line interface plans the indexes of the server collections
+    main(["--entry-type", "structures", "--sort=-nsites", "--json"])
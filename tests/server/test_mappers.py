@@ -92,3 +92,80 @@ def test_cached_mapper_properties(mapper):
     assert MyOtherMapper.get_backend_field("a") == "b"
     assert MyOtherMapper.get_backend_field.cache_info().hits == hits + 3
     assert MyMapper.get_backend_field("a") == "a"
+
+
+def test_map_back_many(mapper):
+    """Tests that a page of documents is mapped back in one pass with the same
+    result as mapping each document, also for mappers overriding `map_back`."""
+
+    class MyMapper(mapper(MAPPER)):
+        PROVIDER_FIELDS = ("test_field",)
+        ALIASES = (("field", "completely_different_field"), ("id", "task_id"))
+
+    docs = [
+        {
+            "task_id": "test_1",
+            "completely_different_field": 1,
+            "test_field": [1, 2],
+            "nelements": 2,
+            "links": None,
+        },
+        {"task_id": "test_2", "id": "ignored", "type": "ignored"},
+    ]
+
+    assert MyMapper.map_back_many(docs) == [MyMapper.map_back(doc) for doc in docs]
+    assert MyMapper.map_back_many(docs)[0] == {
+        "id": "test_1",
+        "type": MyMapper.ENDPOINT,
+        "links": None,
+        "attributes": {"field": 1, "_exmpl_test_field": [1, 2], "nelements": 2},
+    }
+    assert MyMapper.map_back_many(docs)[1] == {
+        "id": "test_2",
+        "type": MyMapper.ENDPOINT,
+        "attributes": {},
+    }
+    assert MyMapper.map_back_many([]) == []
+
+    with pytest.raises(Exception, match="Will overwrite doc field!"):
+        MyMapper.map_back_many([{"attributes": {}}])
+
+    links = [{"id": "test", "type": "child", "name": "Test"}]
+    LinksMapper = mapper("LinksMapper")
+    assert LinksMapper.map_back_many(links) == [LinksMapper.map_back(links[0])]
+    assert LinksMapper.map_back_many(links)[0]["type"] == "child"
+
+
+def test_materialized_length_fields(mapper, monkeypatch):
+    from optimade.filterparser import LarkParser
+    from optimade.filtertransformers.mongo import MongoTransformer
+
+    class MyMapper(mapper("StructureMapper")):
+        ALIASES = (("species", "kinds"),)
+
+    assert MyMapper.length_fields() == ()
+
+    monkeypatch.setattr(CONFIG, "materialize_length_fields", True)
+
+    class MaterializedMapper(mapper("StructureMapper")):
+        ALIASES = (("species", "kinds"),)
+
+    # List properties with an explicit length alias keep it
+    length_fields = dict(MaterializedMapper.length_fields())
+    assert length_fields["species"] == "nspecies"
+    assert length_fields["structure_features"] == "nstructure_features"
+    assert "elements" not in length_fields
+    assert "nelements" not in length_fields
+    assert MaterializedMapper.length_alias_for("species") == "nspecies"
+    assert MaterializedMapper.length_alias_for("elements") == "nelements"
+
+    doc = {"kinds": [{"name": "Si"}], "elements": ["Si"], "assemblies": None}
+    assert MaterializedMapper.add_length_fields(doc) is doc
+    assert doc["nspecies"] == 1
+    assert "nelements" not in doc
+    assert "nassemblies" not in doc
+
+    transformer = MongoTransformer(mapper=MaterializedMapper)
+    assert transformer.transform(LarkParser().parse("species LENGTH >= 2")) == {
+        "nspecies": {"$gte": 2}
+    }
@@ -297,3 +297,14 @@ class AsyncHttpxTestClient(httpx.AsyncClient):
         **kwargs,
     ) -> httpx.Response:
         return self.client.request(method, url)
+
+
+def run_query(result):
+    """Return the result of a query of an entry collection, running the query to
+    completion first if the collection is asynchronous (`OPTIMADE_ASYNC_DATABASE`)."""
+    import asyncio
+    import inspect
+
+    if inspect.iscoroutine(result):
+        return asyncio.run(result)
+    return result